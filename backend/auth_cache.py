@@ -0,0 +1,93 @@
+import os
+import sys
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+import models
+from config import settings
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.local_cache import LocalCache, register
+from src.redis_client import redis_client, async_redis_client
+
+
+AUTH_CACHE_PREFIX = "auth:"
+
+# Users only change on rehash-at-login and sessions only disappear through
+# routers/sessions.py, both of which invalidate; the TTL bounds anything else.
+auth_cache: Optional[LocalCache] = register(
+    LocalCache(
+        max_entries=settings.auth_cache_max_entries,
+        ttl=settings.auth_cache_ttl,
+        prefixes=(AUTH_CACHE_PREFIX,),
+    )
+) if settings.auth_cache_enabled else None
+
+
+
+def user_key(user_id) -> str:
+    return f"{AUTH_CACHE_PREFIX}user:{user_id}"
+
+
+def ownership_key(user_id, session_token: str) -> str:
+    return f"{AUTH_CACHE_PREFIX}session:{user_id}:{session_token}"
+
+
+async def get_user(user_id, db: AsyncSession) -> Optional[models.User]:
+    """User by id, loaded from the cache into ``db`` without a query when possible"""
+    key = user_key(user_id)
+    if auth_cache is not None:
+        cached = auth_cache.get(key)
+        if cached is not None:
+            return await db.merge(cached, load=False)
+        generation = auth_cache.generation
+
+    user = (await db.execute(select(models.User).where(models.User.id == int(user_id)))).scalars().first()
+    if user is not None and auth_cache is not None:
+        # Cache a detached copy so later commits on this db session cannot expire it
+        detached = models.User(**{column.key: getattr(user, column.key) for column in models.User.__table__.columns})
+        make_transient_to_detached(detached)
+        auth_cache.set(key, detached, generation)
+    return user
+
+
+async def session_owned(user_id, session_token: str, db: AsyncSession) -> bool:
+    """Whether the session belongs to the user; only positive answers are cached"""
+    key = ownership_key(user_id, session_token)
+    if auth_cache is not None:
+        if auth_cache.get(key):
+            return True
+        generation = auth_cache.generation
+
+    owned = (await db.execute(select(models.Session.id).where(
+        models.Session.session_token == session_token,
+        models.Session.user_id == user_id
+    ))).first() is not None
+    if owned and auth_cache is not None:
+        auth_cache.set(key, True, generation)
+    return owned
+
+
+def remember_session(user_id, session_token: str):
+    """Record ownership of a session that was just created"""
+    if auth_cache is not None:
+        auth_cache.set(ownership_key(user_id, session_token), True)
+
+
+def forget_sessions(user_id, session_tokens: Iterable[str]):
+    """Drop ownership of deleted sessions here and in every other worker"""
+    redis_client.invalidate_cached([ownership_key(user_id, token) for token in session_tokens])
+
+
+async def aforget_user(user_id):
+    """Drop a changed user record here and in every other worker"""
+    await async_redis_client.invalidate_cached([user_key(user_id)])
+
+
+async def aforget_sessions(user_id, session_tokens: Iterable[str]):
+    """Async variant of forget_sessions"""
+    await async_redis_client.invalidate_cached([ownership_key(user_id, token) for token in session_tokens])
@@ -9,6 +9,22 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
+
+    # Async app-database pool (asyncpg), per worker
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+
+    # Password hashing: bcrypt cost and the per-worker hashing pool
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 256
+
+    # Per-worker cache of user records and session ownership (see auth_cache.py)
+    auth_cache_enabled: bool = True
+    auth_cache_ttl: float = 60
+    auth_cache_max_entries: int = 10000
     
     
     # Optional fields for compatibility
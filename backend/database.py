@@ -1,20 +1,34 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import settings
 
 
 SQLALCHEMY_DATABASE_URL = settings.userdatabase_url
+# Same database through asyncpg, whatever sync driver the configured URL names
+ASYNC_SQLALCHEMY_DATABASE_URL = make_url(SQLALCHEMY_DATABASE_URL).set(drivername="postgresql+asyncpg")
 
+# Synchronous engine: only used by scripts and benchmarks; the app creates tables in its lifespan
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
 sessionLocal = sessionmaker(autocommit = False , autoflush= False , bind = engine)
 
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True,
+)
+
+# expire_on_commit=False: attributes stay readable after commit without an implicit (awaited) reload
+async_sessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
-def get_db():
-    db = sessionLocal()
-    try:
+async def get_db():
+    async with async_sessionLocal() as db:
         yield db
-    finally:
-        db.close()        
\ No newline at end of file
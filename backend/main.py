@@ -1,16 +1,19 @@
 from fastapi import FastAPI , HTTPException , status 
+from fastapi.responses import JSONResponse, StreamingResponse
 from schemas import DBConfig , QueryRequest
 from contextlib import asynccontextmanager
 from langchain_core.messages import HumanMessage
 import models
-from database import engine, get_db
-from sqlalchemy.orm import Session
+from database import async_engine, async_sessionLocal, get_db
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
+import asyncio
+import json
 import logging
 import os
 import sys
 from routers import user, google_auth , databases , sessions
-import oauth2
+import oauth2, auth_cache, utils
 from fastapi import Depends
 import redis
 from database import get_db
@@ -19,46 +22,55 @@ from database import get_db
 # Add parent directory to path to allow importing from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.Tools_Functions.db_connector import DBConnector
-from src.Graph.graph import Graph_builder
-from src.Agent.agent import SQLAgent
-from src.LLM.llm_with_tools import llm_with_tools
+# Graphs, tools and LLM models are built on first use, not at import or startup
+from src.LLM.gateway import llm_gateway
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ENGINE_SWEEP_INTERVAL = float(os.getenv("DB_ENGINE_SWEEP_INTERVAL", "60"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
 
-global_graph = None 
-global_agent = None
-global_main_llm = None
-global_db_connector = None
+
+async def ping_database():
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def sweep_engines():
+    """Periodically release expired sessions' connectors and dispose idle customer engines"""
+    from src.Tools_Functions.engine_registry import engine_registry
+    while True:
+        await asyncio.sleep(ENGINE_SWEEP_INTERVAL)
+        try:
+            # Only sessions that went through the tools hold connectors; don't import them just to sweep
+            tools = sys.modules.get("src.Tools.Tools")
+            if tools is not None:
+                released = await tools.arelease_expired_sessions()
+                if released:
+                    logger.info(f"Released resources of {released} expired sessions")
+            engine_registry.evict_idle()
+        except Exception as e:
+            logger.error(f"Engine sweep failed: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global global_graph
-    global global_agent
-    global global_main_llm
     logger.info("Starting App's Lifespan")
     logger.info("Connecting to Main Database")
     # Test main database connection early so startup fails fast if DB is unreachable
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        await ping_database()
         logger.info("Connected to main database successfully")
+        # Here rather than at import, so importing the app never connects to Postgres
+        async with async_engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
     except Exception as e:
         logger.error(f"Failed to connect to main database: {e}")
         # Re-raise to abort application startup
         raise
     
 
-    logger.info("Building the graph")
-    global_graph = Graph_builder().get_compiled_graph()
-    logger.info("Initializing the main LLM")
-    global_main_llm = llm_with_tools().llm_with_tools()
-    logger.info("Creating the SQL agent")
-    global_agent = SQLAgent().get_agent(global_main_llm) 
-    logger.info("Agent is online") 
     logger.info("connecting to redis...")
     try:
         # Use our Redis client module for consistency
@@ -74,42 +86,42 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to connect to Redis: {e}")
         raise e
     
+    sweeper = asyncio.create_task(sweep_engines())
     yield
     
     # Cleanup when shutting down
     logger.info("Shutting down application...")
+    sweeper.cancel()
+    utils.password_hasher.shutdown()
     try:
         # Clear session connectors cache
         logger.info("Clearing session connectors cache...")
         from src.Tools.Tools import session_connectors
         session_connectors.clear()
         logger.info("Session connectors cache cleared")
+
+        logger.info("Disposing shared database engines...")
+        from src.Tools_Functions.engine_registry import engine_registry
+        await engine_registry.adispose_all()
+        await async_engine.dispose()
+        await llm_gateway.aclose()
         
-        # Clear Redis database
-        logger.info("Clearing Redis database...")
+        # Sessions, checkpoints and schemas are shared by every worker and outlive
+        # this one; they expire through their TTLs (purge: python -m src.Tools.purge_redis)
         from src.redis_client import redis_client
-        if redis_client.is_connected():
-            # Clear all session data
-            keys = redis_client.keys("session:*")
-            if keys:
-                redis_client.delete(*keys)
-                logger.info(f"Cleared {len(keys)} session keys from Redis")
-            else:
-                logger.info("No session keys found in Redis")
-            
-            # Close the Redis connection
-            if hasattr(redis_client, 'redis_client') and redis_client.redis_client:
-                redis_client.redis_client.close()
-                logger.info("Redis connection closed")
-        else:
-            logger.info("Redis was not connected during shutdown")
+        # Both pools, the decoded and the binary one, whether or not Redis is reachable now
+        redis_client.close()
+        logger.info("Redis connections closed")
+
+        from src.redis_client import async_redis_client
+        await async_redis_client.close()
+        logger.info("Async Redis pool closed")
     except Exception as e:
         logger.error(f"Error during Redis cleanup: {e}")
     
     logger.info("Application shutdown complete")
     
 
-models.Base.metadata.create_all(bind=engine)  # Create tables in the database
 app = FastAPI(lifespan=lifespan , title="SQLAgent API", description="API for SQLAgent using FastAPI")
 app.include_router(user.router)
 app.include_router(sessions.router)
@@ -124,31 +136,49 @@ app.include_router(databases.router )
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    global global_graph
-    global global_agent
-    global global_main_llm
-    if global_graph is None:
-        return {"status": "unhealthy", "message": "Graph not initialized"}
-    if global_agent is None:
-        return {"status": "unhealthy", "message": "Agent not initialized"}
-    if global_main_llm is None:
-        return {"status": "unhealthy", "message": "Main LLM not initialized"}
-    return {"status": "healthy", "message": "Service is up and running"}
+    """Health check endpoint: 503 unless Postgres and Redis both answer"""
+    from src.local_cache import local_cache
+    from src.redis_client import async_redis_client
+
+    checks = {}
+    try:
+        await asyncio.wait_for(ping_database(), HEALTH_CHECK_TIMEOUT)
+        checks["postgres"] = "ok"
+    except Exception as e:
+        logger.warning(f"Health check: Postgres unavailable: {e}")
+        checks["postgres"] = f"error: {type(e).__name__}"
+    try:
+        redis_ok = await asyncio.wait_for(async_redis_client.is_connected(), HEALTH_CHECK_TIMEOUT)
+    except asyncio.TimeoutError:
+        redis_ok = False
+    checks["redis"] = "ok" if redis_ok else "error: no reply to PING"
+    healthy = all(result == "ok" for result in checks.values())
+
+    return JSONResponse(status_code=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE, content={
+        "status": "healthy" if healthy else "unhealthy",
+        "message": "Service is up and running" if healthy else "A dependency is unavailable",
+        "checks": checks,
+        # Per-worker in-process cache in front of Redis
+        "l1_cache": local_cache.stats() if local_cache is not None else None,
+        "auth_cache": auth_cache.auth_cache.stats() if auth_cache.auth_cache is not None else None,
+        "password_hashing": utils.password_hasher.stats(),
+        # Rate-limit queue in front of the LLM provider
+        "llm_gateway": llm_gateway.stats()
+    })
 
 @app.get("/health/session/{session_id}")
 async def session_health_check(
     session_id: str,
     current_user: models.User = Depends(oauth2.get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Health check endpoint with session information"""
     # Validate that the session belongs to the user
-    session = oauth2.get_current_session_by_id(session_id, current_user, db)
+    session = await oauth2.get_current_session_by_id(session_id, current_user, db)
     
     try:
-        from src.Tools.Tools import is_database_connected
-        db_connected = is_database_connected(session_id)
+        from src.Tools.Tools import ais_database_connected
+        db_connected = await ais_database_connected(session_id)
     except:
         db_connected = False
     
@@ -163,37 +193,37 @@ async def session_health_check(
 
 
 
+async def validate_query_request(query_request: QueryRequest, current_user: models.User, db: AsyncSession):
+    """Ensure the payload's user and session belong to the authenticated user"""
+    # Validate that the user in the payload matches the authenticated user
+    if query_request.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, 
+            detail="User ID in payload does not match authenticated user"
+        )
+    
+    # Validate that the session belongs to the user (cached per worker, database on a miss)
+    if not await auth_cache.session_owned(current_user.id, query_request.session_id, db):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, 
+            detail="Session ID does not belong to the authenticated user or session not found"
+        )
+
+
 @app.post("/ask", response_model=str, status_code=status.HTTP_200_OK)
 async def ask_question(
     query_request: QueryRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user)
 ):
     try:
-        # Validate that the user in the payload matches the authenticated user
-        if query_request.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, 
-                detail="User ID in payload does not match authenticated user"
-            )
-        
-        # Validate that the session belongs to the user by checking the database
-        user_session = db.query(models.Session).filter(
-            models.Session.session_token == query_request.session_id,
-            models.Session.user_id == current_user.id
-        ).first()
+        await validate_query_request(query_request, current_user, db)
         
-        if not user_session:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, 
-                detail="Session ID does not belong to the authenticated user or session not found"
-            )
+        # Shared graph; the session is selected by the thread_id in the run config
+        from src.Graph.graph import get_graph
+        session_graph = get_graph(query_request.mode)
         
-        # Get session-specific graph using the validated session_id
-        from src.Graph.graph import get_session_graph
-        session_graph = get_session_graph(query_request.session_id)
-        
-        logger.info(f"Received question from user {current_user.id}, session/thread {query_request.session_id}: {query_request.question}")
+        logger.info(f"Received question from user {current_user.id}, session/thread {query_request.session_id} ({query_request.mode} mode): {query_request.question}")
         
         # Use session_id as thread_id for conversation memory - session_id IS the thread_id (UUID)
         config = {"configurable": {"thread_id": query_request.session_id}}
@@ -217,4 +247,88 @@ async def ask_question(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error occurred with exception: {e}")
 
 
+def sse_event(event: str, data: dict) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def graph_event_to_sse(event: dict):
+    """Translate an astream_events (v2) event into an SSE frame, or None to skip it"""
+    kind = event["event"]
+    name = event.get("name")
+    metadata = event.get("metadata") or {}
+    node = metadata.get("langgraph_node")
+
+    if kind == "on_chain_start" and name == node:
+        return sse_event("node", {"node": node})
+
+    if kind == "on_chat_model_stream":
+        content = getattr(event["data"].get("chunk"), "content", "")
+        if not content or not isinstance(content, str):
+            return None
+        tags = event.get("tags") or []
+        source = "sql" if "sql_generation" in tags else "summary" if "summary" in tags else "assistant"
+        return sse_event("token", {"node": node, "source": source, "content": content})
+
+    if kind == "on_tool_end" and name in ("generate_sql", "execute_sql_query"):
+        output = event["data"].get("output")
+        content = getattr(output, "content", output)
+        if name == "generate_sql":
+            return sse_event("sql", {"sql": content})
+        return sse_event("rows", {"result": content})
+
+    # Pipeline mode reports the same progress from its fixed nodes
+    if kind == "on_chain_end" and name == node and node in ("generate", "execute"):
+        output = event["data"].get("output") or {}
+        if node == "generate" and output.get("sql"):
+            return sse_event("sql", {"sql": output["sql"]})
+        if node == "execute" and output.get("result"):
+            return sse_event("rows", {"result": output["result"]})
+    return None
+
+
+@app.post("/ask/stream", status_code=status.HTTP_200_OK)
+async def ask_question_stream(
+    query_request: QueryRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(oauth2.get_current_user)
+):
+    """Stream node progress, generated SQL, fetched rows and answer tokens as server-sent events"""
+    # The request's session (shared with get_current_user) would keep its pooled
+    # connection until the stream ends: release it and validate on a short-lived one
+    await db.close()
+    async with async_sessionLocal() as validation_db:
+        await validate_query_request(query_request, current_user, validation_db)
+
+    from src.Graph.graph import get_graph
+    session_graph = get_graph(query_request.mode)
+    config = {"configurable": {"thread_id": query_request.session_id}}
+    logger.info(f"Streaming question from user {current_user.id}, session/thread {query_request.session_id} ({query_request.mode} mode): {query_request.question}")
+
+    async def event_stream():
+        final_answer = None
+        try:
+            async for event in session_graph.astream_events(
+                {"messages": [HumanMessage(content=query_request.question)]},
+                config=config,
+                version="v2"
+            ):
+                if event["event"] == "on_chain_end" and not event.get("parent_ids"):
+                    # Root run finished: its output is the final graph state
+                    messages = (event["data"].get("output") or {}).get("messages") or []
+                    if messages:
+                        final_answer = getattr(messages[-1], "content", str(messages[-1]))
+                    continue
+                frame = graph_event_to_sse(event)
+                if frame:
+                    yield frame
+            yield sse_event("done", {"answer": final_answer or "No response generated"})
+        except Exception as e:
+            logger.error(f"Error occurred while streaming: {e}")
+            yield sse_event("error", {"detail": f"Error occurred with exception: {e}"})
 
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
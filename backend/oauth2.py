@@ -1,10 +1,11 @@
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
-import schemas, database, models
+import schemas, database, models, auth_cache
 from config import settings
 from fastapi import Depends, HTTPException, status 
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
@@ -39,7 +40,7 @@ def verify_access_token(token: str, credentials_exception):
     return token_data
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -47,31 +48,26 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     )
     
     token_data = verify_access_token(token, credentials_exception)
-    user = db.query(models.User).filter(models.User.id == token_data.id).first()
+    user = await auth_cache.get_user(token_data.id, db)
     
     return user
 
 
-def get_current_session_by_id(session_id: str, current_user: models.User, db: Session):
+async def get_current_session_by_id(session_id: str, current_user: models.User, db: AsyncSession):
     """Validate that a session belongs to the current user"""
-    session = db.query(models.Session).filter(
-        models.Session.session_token == session_id,
-        models.Session.user_id == current_user.id
-    ).first()
-    
-    if not session:
+    if not await auth_cache.session_owned(current_user.id, session_id, db):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Session not found or does not belong to the user"
         )
     
-    return session
+    return session_id
         
-def get_user_latest_session(current_user: models.User, db: Session):
+async def get_user_latest_session(current_user: models.User, db: AsyncSession):
     """Get the most recent session for a user (helper function)"""
-    session = db.query(models.Session).filter(
+    session = (await db.execute(select(models.Session).where(
         models.Session.user_id == current_user.id
-    ).order_by(models.Session.created_at.desc()).first()
+    ).order_by(models.Session.created_at.desc()))).scalars().first()
     
     return session 
     
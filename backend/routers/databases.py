@@ -1,7 +1,9 @@
+import asyncio
 import models, schemas, utils
 from database import get_db
 from fastapi import FastAPI , status , HTTPException , Depends , APIRouter
-from sqlalchemy.orm import Session 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import oauth2
 from urllib.parse import quote_plus
 
@@ -15,7 +17,7 @@ router = APIRouter(
 @router.post("/add_db_connection", status_code=status.HTTP_201_CREATED)
 async def add_db_connection(
     new_db: schemas.DBConfig, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user)
 ):
     # Create database connection with automatic owner_id from authenticated user
@@ -32,8 +34,8 @@ async def add_db_connection(
     
     new_database = models.DB_Connection_Details(**db_data)
     db.add(new_database)
-    db.commit()
-    db.refresh(new_database)
+    await db.commit()
+    await db.refresh(new_database)
     
     # Return proper response with serializable data
     return {
@@ -50,20 +52,27 @@ async def add_db_connection(
         }
     }
 
+def _check_connection(connection_string: str):
+    """Open a connection and run a trivial query, raising on failure"""
+    from src.Tools_Functions.db_connector import DBConnector
+    from sqlalchemy import text
+    # Unowned connector: the pooled engine is reused by a later connect_db
+    # and disposed by the engine registry once idle
+    connection = DBConnector(connection_string).connect()
+    try:
+        connection.execute(text("SELECT 1"))
+    finally:
+        connection.close()
+
+
 @router.get("/test_db_connection/{connection_string}", status_code=status.HTTP_200_OK)
 async def test_db_connection(
     connection_string: str,
 ):
     """Test database connection using the provided connection string"""
     try:
-        from src.Tools_Functions.db_connector import DBConnector
-        db_connector = DBConnector(connection_string)
-        connection = db_connector.connect()
-        
-        # Test if we can execute a simple query
-        from sqlalchemy import text
-        result = connection.execute(text("SELECT 1"))
-        connection.close()
+        # Connecting blocks for up to the connect timeout: keep it off the event loop
+        await asyncio.to_thread(_check_connection, connection_string)
         
         return {"message": "Database connection successful"}
     except Exception as e:
@@ -88,18 +97,18 @@ async def test_db_connection(
 async def connect_db(
     db_id: int,
     session_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user)
 ): 
     try:
         # Validate that the session belongs to the current user
-        session = oauth2.get_current_session_by_id(session_id, current_user, db)
+        session = await oauth2.get_current_session_by_id(session_id, current_user, db)
         
         # Get the database connection details and ensure it belongs to the current user
-        db_details = db.query(models.DB_Connection_Details).filter(
+        db_details = (await db.execute(select(models.DB_Connection_Details).where(
             models.DB_Connection_Details.id == db_id,
             models.DB_Connection_Details.owner_id == current_user.id 
-        ).first()
+        ))).scalars().first()
         
         if not db_details:
             raise HTTPException(
@@ -113,10 +122,11 @@ async def connect_db(
         encoded_password = quote_plus(db_details.db_password)
         connection_string = f"postgresql+psycopg2://{encoded_username}:{encoded_password}@{db_details.host}:{db_details.port}/{db_details.database_name}"
         
-        # Test the connection by creating a DBConnector and attempting to connect
+        # Test the connection by creating a DBConnector and attempting to connect;
+        # this warms the shared pool the session's tools will use
         from src.Tools_Functions.db_connector import DBConnector
-        db_connector = DBConnector(connection_string)
-        connection = db_connector.connect()
+        db_connector = DBConnector(connection_string, session_id)
+        connection = await asyncio.to_thread(db_connector.connect)
         
         # If successful, close the test connection
         connection.close()
@@ -124,7 +134,8 @@ async def connect_db(
         # Update the session-specific database connector in Tools system
         try:
             from src.Tools.Tools import update_db_connector
-            update_success = update_db_connector(connection_string, session_id)
+            # Blocking Redis writes and schema introspection: keep them off the event loop
+            update_success = await asyncio.to_thread(update_db_connector, connection_string, session_id, current_user.id)
             if not update_success:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
@@ -153,7 +164,7 @@ async def connect_db(
 @router.get("/databases/{user_id}", status_code=status.HTTP_200_OK)
 async def get_user_dbs(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user)
 ):  
     if current_user.id != user_id:
@@ -162,9 +173,9 @@ async def get_user_dbs(
                 detail="You do not have permission to access these databases"
             )
     # Get databases for the currently authenticated user only
-    db_connections = db.query(models.DB_Connection_Details).filter(
+    db_connections = (await db.execute(select(models.DB_Connection_Details).where(
         models.DB_Connection_Details.owner_id == user_id
-    ).all()
+    ))).scalars().all()
     
     return {
         "user_id": user_id,
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import requests
 import models, schemas, database, oauth2
 from config import settings
-from datetime import datetime
+from datetime import datetime, timezone
 import urllib.parse
 
 
@@ -29,7 +30,7 @@ async def google_login():
 
 
 @router.get("/callback")
-async def google_callback(code: str, db: Session = Depends(database.get_db)):
+async def google_callback(code: str, db: AsyncSession = Depends(database.get_db)):
     """Handle Google OAuth callback and create/login user"""
     try:
         # Exchange authorization code for access token
@@ -61,7 +62,7 @@ async def google_callback(code: str, db: Session = Depends(database.get_db)):
         user_info = user_response.json()
         
         # Check if user exists in database
-        user = db.query(models.User).filter(models.User.email == user_info["email"]).first()
+        user = (await db.execute(select(models.User).where(models.User.email == user_info["email"]))).scalars().first()
         
         if not user:
             # Create new user
@@ -69,12 +70,12 @@ async def google_callback(code: str, db: Session = Depends(database.get_db)):
                 "name": user_info.get("name", user_info.get("email", "Unknown")),
                 "email": user_info["email"],
                 "password": "google_oauth",  # Placeholder password for Google users
-                "created_at": datetime.utcnow()
+                "created_at": datetime.now(timezone.utc)
             }
             user = models.User(**new_user_data)
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
         
         # Generate JWT token for the user
         access_token = oauth2.create_access_token(data={"user_id": user.id})
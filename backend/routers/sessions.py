@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
 import models, schemas, database, utils 
-import oauth2
+import oauth2, auth_cache
 from database import get_db
 
 router = APIRouter(
@@ -13,16 +14,16 @@ router = APIRouter(
 async def get_session_status(
     session_id: str,
     current_user: models.User = Depends(oauth2.get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get specific session information and database connection status"""
     # Validate session belongs to user
-    session = oauth2.get_current_session_by_id(session_id, current_user, db)
+    session = await oauth2.get_current_session_by_id(session_id, current_user, db)
     
     # Check if database is connected for this session
     try:
-        from src.Tools.Tools import is_database_connected
-        db_connected = is_database_connected(session_id)
+        from src.Tools.Tools import ais_database_connected
+        db_connected = await ais_database_connected(session_id)
     except ImportError:
         db_connected = False
     
@@ -38,10 +39,10 @@ async def get_session_status(
 @router.get("/all_sessions", status_code=status.HTTP_200_OK)
 async def get_all_sessions(
     current_user: models.User = Depends(oauth2.get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all active sessions for the current user"""
-    sessions = db.query(models.Session).filter(models.Session.user_id == current_user.id).all()
+    sessions = (await db.execute(select(models.Session).where(models.Session.user_id == current_user.id))).scalars().all()
     
     session_list = [{"session_id": s.session_token} for s in sessions]
     
@@ -55,12 +56,12 @@ async def get_all_sessions(
 @router.delete("/delete_all_sessions", status_code=status.HTTP_200_OK)
 async def delete_all_sessions(
     current_user: models.User = Depends(oauth2.get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete all sessions for the current user"""
     
     # Query sessions directly from database
-    sessions = db.query(models.Session).filter(models.Session.user_id == current_user.id).all()
+    sessions = (await db.execute(select(models.Session).where(models.Session.user_id == current_user.id))).scalars().all()
     
     if not sessions:
         raise HTTPException(
@@ -70,18 +71,18 @@ async def delete_all_sessions(
     
     # Clean up session resources before deleting from database
     try:
-        from src.Tools.Tools import cleanup_session
-        for session in sessions:
-            cleanup_session(session.session_token)
+        from src.Tools.Tools import acleanup_user_sessions
+        await acleanup_user_sessions(current_user.id, [session.session_token for session in sessions])
     except ImportError:
         pass  # Tools cleanup is optional
     
     # Delete all sessions from database
     session_count = len(sessions)
     for session in sessions:
-        db.delete(session)
+        await db.delete(session)
     
-    db.commit()
+    await db.commit()
+    await auth_cache.aforget_sessions(current_user.id, [session.session_token for session in sessions])
     
     return {
         "message": "All sessions deleted successfully",
@@ -93,14 +94,14 @@ async def delete_all_sessions(
 async def delete_session(
     session_id: str,
     current_user: models.User = Depends(oauth2.get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a specific session for the current user"""
     
-    session = db.query(models.Session).filter(
+    session = (await db.execute(select(models.Session).where(
         models.Session.session_token == session_id,
         models.Session.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not session:
         raise HTTPException(
@@ -110,13 +111,14 @@ async def delete_session(
     
     # Clean up session resources before deleting from database
     try:
-        from src.Tools.Tools import cleanup_session
-        cleanup_session(session_id)
+        from src.Tools.Tools import acleanup_session
+        await acleanup_session(session_id)
     except ImportError:
         pass  # Tools cleanup is optional
     
-    db.delete(session)
-    db.commit()
+    await db.delete(session)
+    await db.commit()
+    await auth_cache.aforget_sessions(current_user.id, [session_id])
         
     return {
             "message": "Session deleted successfully",
@@ -131,7 +133,7 @@ async def delete_session(
 @router.get("/new_session", status_code=status.HTTP_201_CREATED)
 async def create_new_session(
     current_user: models.User = Depends(oauth2.get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new session for the current user"""
     import uuid
@@ -145,8 +147,9 @@ async def create_new_session(
     )
     
     db.add(new_session)
-    db.commit()
-    db.refresh(new_session)
+    await db.commit()
+    await db.refresh(new_session)
+    auth_cache.remember_session(current_user.id, new_session.session_token)
     
     return {
         "message": "New session created successfully",
@@ -160,13 +163,13 @@ async def create_new_session(
 async def select_session(
     session_id: str,
     user_session: models.User = Depends(oauth2.get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     
-    session = db.query(models.Session).filter(
+    session = (await db.execute(select(models.Session).where(
         models.Session.session_token == session_id,
         models.Session.user_id == user_session.id
-    ).first()
+    ))).scalars().first()
 
     if not session:
         raise HTTPException(
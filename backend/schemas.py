@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field  ,  EmailStr
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 
 
@@ -16,6 +16,11 @@ class QueryRequest(BaseModel):
     user_id: int = Field(..., description="ID of the user making the request")
     session_id: str = Field(..., description="Session ID (UUID) that serves as thread_id")
     question: str = Field(..., description="The user's question to be answered using SQL queries")
+    mode: Literal["agent", "pipeline"] = Field(
+        "agent",
+        description="'agent' runs the tool-calling loop; 'pipeline' runs generate/validate/execute/summarize "
+                    "as fixed steps and falls back to the agent on errors or ambiguous questions"
+    )
     
 
 
@@ -1,9 +1,103 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+from config import settings
+
+# Hashes made with other rounds still verify; verify_and_update flags them for rehash
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 
 def hash(password:str):
     return pwd_context.hash(password)  # Hash the password using bcrypt
 
 
 def verify(plain_password , hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)  # Verify the password against the hashed password
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)  # Verify the password against the hashed password
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool instead of the event loop.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism up
+    to ``workers``. Calls beyond ``workers + max_queue`` in flight are refused
+    with 503 rather than queued without bound. ``workers=0`` hashes inline on
+    the event loop (the old behaviour, kept for benchmarks).
+    """
+
+    def __init__(self, workers: int = settings.password_hash_workers,
+                 max_queue: int = settings.password_hash_max_queue):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash") if workers > 0 else None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _record_wait(self, wait: float):
+        with self._lock:
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    async def _run(self, fn, *args) -> Any:
+        with self._lock:
+            if self.executor is not None and self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent logins, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+        submitted = time.perf_counter()
+
+        def task():
+            # Time spent queued behind other hashes
+            self._record_wait(time.perf_counter() - submitted)
+            return fn(*args)
+
+        try:
+            if self.executor is None:
+                return task()
+            return await asyncio.get_running_loop().run_in_executor(self.executor, task)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new_hash); new_hash is set when the stored hash uses outdated parameters"""
+        return await self._run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": min(self.pending, self.workers) if self.executor is not None else self.pending,
+                "queued": max(self.pending - self.workers, 0) if self.executor is not None else 0,
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": self.total_wait / self.completed * 1000 if self.completed else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher()
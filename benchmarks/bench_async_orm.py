@@ -0,0 +1,108 @@
+"""
+Throughput of the backend's auth queries under concurrent requests: the old
+blocking Session (psycopg2 on the event loop) versus AsyncSession on asyncpg.
+
+Each simulated request runs what get_current_user and the ownership check run
+with a cold auth cache: load the user by id, then look up the session row.
+--workers coroutines share --requests requests while a heartbeat coroutine
+records the worst event-loop stall. Add --sleep to make every request also
+wait in Postgres (pg_sleep), the way a slow or busy database would.
+
+Uses the app database from USERDATABASE_URL; a throwaway user and session are
+created and removed.
+
+    python benchmarks/bench_async_orm.py --requests 2000 --workers 50 [--sleep 0.01]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from sqlalchemy import select, text
+
+import models
+from benchmarks.bench_async_sql import heartbeat
+from database import async_engine, async_sessionLocal, sessionLocal
+
+
+async def drive(label: str, request, requests: int, workers: int):
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(stop))
+    await asyncio.sleep(0)
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            await request()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    worst_lag = await beat
+    print(f"{label:<10} {elapsed:8.2f}s  {requests / elapsed:8.1f} req/s  max loop lag {worst_lag * 1000:8.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--sleep", type=float, default=0.0)
+    args = parser.parse_args()
+
+    setup = sessionLocal()
+    user = models.User(
+        name="bench", email=f"bench-{uuid.uuid4()}@example.com", password="bench", number_of_connections=0
+    )
+    setup.add(user)
+    setup.commit()
+    session = models.Session(session_token=str(uuid.uuid4()), user_id=user.id)
+    setup.add(session)
+    setup.commit()
+    user_id, session_token = user.id, session.session_token
+
+    def statements():
+        yield select(models.User).where(models.User.id == user_id)
+        yield select(models.Session.id).where(
+            models.Session.session_token == session_token, models.Session.user_id == user_id
+        )
+        if args.sleep:
+            yield text(f"SELECT pg_sleep({args.sleep})")
+
+    async def blocking_request():
+        db = sessionLocal()
+        try:
+            for statement in statements():
+                db.execute(statement).first()
+        finally:
+            db.close()
+
+    async def async_request():
+        async with async_sessionLocal() as db:
+            for statement in statements():
+                (await db.execute(statement)).first()
+
+    # Warm both pools so connection setup is not part of the measurement
+    await blocking_request()
+    await asyncio.gather(*(async_request() for _ in range(min(args.workers, async_engine.pool.size()))))
+
+    print(f"{args.requests} requests from {args.workers} concurrent workers")
+    try:
+        await drive("blocking", blocking_request, args.requests, args.workers)
+        await drive("asyncpg", async_request, args.requests, args.workers)
+    finally:
+        setup.delete(session)
+        setup.delete(user)
+        setup.commit()
+        setup.close()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""
+Event-loop responsiveness while Redis calls are in flight: RedisClient (blocking)
+versus AsyncRedisClient.
+
+Each slow call is a BLPOP on an empty list, which holds its own connection for
+--wait seconds without blocking the Redis server for other clients. A batch of
+session-style HMGETs measures plain throughput. A heartbeat coroutine records
+the worst event-loop stall in both cases.
+
+    REDIS_URL=redis://localhost:6379/15 python benchmarks/bench_async_redis.py --concurrency 20 --wait 1
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_async_sql import run
+from src.redis_client import async_redis_client, redis_client
+from src.redis_keys import session_key
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--wait", type=int, default=1)
+    parser.add_argument("--reads", type=int, default=2000)
+    args = parser.parse_args()
+
+    empty_list = f"bench:empty:{uuid.uuid4()}"
+    session_hash = session_key(f"bench-{uuid.uuid4()}")
+    redis_client.hset(session_hash, mapping={"connection_string": "postgresql://bench", "status": "connected"})
+
+    async def blocking_wait():
+        return redis_client.redis_client.blpop(empty_list, timeout=args.wait)
+
+    async def async_wait():
+        return await async_redis_client.redis_client.blpop(empty_list, timeout=args.wait)
+
+    async def blocking_read():
+        return redis_client.hmget(session_hash, "connection_string", "status")
+
+    async def async_read():
+        return await async_redis_client.hmget(session_hash, "connection_string", "status")
+
+    print(f"{args.concurrency} concurrent {args.wait}s BLPOPs")
+    await run("blocking", blocking_wait, args.concurrency)
+    await run("asyncio", async_wait, args.concurrency)
+
+    print(f"{args.reads} concurrent session HMGETs")
+    await run("blocking", blocking_read, args.reads)
+    await run("asyncio", async_read, args.reads)
+
+    redis_client.delete(session_hash)
+    await async_redis_client.close()
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    asyncio.run(main())
+    print(f"total {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,95 @@
+"""
+App-database queries per authenticated request, with and without the auth cache.
+
+Creates a throwaway user and session in the app database (USERDATABASE_URL),
+then drives /health/session/{id} -- the same get_current_user + ownership
+check that /ask and /connect_db run -- through FastAPI's TestClient, counting
+statements with a before_cursor_execute listener. The lifespan is not run, so
+no graph or LLM is built. The user and session are removed afterwards.
+
+    python benchmarks/bench_auth_cache.py --requests 500
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import auth_cache
+import models
+import oauth2
+from database import async_engine, engine, sessionLocal
+from main import app
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def drive(client: TestClient, path: str, headers: dict, requests: int, counter: QueryCounter):
+    counter.count = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(path, headers=headers)
+        response.raise_for_status()
+    elapsed = time.perf_counter() - start
+    return counter.count / requests, elapsed / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    # The lifespan, which creates the tables, is not run
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionLocal()
+    user = models.User(
+        name="bench", email=f"bench-{uuid.uuid4()}@example.com", password="bench", number_of_connections=0
+    )
+    db.add(user)
+    db.commit()
+    session = models.Session(session_token=str(uuid.uuid4()), user_id=user.id)
+    db.add(session)
+    db.commit()
+
+    headers = {"Authorization": f"Bearer {oauth2.create_access_token({'user_id': user.id})}"}
+    path = f"/health/session/{session.session_token}"
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    client = TestClient(app)
+
+    try:
+        cache = auth_cache.auth_cache
+        auth_cache.auth_cache = None
+        uncached = drive(client, path, headers, args.requests, counter)
+        auth_cache.auth_cache = cache
+        cached = drive(client, path, headers, args.requests, counter)
+
+        print(f"{args.requests} requests to {path}")
+        print(f"  no auth cache   {uncached[0]:6.2f} queries/request  {uncached[1]:8.2f} ms/request")
+        if cache is None:
+            print("  auth cache disabled by AUTH_CACHE_ENABLED")
+        else:
+            print(f"  auth cache      {cached[0]:6.2f} queries/request  {cached[1]:8.2f} ms/request  {cache.stats()}")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+        db.delete(session)
+        db.delete(user)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Prompt tokens per turn over a long session: full history versus HistoryManager.
+
+A synthetic 40-turn conversation, each turn with a generate_sql call, an
+execute_sql_query call returning a result table and a final answer. No LLM is
+called; removals are applied to the state the way the add_messages reducer does.
+
+    python benchmarks/bench_history_window.py --turns 40 --result-rows 50
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
+
+from src.Agent.agent import SQLAgent
+from src.Agent.history import HistoryManager, message_tokens
+
+
+def make_turn(i: int, result_rows: int):
+    sql = f"SELECT customer_id, SUM(amount) FROM orders WHERE region_id = {i} GROUP BY customer_id"
+    result = "customer_id | sum\n" + "\n".join(f"{r} | {r * 17.5:.2f}" for r in range(result_rows))
+    gen_id, exec_id = f"call_{uuid.uuid4().hex[:8]}", f"call_{uuid.uuid4().hex[:8]}"
+    return [
+        HumanMessage(content=f"What did each customer spend in region {i}?", id=str(uuid.uuid4())),
+        AIMessage(content="", tool_calls=[{"name": "generate_sql", "args": {"question": f"region {i}"}, "id": gen_id}], id=str(uuid.uuid4())),
+        ToolMessage(content=sql, tool_call_id=gen_id, id=str(uuid.uuid4())),
+        AIMessage(content="", tool_calls=[{"name": "execute_sql_query", "args": {"query": sql}, "id": exec_id}], id=str(uuid.uuid4())),
+        ToolMessage(content=result, tool_call_id=exec_id, id=str(uuid.uuid4())),
+        AIMessage(content=f"In region {i}, {result_rows} customers spent a total of {sum(r * 17.5 for r in range(result_rows)):.2f}.", id=str(uuid.uuid4())),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--result-rows", type=int, default=50)
+    args = parser.parse_args()
+
+    system_message = SQLAgent().assistant_system_message
+    manager = HistoryManager()
+    full, state = [], {"messages": [], "summary": None}
+
+    print(f"{'turn':>4} {'full history':>13} {'managed':>8} {'prepare ms':>11}")
+    for i in range(1, args.turns + 1):
+        turn = make_turn(i, args.result_rows)
+        full.extend(turn[:1])
+        state["messages"].extend(turn[:1])
+
+        # Prompt size of the first agent call of the turn
+        full_tokens = message_tokens(HumanMessage(content=system_message)) + sum(message_tokens(m) for m in full)
+        start = time.perf_counter()
+        prompt, update = manager.prepare(system_message, state)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        managed_tokens = sum(message_tokens(m) for m in prompt)
+
+        removed = {m.id for m in update.get("messages", []) if isinstance(m, RemoveMessage)}
+        state["messages"] = [m for m in state["messages"] if m.id not in removed] + turn[1:]
+        state["summary"] = update.get("summary", state["summary"])
+        full.extend(turn[1:])
+
+        if i == 1 or i % 5 == 0:
+            print(f"{i:>4} {full_tokens:>13} {managed_tokens:>8} {elapsed_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
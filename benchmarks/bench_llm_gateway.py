@@ -0,0 +1,129 @@
+"""
+LLM calls under a provider quota: straight to the model versus through the
+gateway's rate limiter and priority queue.
+
+A local fake chat model stands in for Groq and enforces a quota of --quota
+requests per --window seconds, failing with a 429-style error beyond it.
+--calls concurrent calls are fired, a third each at SQL, AGENT and SUMMARY
+priority. Directly, the excess fails; through the gateway (rpm scaled to the
+same quota) everything succeeds and the queue-wait metrics show summaries
+yielding to SQL generation. A third run configures the gateway at twice the
+real quota: the provider's 429s (with Retry-After) drain the buckets and the
+rejected calls are retried. No network is used.
+
+    python benchmarks/bench_llm_gateway.py --calls 60 --quota 10 --window 1
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from src.LLM.gateway import LLMGateway, Priority, RateLimiter
+
+
+class QuotaError(Exception):
+    """What the provider answers with once the quota is spent (HTTP 429)"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("429 Too Many Requests")
+        self.status_code = 429
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": f"{retry_after:.3f}"})
+
+
+class QuotaFakeChatModel(BaseChatModel):
+    quota: int
+    window: float
+    latency: float = 0.05
+    _sent: deque = PrivateAttr(default_factory=deque)
+    _rejected: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "quota-fake"
+
+    def _admit(self):
+        now = time.monotonic()
+        while self._sent and now - self._sent[0] >= self.window:
+            self._sent.popleft()
+        if len(self._sent) >= self.quota:
+            self._rejected += 1
+            raise QuotaError(retry_after=self.window - (now - self._sent[0]))
+        self._sent.append(now)
+
+    def _result(self) -> ChatResult:
+        usage = {"input_tokens": 40, "output_tokens": 10, "total_tokens": 50}
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="SELECT 1", usage_metadata=usage))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None,
+                  **kwargs: Any) -> ChatResult:
+        self._admit()
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None,
+                         **kwargs: Any) -> ChatResult:
+        self._admit()
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+
+async def fire(label: str, models, calls: int, fake: QuotaFakeChatModel):
+    order = [list(Priority)[i % len(Priority)] for i in range(calls)]
+    finished = []
+
+    async def call(priority: Priority):
+        try:
+            await models[priority].ainvoke([HumanMessage(content="How many orders were placed last week?")])
+            finished.append(priority.name)
+        except QuotaError:
+            pass
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(priority) for priority in order))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed:6.2f}s  ok {len(finished):4d}  429s {fake._rejected:4d}")
+    return finished
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--quota", type=int, default=10)
+    parser.add_argument("--window", type=float, default=1.0)
+    args = parser.parse_args()
+
+    direct = QuotaFakeChatModel(quota=args.quota, window=args.window)
+    await fire("direct", {priority: direct for priority in Priority}, args.calls, direct)
+
+    fake = QuotaFakeChatModel(quota=args.quota, window=args.window)
+    # burst=1 spaces calls evenly, which a sliding-window quota always accepts
+    limiter = RateLimiter(rpm=int(args.quota * 60 / args.window), tpm=0, burst=1)
+    gateway = LLMGateway(model_factory=lambda gateway: fake, limiter=limiter)
+    finished = await fire("gateway", {priority: gateway.chat_model(priority) for priority in Priority}, args.calls, fake)
+
+    third = len(finished) // 3
+    print(f"  first third finished: {', '.join(f'{p.name}={finished[:third].count(p.name)}' for p in Priority)}")
+    for name, waits in gateway.stats()["waits"].items():
+        print(f"  {name:<8} granted {waits['granted']:4d}  avg wait {waits['avg_wait_ms']:8.1f} ms  max wait {waits['max_wait_ms']:8.1f} ms")
+
+    # Limits set too high, e.g. several workers each assuming the whole quota
+    fake = QuotaFakeChatModel(quota=args.quota, window=args.window)
+    limiter = RateLimiter(rpm=int(2 * args.quota * 60 / args.window), tpm=0, burst=1)
+    gateway = LLMGateway(model_factory=lambda gateway: fake, limiter=limiter)
+    await fire("gateway 2x", {priority: gateway.chat_model(priority) for priority in Priority}, args.calls, fake)
+    print(f"  429s fed back to the limiter: {gateway.stats()['provider_429s']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
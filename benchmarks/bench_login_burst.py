@@ -0,0 +1,110 @@
+"""
+Health-check latency while login bursts hit the same worker: bcrypt inline on
+the event loop (the old behaviour) versus the bounded hashing pool.
+
+Drives the app in process through httpx's ASGI transport, so both kinds of
+traffic share one event loop exactly as in a single uvicorn worker. --clients
+coroutines poll /health back to back while --bursts bursts of --burst
+concurrent logins arrive every --gap seconds. Reports p50/p99/max for both.
+
+Uses the app database from USERDATABASE_URL; a throwaway user is created and
+removed. The lifespan is not run, so no graph or LLM is built; the tables
+are created directly.
+
+    python benchmarks/bench_login_burst.py --burst 20 --bursts 5 --clients 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "backend"))
+
+import httpx
+
+import models
+import utils
+from database import async_engine, engine, sessionLocal
+from main import app
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"p50 {statistics.median(ordered):8.1f} ms  p99 {p99:8.1f} ms  max {ordered[-1]:8.1f} ms  (n={len(ordered)})"
+
+
+async def timed(client: httpx.AsyncClient, samples: list, method: str, url: str, **kwargs):
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    samples.append((time.perf_counter() - start) * 1000)
+    return response
+
+
+async def scenario(label: str, email: str, password: str, args):
+    health, logins = [], []
+    stop = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def poll():
+            while not stop.is_set():
+                await timed(client, health, "GET", "/health")
+
+        async def login():
+            response = await timed(
+                client, logins, "POST", "/users/login", data={"username": email, "password": password}
+            )
+            response.raise_for_status()
+
+        pollers = [asyncio.create_task(poll()) for _ in range(args.clients)]
+        for _ in range(args.bursts):
+            await asyncio.gather(*(login() for _ in range(args.burst)))
+            await asyncio.sleep(args.gap)
+        stop.set()
+        await asyncio.gather(*pollers)
+
+    print(label)
+    print(f"  /health       {percentiles(health)}")
+    print(f"  /users/login  {percentiles(logins)}")
+    print(f"  hashing pool  {utils.password_hasher.stats()}")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--burst", type=int, default=20)
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--gap", type=float, default=0.5)
+    parser.add_argument("--clients", type=int, default=10)
+    args = parser.parse_args()
+
+    # The lifespan, which creates the tables, is not run
+    models.Base.metadata.create_all(bind=engine)
+    email, password = f"bench-{uuid.uuid4()}@example.com", "bench-password"
+    db = sessionLocal()
+    user = models.User(name="bench", email=email, password=utils.hash(password), number_of_connections=0)
+    db.add(user)
+    db.commit()
+
+    pooled = utils.password_hasher
+    try:
+        utils.password_hasher = utils.PasswordHasher(workers=0)
+        await scenario("bcrypt on the event loop", email, password, args)
+        utils.password_hasher = pooled
+        await scenario(f"bcrypt on a {pooled.workers}-thread pool", email, password, args)
+    finally:
+        utils.password_hasher = pooled
+        pooled.shutdown()
+        db.delete(user)
+        db.commit()
+        db.close()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Compare the legacy list-of-dicts tool output with QueryResult.
+
+Reports build time, retained memory, rendered bytes and tiktoken tokens for a
+synthetic result set.
+
+    python benchmarks/bench_result_format.py --rows 500 --columns 8
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.Tools_Functions.query_result import QueryResult
+from src.Tools_Functions.token_counter import count_tokens
+
+
+def synthetic_rows(n_rows: int, n_columns: int):
+    columns = [f"column_name_{i}" for i in range(n_columns)]
+    base = datetime.datetime(2024, 1, 1)
+    rows = []
+    for r in range(n_rows):
+        row = []
+        for c in range(n_columns):
+            kind = c % 4
+            if kind == 0:
+                row.append(r * 31 + c)
+            elif kind == 1:
+                row.append(f"customer {r % 97} name")
+            elif kind == 2:
+                row.append(round(r * 1.37 + c, 2))
+            else:
+                row.append(base + datetime.timedelta(hours=r))
+        rows.append(tuple(row))
+    return columns, rows
+
+
+def measure(label: str, build, columns, rows):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(columns, rows)
+    build_ms = (time.perf_counter() - start) * 1000
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    rendered = str(result)
+    print(
+        f"{label:<12} build {build_ms:8.2f} ms  memory {retained / 1024:9.1f} KiB  "
+        f"text {len(rendered.encode('utf-8')) / 1024:9.1f} KiB  tokens {count_tokens(rendered):8d}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--columns", type=int, default=8)
+    args = parser.parse_args()
+
+    columns, rows = synthetic_rows(args.rows, args.columns)
+    print(f"{args.rows} rows x {args.columns} columns")
+    measure("dict-rows", lambda cols, rs: [dict(zip(cols, row)) for row in rs], columns, rows)
+    measure("QueryResult", lambda cols, rs: QueryResult(cols, list(rs)), columns, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Token cost of the schema as the LLM sees it: str() of the snapshot dict versus
+the compact render_schema format, measured with tiktoken.
+
+    python benchmarks/bench_schema_format.py --tables 50,500,2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_schema import make_schema
+from src.Tools_Functions.schema_format import SchemaRenderer
+from src.Tools_Functions.token_counter import count_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", default="50,500,2000")
+    args = parser.parse_args()
+
+    for n_tables in map(int, args.tables.split(",")):
+        schema = make_schema(n_tables)
+        legacy = {s: {t: d["columns"] for t, d in tables.items()} for s, tables in schema.items()}
+        renderer = SchemaRenderer()
+
+        start = time.perf_counter()
+        compact = renderer.render(schema, "bench")
+        first_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        renderer.render(schema, "bench")
+        cached_ms = (time.perf_counter() - start) * 1000
+
+        legacy_tokens = count_tokens(str(legacy))
+        full_tokens = count_tokens(str(schema))
+        compact_tokens = count_tokens(compact)
+        print(
+            f"{n_tables:>5} tables  columns-only dict {legacy_tokens:>8}  full dict {full_tokens:>8}  "
+            f"compact {compact_tokens:>7} ({compact_tokens / legacy_tokens:5.1%} of columns-only)  "
+            f"render {first_ms:6.1f} ms, cached {cached_ms:5.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
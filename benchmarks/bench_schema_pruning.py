@@ -0,0 +1,60 @@
+"""
+Prompt size (and optionally generation latency) with and without schema pruning.
+
+    python benchmarks/bench_schema_pruning.py --tables 1500
+    GROQ_API_KEY=... python benchmarks/bench_schema_pruning.py --llm
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_schema import QUESTIONS, make_schema
+from src.Tools_Functions.schema_retriever import SchemaRetriever
+from src.Tools_Functions.token_counter import count_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", type=int, default=1500)
+    parser.add_argument("--no-embeddings", action="store_true")
+    parser.add_argument("--llm", action="store_true", help="also time SQL generation through nlp_chain")
+    args = parser.parse_args()
+
+    schema = make_schema(args.tables)
+    retriever = SchemaRetriever(use_embeddings=not args.no_embeddings)
+
+    start = time.perf_counter()
+    retriever.prune(schema, "bench", QUESTIONS[0])
+    print(f"index build for {args.tables} tables: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    sql_chain = None
+    if args.llm:
+        from src.Tools_Functions.nlp_gen import nlp_chain
+        sql_chain = nlp_chain().get_sql_chain()
+
+    full_tokens = count_tokens(str(schema))
+    for question in QUESTIONS:
+        start = time.perf_counter()
+        pruned = retriever.prune(schema, "bench", question)
+        retrieval_ms = (time.perf_counter() - start) * 1000
+        tables = sum(len(t) for t in pruned.values())
+        line = (f"{question[:45]:<45}  tokens {full_tokens:>8} -> {count_tokens(str(pruned)):>6}  "
+                f"tables {tables:>3}  retrieval {retrieval_ms:6.1f} ms")
+        if sql_chain is not None:
+            timings = []
+            for prompt_schema in (schema, pruned):
+                start = time.perf_counter()
+                try:
+                    sql_chain.invoke({"question": question, "db_schema": prompt_schema})
+                    timings.append(f"{time.perf_counter() - start:6.2f}s")
+                except Exception as e:
+                    timings.append(f"failed ({type(e).__name__})")
+            line += f"  generation {timings[0]} -> {timings[1]}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Schema storage cost: the old JSON string in the session hash versus compressed
+msgpack in the schema store, plus the memoized read that generate_sql now does.
+
+Sizes and codec timings need nothing else; pass --redis to also time the real
+round trips against REDIS_URL.
+
+    python benchmarks/bench_schema_storage.py --tables 2000 --repeat 20 [--redis]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_schema import make_schema
+from src.Tools_Functions.schema_store import SchemaStore, decode, encode
+from src.Tools_Functions.sql_cache import schema_fingerprint
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--redis", action="store_true")
+    args = parser.parse_args()
+
+    schema = make_schema(args.tables)
+    as_json = json.dumps(schema)
+    blob = encode(schema)
+    print(f"{args.tables} tables")
+    print(f"  JSON string       {len(as_json) / 1024:10.1f} KiB  decode {timed(lambda: json.loads(as_json), args.repeat):8.2f} ms")
+    print(f"  msgpack + zlib    {len(blob) / 1024:10.1f} KiB  decode {timed(lambda: decode(blob), args.repeat):8.2f} ms"
+          f"  encode {timed(lambda: encode(schema), args.repeat):8.2f} ms")
+
+    if not args.redis:
+        return
+
+    from src.redis_client import redis_client
+    from src.redis_keys import session_key
+    fingerprint = schema_fingerprint(schema)
+    key = session_key(f"bench-storage-{fingerprint[:8]}")
+    redis_client.hset(key, "db_schema", as_json)
+    store = SchemaStore(redis_client)
+    store.put("bench_schema", fingerprint, schema)
+
+    # The L1 session cache would hide the legacy read, so go to Redis directly
+    legacy = timed(lambda: json.loads(redis_client.redis_client.hget(key, "db_schema")), args.repeat)
+    cold = timed(lambda: decode(redis_client.get_bytes(store._key("bench_schema", fingerprint))), args.repeat)
+    memoized = timed(lambda: store.get("bench_schema", fingerprint), args.repeat)
+    print(f"  per-call read: JSON hash field {legacy:8.2f} ms  store cold {cold:8.2f} ms  store memoized {memoized:8.4f} ms")
+    redis_client.delete(key, store._key("bench_schema", fingerprint))
+
+
+if __name__ == "__main__":
+    main()
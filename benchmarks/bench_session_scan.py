@@ -0,0 +1,109 @@
+"""
+Session enumeration on a large keyspace: KEYS versus SCAN, and per-user cleanup
+through the user_sessions index.
+
+Fills a local Redis with --keys filler keys plus --sessions session hashes spread
+over --users users, then measures each operation together with the worst PING
+latency seen by a second client meanwhile (how long Redis was blocked for
+everyone else). Only keys under bench:* and the created sessions are removed.
+
+    REDIS_URL=redis://localhost:6379/15 python benchmarks/bench_session_scan.py --keys 1000000
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import redis
+
+from src.redis_client import redis_client
+from src.Tools.Tools import SESSION_TTL
+from src.redis_keys import session_key, user_sessions_key
+
+
+class LatencyProbe(threading.Thread):
+    """PINGs from its own connection and keeps the worst round trip"""
+
+    def __init__(self, url: str):
+        super().__init__(daemon=True)
+        self.client = redis.from_url(url)
+        self.stop = threading.Event()
+        self.worst = 0.0
+
+    def run(self):
+        while not self.stop.is_set():
+            start = time.perf_counter()
+            self.client.ping()
+            self.worst = max(self.worst, time.perf_counter() - start)
+            time.sleep(0.001)
+
+
+def measure(label: str, fn):
+    probe = LatencyProbe(redis_client.redis_url)
+    probe.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    probe.stop.set()
+    probe.join()
+    print(f"{label:<36} {elapsed * 1000:10.1f} ms  worst concurrent PING {probe.worst * 1000:8.1f} ms  -> {result}")
+    return result
+
+
+def populate(filler: int, sessions: int, users: int, batch: int = 10000):
+    client = redis_client.redis_client
+    for offset in range(0, filler, batch):
+        with client.pipeline(transaction=False) as pipe:
+            for i in range(offset, min(offset + batch, filler)):
+                pipe.set(f"bench:filler:{i}", "x")
+            pipe.execute()
+    with client.pipeline(transaction=False) as pipe:
+        for i in range(sessions):
+            user_id = f"bench{i % users}"
+            key = session_key(f"bench-{i}")
+            pipe.hset(key, mapping={"connection_string": "postgresql://bench", "user_id": user_id})
+            pipe.expire(key, SESSION_TTL)
+            pipe.sadd(user_sessions_key(user_id), key)
+        pipe.execute()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=1000000)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args()
+
+    # The client connects on first use; populate() talks to the raw client directly
+    if not redis_client.is_connected():
+        sys.exit("Redis is not reachable at REDIS_URL")
+    print(f"populating {args.keys} filler keys and {args.sessions} sessions...")
+    populate(args.keys, args.sessions, args.users)
+
+    measure("KEYS session:*", lambda: len(redis_client.keys(session_key("*"))))
+    measure("SCAN session:*", lambda: sum(1 for _ in redis_client.scan_iter(match=session_key("bench-*"))))
+    measure(
+        "one user's sessions via index",
+        lambda: len(redis_client.smembers(user_sessions_key("bench0"))),
+    )
+    measure(
+        "delete one user's sessions",
+        lambda: redis_client.delete_many(
+            [*redis_client.smembers(user_sessions_key("bench1")), user_sessions_key("bench1")]
+        ),
+    )
+    measure(
+        "delete all sessions (SCAN + UNLINK)",
+        lambda: redis_client.delete_many(redis_client.scan_iter(match=session_key("bench-*")))
+        + redis_client.delete_many(redis_client.scan_iter(match=user_sessions_key("bench*"))),
+    )
+
+    print("removing filler keys...")
+    redis_client.delete_many(redis_client.scan_iter(match="bench:filler:*", count=10000), batch_size=5000)
+
+
+if __name__ == "__main__":
+    main()
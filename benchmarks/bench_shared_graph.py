@@ -0,0 +1,87 @@
+"""
+Memory and first-request graph latency for many sessions: one compiled graph per
+session (the previous behaviour, rebuilt here) versus the shared per-process graph.
+
+The per-session side reproduces what get_session_graph used to build for every
+session: its own ChatGroq client, its own tool objects, an LLM bound to those
+tools, a MemorySaver and the compiled graph. The shared side is get_graph(),
+built once. No network is used; constructing a ChatGroq client makes no request.
+
+    python benchmarks/bench_shared_graph.py --sessions 10000
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "bench-not-used")
+
+from langchain_groq import ChatGroq
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.Agent.agent import SQLAgent
+from src.Graph.graph import GRAPH_MODES, get_graph
+from src.LLM.gateway import LLM_MODEL
+
+
+def per_session_builder(mode: str):
+    """Graph builder with the old per-session construction"""
+
+    class PerSessionBuilder(GRAPH_MODES[mode]):
+        def __init__(self, memory_saver):
+            super().__init__(memory_saver)
+            tools = self.llm_with_tools_instance
+            tools.llm = ChatGroq(model=LLM_MODEL)
+            # create_session_tools made new tool objects for each session
+            tools.tool_box = [tool.model_copy() for tool in tools.tool_box]
+            self.llm_tools = tools.llm_with_tools()
+            self.assistant = SQLAgent().get_agent(self.llm_tools)
+
+    return PerSessionBuilder
+
+
+def measure(label: str, sessions: int, acquire):
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    latencies = []
+    graphs = []
+    for i in range(sessions):
+        session_id = f"bench-{i}"
+        start = time.perf_counter()
+        graphs.append(acquire(session_id))
+        latencies.append((time.perf_counter() - start) * 1000)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies.sort()
+    print(
+        f"{label:<12} {sessions} sessions  retained {(current - baseline) / 2**20:8.1f} MiB  "
+        f"first-request graph ms: mean {statistics.mean(latencies):7.3f}  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1]:7.3f}  max {latencies[-1]:7.3f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--mode", default="agent", choices=sorted(GRAPH_MODES))
+    args = parser.parse_args()
+
+    builder = per_session_builder(args.mode)
+
+    def build_per_session(session_id):
+        # What get_session_graph used to do on the first /ask of every session
+        return builder(MemorySaver()).get_compiled_graph()
+
+    # Graphs are kept alive for the measurement, as session_graphs used to keep them
+    measure("per-session", args.sessions, build_per_session)
+    measure("shared", args.sessions, lambda session_id: get_graph(args.mode))
+
+
+if __name__ == "__main__":
+    main()
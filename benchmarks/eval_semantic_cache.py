@@ -0,0 +1,95 @@
+"""
+Offline evaluation of the semantic SQL cache.
+
+Each case is a cached question, a new phrasing and whether the cached SQL is a
+correct answer for it. The script seeds the cache with the cached questions and
+reports precision/recall of reuse and lookup latency for several thresholds.
+
+    python benchmarks/eval_semantic_cache.py
+    python benchmarks/eval_semantic_cache.py --cases my_cases.jsonl
+        (one {"cached": ..., "asked": ..., "same_sql": true|false} per line)
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.Tools_Functions.embeddings import embed
+from src.Tools_Functions.semantic_cache import SemanticSQLCache
+
+
+DEFAULT_CASES = [
+    ("top 5 customers by revenue", "which five customers spent the most", True),
+    ("top 5 customers by revenue", "show the 5 customers with the highest revenue", True),
+    ("top 5 customers by revenue", "top 10 customers by revenue", False),
+    ("how many orders were placed last month", "number of orders placed in the previous month", True),
+    ("how many orders were placed last month", "how many orders were cancelled last month", False),
+    ("average order value per country", "what is the mean order amount for each country", True),
+    ("average order value per country", "total order value per country", False),
+    ("list all products that are out of stock", "which products have zero inventory", True),
+    ("list all products that are out of stock", "list all products", False),
+    ("total revenue in 2023", "how much revenue did we make in 2023", True),
+    ("total revenue in 2023", "total revenue in 2024", False),
+    ("employees hired after 2020", "show staff who joined after 2020", True),
+    ("employees hired after 2020", "employees who left after 2020", False),
+    ("count of users by signup source", "how many users signed up from each source", True),
+    ("orders placed by Alice last month", "orders Bob placed last month", False),
+    ("customers in 'Berlin'", "customers located in 'Munich'", False),
+]
+
+
+def load_cases(path):
+    if not path:
+        return DEFAULT_CASES
+    with open(path) as f:
+        return [(c["cached"], c["asked"], bool(c["same_sql"])) for c in map(json.loads, f) if c]
+
+
+def evaluate(cases, threshold: float):
+    cache = SemanticSQLCache(embed_fn=embed, threshold=threshold)
+    fingerprint = "eval"
+    for cached in dict.fromkeys(c[0] for c in cases):
+        cache.set(cached, fingerprint, f"-- sql for: {cached}")
+
+    tp = fp = fn = 0
+    missed = []
+    for cached, asked, same_sql in cases:
+        hit = cache.get(asked, fingerprint)
+        correct = hit == f"-- sql for: {cached}"
+        if hit is not None and same_sql and correct:
+            tp += 1
+        elif hit is not None:
+            fp += 1
+        elif same_sql:
+            fn += 1
+            missed.append(asked)
+
+    stats = cache.stats()
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    print(
+        f"threshold {threshold:.2f}  precision {precision:6.2f}  recall {recall:6.2f}  "
+        f"hit rate {stats['hit_rate']:6.2f}  avg lookup {stats['avg_lookup_ms']:6.2f} ms  "
+        f"max lookup {stats['max_lookup_ms']:6.2f} ms"
+    )
+    for asked in missed:
+        print(f"    missed: {asked}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", default=None)
+    parser.add_argument("--thresholds", default="0.80,0.85,0.90,0.95")
+    args = parser.parse_args()
+
+    cases = load_cases(args.cases)
+    embed(["warm up"])
+    print(f"{len(cases)} cases")
+    for threshold in map(float, args.thresholds.split(",")):
+        evaluate(cases, threshold)
+
+
+if __name__ == "__main__":
+    main()
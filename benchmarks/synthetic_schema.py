@@ -0,0 +1,59 @@
+"""Synthetic warehouse-style schemas in the fetch_db snapshot format, for benchmarks."""
+import random
+
+DOMAINS = [
+    "customer", "order", "invoice", "payment", "product", "inventory", "shipment", "supplier",
+    "employee", "department", "campaign", "lead", "ticket", "subscription", "refund", "warehouse",
+    "region", "store", "contract", "asset", "vendor", "budget", "forecast", "session", "event",
+]
+SUFFIXES = ["", "_history", "_archive", "_staging", "_daily", "_monthly", "_audit", "_snapshot", "_detail", "_summary"]
+COLUMN_TYPES = ["integer", "bigint", "text", "character varying(255)", "numeric(12,2)",
+                "timestamp with time zone", "date", "boolean", "jsonb", "uuid"]
+COLUMN_NAMES = ["name", "status", "amount", "created_at", "updated_at", "description", "code", "quantity",
+                "price", "total", "email", "country", "city", "category", "priority", "notes", "score",
+                "started_at", "ended_at", "is_active"]
+
+
+def make_schema(n_tables: int = 1500, seed: int = 7):
+    """{schema: {table: {columns, primary_key, foreign_keys, indexes}}}"""
+    rng = random.Random(seed)
+    names = []
+    schemas = ["public", "sales", "ops", "finance", "analytics"]
+    i = 0
+    while len(names) < n_tables:
+        domain = DOMAINS[i % len(DOMAINS)]
+        suffix = SUFFIXES[(i // len(DOMAINS)) % len(SUFFIXES)]
+        generation = i // (len(DOMAINS) * len(SUFFIXES))
+        table = f"{domain}{suffix}" + (f"_v{generation}" if generation else "")
+        names.append((schemas[i % len(schemas)], table, domain))
+        i += 1
+
+    overview = {}
+    for schema, table, domain in names:
+        columns = [{"column": "id", "type": "integer"}]
+        foreign_keys = []
+        for other in rng.sample(DOMAINS, 2):
+            if other != domain:
+                columns.append({"column": f"{other}_id", "type": "integer"})
+                target = next(n for n in names if n[2] == other)
+                foreign_keys.append({"columns": [f"{other}_id"], "references": f"{target[0]}.{target[1]}",
+                                     "referenced_columns": ["id"]})
+        for name in rng.sample(COLUMN_NAMES, rng.randint(5, 12)):
+            columns.append({"column": name, "type": rng.choice(COLUMN_TYPES)})
+        overview.setdefault(schema, {})[table] = {
+            "columns": columns,
+            "primary_key": ["id"],
+            "foreign_keys": foreign_keys,
+            "indexes": [f"CREATE INDEX {table}_created_at_idx ON {schema}.{table} USING btree (created_at)"],
+        }
+    return overview
+
+
+QUESTIONS = [
+    "top 5 customers by total payment amount",
+    "how many orders were shipped late last month",
+    "average refund amount per product category",
+    "list suppliers with inventory below 10 units",
+    "which employees handled the most tickets in 2024",
+    "monthly subscription revenue by region",
+]
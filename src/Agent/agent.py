@@ -1,12 +1,13 @@
 
-from langgraph.graph import MessagesState
+from src.Agent.history import ConversationState, HistoryManager
 
 
 
 
 
 class SQLAgent:
-    def __init__(self): 
+    def __init__(self, history_manager: HistoryManager = None): 
+        self.history_manager = history_manager or HistoryManager()
         self.assistant_system_message = """
         You are an expert SQL agent designed to assist users with database-related queries.
         Your primary functions include:
@@ -35,7 +36,10 @@ class SQLAgent:
         """
 
     def get_agent(self, llm_with_tools):
-        def assistant(state: MessagesState):
-            return {"messages": [llm_with_tools.invoke([self.assistant_system_message] + state["messages"])]}
+        def assistant(state: ConversationState):
+            # Bounded prompt: recent turns verbatim, older ones as a rolling summary
+            prompt, update = self.history_manager.prepare(self.assistant_system_message, state)
+            response = llm_with_tools.invoke(prompt)
+            return {**update, "messages": update.get("messages", []) + [response]}
         
         return assistant
\ No newline at end of file
@@ -0,0 +1,127 @@
+import json
+import os
+from typing import List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+from langgraph.graph import MessagesState
+
+from src.Tools_Functions.token_counter import count_tokens
+
+
+HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", "4"))
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "6000"))
+HISTORY_SUMMARY_TOKENS = int(os.getenv("HISTORY_SUMMARY_TOKENS", "800"))
+HISTORY_STUB_CHARS = int(os.getenv("HISTORY_STUB_CHARS", "300"))
+_SUMMARY_FIELD_CHARS = 160
+
+
+class ConversationState(MessagesState):
+    # Rolling summary of the turns that were dropped from the message window
+    summary: Optional[str]
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def split_turns(messages: List[AnyMessage]) -> List[List[AnyMessage]]:
+    """Group messages into turns, each starting at a human message"""
+    turns = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def message_tokens(message: AnyMessage) -> int:
+    tokens = count_tokens(str(message.content))
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += count_tokens(json.dumps(tool_call.get("args", {}), default=str))
+    return tokens
+
+
+def stub_tool_output(message: ToolMessage, limit: int = HISTORY_STUB_CHARS) -> ToolMessage:
+    """Keep the head of an old tool result; the tool_call_id pairing must survive"""
+    content = str(message.content)
+    if len(content) <= limit:
+        return message
+    stub = f"{content[:limit]}\n[... {len(content) - limit} characters of earlier tool output omitted]"
+    return message.model_copy(update={"content": stub})
+
+
+def summarize_turn(turn: List[AnyMessage]) -> str:
+    """One extractive line per turn: the question, the SQL it ran and the answer"""
+    question, sql, answer = "", "", ""
+    for message in turn:
+        if isinstance(message, HumanMessage):
+            question = str(message.content)
+        elif isinstance(message, AIMessage):
+            for tool_call in message.tool_calls or []:
+                args = tool_call.get("args", {})
+                if tool_call.get("name") == "execute_sql_query" and args.get("query"):
+                    sql = args["query"]
+            if message.content and not message.tool_calls:
+                answer = str(message.content)
+    parts = [f"Q: {_clip(question, _SUMMARY_FIELD_CHARS)}"]
+    if sql:
+        parts.append(f"SQL: {_clip(sql, _SUMMARY_FIELD_CHARS)}")
+    if answer:
+        parts.append(f"A: {_clip(answer, _SUMMARY_FIELD_CHARS)}")
+    return "- " + " | ".join(parts)
+
+
+class HistoryManager:
+    """
+    Keeps the prompt sent to the agent at a constant size.
+
+    The last ``keep_turns`` turns stay verbatim (tool outputs of finished turns
+    are cut to stubs). Older turns, and any turn that pushes the window over
+    ``token_budget``, are folded into a rolling extractive summary and removed
+    from the graph state, so checkpoints stop growing with the session too.
+    """
+
+    def __init__(self, keep_turns: int = HISTORY_KEEP_TURNS, token_budget: int = HISTORY_TOKEN_BUDGET,
+                 summary_tokens: int = HISTORY_SUMMARY_TOKENS):
+        self.keep_turns = keep_turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+
+    def _fold(self, summary: Optional[str], turns: List[List[AnyMessage]]) -> str:
+        lines = (summary.splitlines() if summary else []) + [summarize_turn(turn) for turn in turns]
+        # Oldest lines go first once the summary itself is over budget
+        while len(lines) > 1 and count_tokens("\n".join(lines)) > self.summary_tokens:
+            lines.pop(0)
+        return "\n".join(lines)
+
+    def compact(self, messages: List[AnyMessage], summary: Optional[str] = None
+                ) -> Tuple[List[AnyMessage], List[AnyMessage], Optional[str]]:
+        """Return (window to send, messages to remove from state, updated summary)"""
+        turns = split_turns(messages)
+        # The current turn, possibly mid tool loop, is never stubbed or dropped
+        window = [
+            [stub_tool_output(m) if isinstance(m, ToolMessage) else m for m in turn] for turn in turns[:-1]
+        ] + turns[-1:]
+        dropped = max(0, len(window) - self.keep_turns)
+
+        tokens = [sum(message_tokens(m) for m in turn) for turn in window]
+        while dropped < len(window) - 1 and sum(tokens[dropped:]) > self.token_budget:
+            dropped += 1
+
+        if dropped == 0:
+            return [m for turn in window for m in turn], [], summary
+
+        removed = [m for turn in turns[:dropped] for m in turn]
+        return [m for turn in window[dropped:] for m in turn], removed, self._fold(summary, turns[:dropped])
+
+    def prepare(self, system_message: str, state: ConversationState):
+        """Prompt messages for the LLM plus the state update that persists the compaction"""
+        window, removed, summary = self.compact(state["messages"], state.get("summary"))
+        prompt = [SystemMessage(content=system_message)]
+        if summary:
+            prompt.append(SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+        update = {}
+        if removed:
+            update = {"summary": summary, "messages": [RemoveMessage(id=m.id) for m in removed if m.id]}
+        return prompt + window, update
@@ -0,0 +1,122 @@
+import re
+from typing import Optional
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.Agent.history import ConversationState
+from src.Tools_Functions.fetch_db import table_columns
+from src.Tools_Functions.sql_analysis import is_read_query
+from src.Tools_Functions.sql_cache import looks_like_sql
+
+
+# Follow-ups like "and for last year?" depend on earlier turns the fixed
+# pipeline does not see, so they go to the agent. Only a question that opens
+# with a reference, or points back ("same", "again") without naming anything
+# in the schema, counts as one.
+_LEADING_REFERENCE = re.compile(
+    r"^\W*(it|its|that|those|these|this|them|they|and|what about|how about)\b", re.IGNORECASE
+)
+_BACK_REFERENCE = re.compile(r"\b(same|previous|above|again)\b", re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9_]+")
+_CODE_FENCE = re.compile(r"^```(?:sql)?\s*|\s*```$", re.IGNORECASE)
+
+
+def _names_schema_object(question: str, db_schema) -> bool:
+    """Whether a word of the question is a table or column name (plural or singular)"""
+    if not isinstance(db_schema, dict):
+        return False
+    names = set()
+    for tables in db_schema.values():
+        for table, details in tables.items():
+            names.add(table.lower())
+            names.update(column["column"].lower() for column in table_columns(details))
+    return any(
+        word in names or f"{word}s" in names or word.rstrip("s") in names
+        for word in _WORD.findall(question.lower())
+    )
+
+
+def refers_to_history(question: str, db_schema) -> bool:
+    """True for follow-ups that cannot be answered without the earlier turns"""
+    if _LEADING_REFERENCE.match(question):
+        return True
+    return bool(_BACK_REFERENCE.search(question)) and not _names_schema_object(question, db_schema)
+
+
+class PipelineState(ConversationState):
+    question: Optional[str]
+    sql: Optional[str]
+    result: Optional[str]
+    error: Optional[str]
+
+
+class SQLPipeline:
+    """
+    Fixed generate -> validate -> execute -> summarize nodes for plain questions.
+
+    Each stage makes at most one LLM call. Any stage that cannot handle the
+    request sets ``error`` and the graph hands the conversation to the agent.
+    Nodes read the session from the run config, so one instance serves all sessions.
+    """
+
+    @staticmethod
+    def _latest_question(state: PipelineState) -> str:
+        for message in reversed(state["messages"]):
+            if isinstance(message, HumanMessage):
+                return str(message.content)
+        return ""
+
+    async def generate(self, state: PipelineState, config: RunnableConfig):
+        from src.Tools.Tools import aget_session_schema, agenerate_cached_sql, ais_database_connected, session_from_config
+
+        session_id = session_from_config(config)
+        question = self._latest_question(state)
+        reset = {"question": question, "sql": None, "result": None, "error": None}
+        if not await ais_database_connected(session_id):
+            return {**reset, "error": "database not connected"}
+
+        try:
+            db_schema, fingerprint = await aget_session_schema(session_id)
+            if len(state["messages"]) > 1 and refers_to_history(question, db_schema):
+                return {**reset, "error": "question refers to earlier conversation"}
+            sql = await agenerate_cached_sql(question, db_schema, fingerprint)
+            return {**reset, "sql": _CODE_FENCE.sub("", sql.strip()).strip()}
+        except Exception as e:
+            return {**reset, "error": f"generation failed: {e}"}
+
+    def validate(self, state: PipelineState):
+        sql = state.get("sql") or ""
+        if not looks_like_sql(sql):
+            # The model asked for clarification or answered in prose
+            return {"error": "generated text is not SQL"}
+        if not is_read_query(sql):
+            # Writes need the agent's confirmation rules (all fields, primary keys)
+            return {"error": "write statements are handled by the agent"}
+        return {"error": None}
+
+    async def execute(self, state: PipelineState, config: RunnableConfig):
+        from src.Tools.Tools import get_async_session_tools, session_from_config
+
+        try:
+            _, _, execute_sql_instance = await get_async_session_tools(session_from_config(config))
+            result = await execute_sql_instance.execute_query(state["sql"])
+            return {"result": str(result)}
+        except Exception as e:
+            return {"error": f"execution failed: {e}"}
+
+    async def summarize(self, state: PipelineState):
+        from src.Tools.Tools import get_summary_generator
+
+        try:
+            summary = await get_summary_generator().agenerate_summary(state["question"], state["result"])
+            return {"messages": [AIMessage(content=summary)]}
+        except Exception as e:
+            return {"error": f"summary failed: {e}"}
+
+    @staticmethod
+    def route(next_node: str):
+        """Conditional edge: continue the pipeline, or fall back to the agent on error"""
+        def router(state: PipelineState):
+            return "assistant" if state.get("error") else next_node
+        return router
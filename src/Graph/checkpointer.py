@@ -0,0 +1,345 @@
+import asyncio
+import os
+import random
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from redis.exceptions import WatchError
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from src.redis_client import redis_client
+from src.redis_keys import app_key
+
+
+# Aligned with the 86400s expiry of the session hash
+CHECKPOINT_TTL = int(os.getenv("CHECKPOINT_TTL", "86400"))
+CHECKPOINT_MAX_PER_THREAD = int(os.getenv("CHECKPOINT_MAX_PER_THREAD", "20"))
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer persisted in Redis, shared by every worker.
+
+    Per thread and namespace, checkpoint ids (time-ordered uuid6) are kept in a
+    lexicographically sorted set; each checkpoint and its pending writes are
+    stored as zlib-compressed serde payloads. Channel values are stored once
+    per channel version in a blobs hash, so a checkpoint only carries the
+    versions it points at and unchanged history is not copied into every
+    checkpoint. Only the newest ``max_checkpoints`` are kept and every key
+    expires with the session.
+    """
+
+    def __init__(self, redis_client, ttl: int = CHECKPOINT_TTL, max_checkpoints: int = CHECKPOINT_MAX_PER_THREAD,
+                 prefix: str = app_key("checkpoint"), serde=None):
+        super().__init__(serde=serde)
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.max_checkpoints = max_checkpoints
+        self.prefix = prefix
+
+    @property
+    def client(self):
+        if self.redis_client.raw_client is None:
+            self.redis_client.reconnect()
+        if self.redis_client.raw_client is None:
+            raise ConnectionError("Redis is not available for checkpoints")
+        return self.redis_client.raw_client
+
+    def _index_key(self, thread_id: str, checkpoint_ns: str) -> str:
+        return f"{self.prefix}:{thread_id}:{checkpoint_ns}:index"
+
+    def _checkpoint_key(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> str:
+        return f"{self.prefix}:{thread_id}:{checkpoint_ns}:{checkpoint_id}"
+
+    def _writes_key(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> str:
+        return f"{self.prefix}:{thread_id}:{checkpoint_ns}:{checkpoint_id}:writes"
+
+    def _blobs_key(self, thread_id: str, checkpoint_ns: str) -> str:
+        return f"{self.prefix}:{thread_id}:{checkpoint_ns}:blobs"
+
+    @staticmethod
+    def _blob_field(channel: str, version) -> str:
+        return f"{channel}:{version}"
+
+    def _namespaces_key(self, thread_id: str) -> str:
+        return f"{self.prefix}:{thread_id}:namespaces"
+
+    def _dump(self, value: Any) -> bytes:
+        type_, data = self.serde.dumps_typed(value)
+        return type_.encode("utf-8") + b"|" + zlib.compress(data)
+
+    def _load(self, blob: bytes) -> Any:
+        type_, data = blob.split(b"|", 1)
+        return self.serde.loads_typed((type_.decode("utf-8"), zlib.decompress(data)))
+
+    @staticmethod
+    def _text(value) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def _latest_id(self, thread_id: str, checkpoint_ns: str) -> Optional[str]:
+        ids = self.client.zrevrangebylex(self._index_key(thread_id, checkpoint_ns), "+", "-", start=0, num=1)
+        return self._text(ids[0]) if ids else None
+
+    def _load_tuple(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> Optional[CheckpointTuple]:
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._checkpoint_key(thread_id, checkpoint_ns, checkpoint_id))
+            pipe.hgetall(self._writes_key(thread_id, checkpoint_ns, checkpoint_id))
+            stored, writes = pipe.execute()
+        if not stored:
+            return None
+
+        checkpoint = self._load(stored[b"checkpoint"])
+        versions = list(checkpoint["channel_versions"].items())
+        if versions:
+            blobs = self.client.hmget(
+                self._blobs_key(thread_id, checkpoint_ns),
+                [self._blob_field(channel, version) for channel, version in versions],
+            )
+            # Checkpoints written before blobs were split out still carry their values inline
+            channel_values = dict(checkpoint.get("channel_values") or {})
+            channel_values.update({
+                channel: self._load(blob) for (channel, _), blob in zip(versions, blobs) if blob is not None
+            })
+            checkpoint = {**checkpoint, "channel_values": channel_values}
+
+        parent_id = self._text(stored.get(b"parent") or b"")
+        pending_writes = [
+            self._load(blob) for _, blob in sorted(writes.items(), key=lambda item: self._write_order(item[0]))
+        ]
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id,
+            }},
+            checkpoint=checkpoint,
+            metadata=self._load(stored[b"metadata"]),
+            parent_config={"configurable": {
+                "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id,
+            }} if parent_id else None,
+            pending_writes=pending_writes,
+        )
+
+    @staticmethod
+    def _write_order(field: bytes) -> Tuple[str, int]:
+        task_id, idx = field.decode("utf-8").rsplit(":", 1)
+        return task_id, int(idx)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Requested checkpoint of a thread, or its latest one"""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config) or self._latest_id(thread_id, checkpoint_ns)
+        if not checkpoint_id:
+            return None
+        return self._load_tuple(thread_id, checkpoint_ns, checkpoint_id)
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        """Checkpoints newest first, optionally filtered by metadata"""
+        if config:
+            thread_id = config["configurable"]["thread_id"]
+            namespaces = (
+                [config["configurable"]["checkpoint_ns"]] if "checkpoint_ns" in config["configurable"]
+                else [self._text(ns) for ns in self.client.smembers(self._namespaces_key(thread_id))]
+            )
+            indexes = [(thread_id, ns) for ns in namespaces]
+        else:
+            indexes = []
+            for key in self.client.scan_iter(match=f"{self.prefix}:*:index", count=1000):
+                # Namespaces of subgraphs contain ":" themselves, so strip prefix and suffix
+                thread_id, checkpoint_ns = self._text(key)[len(self.prefix) + 1:-len(":index")].split(":", 1)
+                indexes.append((thread_id, checkpoint_ns))
+
+        before_id = get_checkpoint_id(before) if before else None
+        returned = 0
+        for thread_id, checkpoint_ns in indexes:
+            max_id = f"({before_id}" if before_id else "+"
+            for checkpoint_id in self.client.zrevrangebylex(self._index_key(thread_id, checkpoint_ns), max_id, "-"):
+                checkpoint_tuple = self._load_tuple(thread_id, checkpoint_ns, self._text(checkpoint_id))
+                if checkpoint_tuple is None:
+                    continue
+                if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                    continue
+                yield checkpoint_tuple
+                returned += 1
+                if limit is not None and returned >= limit:
+                    return
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        """Store a checkpoint, refresh the thread's TTL and prune old checkpoints"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = checkpoint["id"]
+        index_key = self._index_key(thread_id, checkpoint_ns)
+        checkpoint_key = self._checkpoint_key(thread_id, checkpoint_ns, checkpoint_id)
+        blobs_key = self._blobs_key(thread_id, checkpoint_ns)
+        # Only channels updated by this step get a new blob; the rest point at earlier versions
+        channel_values = checkpoint.get("channel_values") or {}
+        blobs = {
+            self._blob_field(channel, version): self._dump(channel_values[channel])
+            for channel, version in new_versions.items() if channel in channel_values
+        }
+
+        with self.client.pipeline(transaction=True) as pipe:
+            if blobs:
+                pipe.hset(blobs_key, mapping=blobs)
+            pipe.hset(checkpoint_key, mapping={
+                "checkpoint": self._dump({**checkpoint, "channel_values": {}}),
+                "metadata": self._dump(get_checkpoint_metadata(config, metadata)),
+                "parent": config["configurable"].get("checkpoint_id") or "",
+            })
+            pipe.zadd(index_key, {checkpoint_id: 0})
+            pipe.sadd(self._namespaces_key(thread_id), checkpoint_ns)
+            for key in (checkpoint_key, index_key, blobs_key, self._namespaces_key(thread_id)):
+                pipe.expire(key, self.ttl)
+            pipe.zcard(index_key)
+            count = pipe.execute()[-1]
+
+        if count > self.max_checkpoints:
+            self._prune(thread_id, checkpoint_ns, count - self.max_checkpoints)
+
+        return {"configurable": {
+            "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id,
+        }}
+
+    def _prune(self, thread_id: str, checkpoint_ns: str, excess: int):
+        index_key = self._index_key(thread_id, checkpoint_ns)
+        # Equal scores: rank order is lexicographic, i.e. oldest uuid6 first
+        stale = [self._text(i) for i in self.client.zrange(index_key, 0, excess - 1)]
+        if not stale:
+            return
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.zrem(index_key, *stale)
+            pipe.delete(*(
+                key for checkpoint_id in stale for key in (
+                    self._checkpoint_key(thread_id, checkpoint_ns, checkpoint_id),
+                    self._writes_key(thread_id, checkpoint_ns, checkpoint_id),
+                )
+            ))
+            pipe.execute()
+        self._prune_blobs(thread_id, checkpoint_ns)
+
+    def _prune_blobs(self, thread_id: str, checkpoint_ns: str, attempts: int = 3):
+        """Drop channel blobs that no remaining checkpoint points at"""
+        index_key = self._index_key(thread_id, checkpoint_ns)
+        blobs_key = self._blobs_key(thread_id, checkpoint_ns)
+        with self.client.pipeline(transaction=True) as pipe:
+            for _ in range(attempts):
+                try:
+                    # A concurrent put on the thread touches both keys and aborts the delete,
+                    # so blobs written between the read and the HDEL are never dropped
+                    pipe.watch(index_key, blobs_key)
+                    kept = pipe.zrange(index_key, 0, -1)
+                    referenced = set()
+                    for checkpoint_id in kept:
+                        blob = pipe.hget(self._checkpoint_key(thread_id, checkpoint_ns, self._text(checkpoint_id)),
+                                         "checkpoint")
+                        if blob is not None:
+                            referenced.update(
+                                self._blob_field(channel, version)
+                                for channel, version in self._load(blob)["channel_versions"].items()
+                            )
+                    unreferenced = [field for field in map(self._text, pipe.hkeys(blobs_key)) if field not in referenced]
+                    if not unreferenced:
+                        pipe.unwatch()
+                        return
+                    pipe.multi()
+                    pipe.hdel(blobs_key, *unreferenced)
+                    pipe.execute()
+                    return
+                except WatchError:
+                    # Left for the next prune of this thread
+                    continue
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        """Store intermediate writes linked to a checkpoint"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        writes_key = self._writes_key(thread_id, checkpoint_ns, checkpoint_id)
+        # Special channels (errors, interrupts) overwrite; regular writes are first-wins
+        overwrite = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+
+        with self.client.pipeline(transaction=True) as pipe:
+            for idx, (channel, value) in enumerate(writes):
+                field = f"{task_id}:{WRITES_IDX_MAP.get(channel, idx)}"
+                blob = self._dump((task_id, channel, value))
+                if overwrite:
+                    pipe.hset(writes_key, field, blob)
+                else:
+                    pipe.hsetnx(writes_key, field, blob)
+            pipe.expire(writes_key, self.ttl)
+            pipe.execute()
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint and write of a thread"""
+        namespaces_key = self._namespaces_key(thread_id)
+        keys = [namespaces_key]
+        for checkpoint_ns in self.client.smembers(namespaces_key):
+            checkpoint_ns = self._text(checkpoint_ns)
+            index_key = self._index_key(thread_id, checkpoint_ns)
+            keys.extend((index_key, self._blobs_key(thread_id, checkpoint_ns)))
+            for checkpoint_id in self.client.zrange(index_key, 0, -1):
+                checkpoint_id = self._text(checkpoint_id)
+                keys.append(self._checkpoint_key(thread_id, checkpoint_ns, checkpoint_id))
+                keys.append(self._writes_key(thread_id, checkpoint_ns, checkpoint_id))
+        self.client.delete(*keys)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None):
+        checkpoint_tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        """Monotonic, string-sortable channel versions (same scheme as MemorySaver)"""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+
+# The one checkpointer of the process, built on first use: the graphs run on it
+# and session cleanup deletes from it
+@lru_cache(maxsize=1)
+def get_checkpointer() -> BaseCheckpointSaver:
+    """Redis-backed checkpoints so every worker sees the same conversations; memory for local runs"""
+    if os.getenv("CHECKPOINT_BACKEND", "redis").lower() == "memory":
+        return MemorySaver()
+    if not redis_client.is_connected():
+        print("Warning: Redis not connected, conversation checkpoints fall back to process memory")
+        return MemorySaver()
+    return RedisCheckpointSaver(redis_client)
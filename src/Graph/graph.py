@@ -1,21 +1,22 @@
-from langgraph.graph import START, StateGraph
+from langgraph.graph import START, END, StateGraph
 from langgraph.prebuilt import tools_condition
 from langgraph.prebuilt import ToolNode
-from IPython.display import Image, display
 from langgraph.checkpoint.memory import MemorySaver
-from langgraph.graph import MessagesState
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from src.Agent.history import ConversationState
 from src.LLM.llm_with_tools import llm_with_tools
 from src.Agent.agent import SQLAgent 
+from src.Agent.pipeline import PipelineState, SQLPipeline
+from src.Graph.checkpointer import get_checkpointer
 
 
 class Graph_builder: 
-    def __init__(self, session_id: str = "default"):
-        self.session_id = session_id
-        self.graph = StateGraph(MessagesState)
-        self.llm_with_tools_instance = llm_with_tools(session_id)
+    def __init__(self, memory_saver: BaseCheckpointSaver = None):
+        self.graph = StateGraph(ConversationState)
+        self.llm_with_tools_instance = llm_with_tools()
         self.llm_tools = self.llm_with_tools_instance.llm_with_tools()
         self.assistant = SQLAgent().get_agent(self.llm_tools)
-        self.memory_saver = MemorySaver()
+        self.memory_saver = memory_saver or MemorySaver()
 
 
     def build_graph(self):
@@ -43,15 +44,54 @@ class Graph_builder:
         return self.build_graph()
 
 
-# Session-based graph management
-session_graphs = {}
+class Pipeline_builder(Graph_builder):
+    """
+    Fast-path graph: generate -> validate -> execute -> summarize as fixed nodes,
+    with the agent loop attached as a fallback for errors and ambiguous questions.
+    """
 
-def get_session_graph(session_id: str):
-    """Get or create a graph for a specific session"""
-    if session_id not in session_graphs:
-        session_graphs[session_id] = Graph_builder(session_id).get_compiled_graph()
-    return session_graphs[session_id]
+    def __init__(self, memory_saver: BaseCheckpointSaver = None):
+        super().__init__(memory_saver)
+        self.graph = StateGraph(PipelineState)
+        self.pipeline = SQLPipeline()
 
-# Default graph for backward compatibility
-# graph = Graph_builder().get_compiled_graph()
 
+    def build_graph(self):
+        tools = self.llm_with_tools_instance.get_tools()
+
+        self.graph.add_node("generate", self.pipeline.generate)
+        self.graph.add_node("validate", self.pipeline.validate)
+        self.graph.add_node("execute", self.pipeline.execute)
+        self.graph.add_node("summarize", self.pipeline.summarize)
+        self.graph.add_node("assistant", self.assistant)
+        self.graph.add_node("tools", ToolNode(tools))
+
+        self.graph.add_edge(START, "generate")
+        self.graph.add_conditional_edges("generate", SQLPipeline.route("validate"), ["validate", "assistant"])
+        self.graph.add_conditional_edges("validate", SQLPipeline.route("execute"), ["execute", "assistant"])
+        self.graph.add_conditional_edges("execute", SQLPipeline.route("summarize"), ["summarize", "assistant"])
+        self.graph.add_conditional_edges("summarize", SQLPipeline.route(END), [END, "assistant"])
+
+        # Fallback: the regular tool-calling agent loop
+        self.graph.add_conditional_edges("assistant", tools_condition)
+        self.graph.add_edge("tools", "assistant")
+
+        return self.graph.compile(checkpointer=self.memory_saver)
+
+
+GRAPH_MODES = {
+    "agent": Graph_builder,
+    "pipeline": Pipeline_builder,
+}
+
+
+# One compiled graph per mode for the whole process. Sessions are told apart by the
+# run config's thread_id, which the checkpointer and the tools both key on.
+compiled_graphs = {}
+
+def get_graph(mode: str = "agent"):
+    """Get or build the shared compiled graph for an execution mode"""
+    if mode not in compiled_graphs:
+        # Both modes share one checkpointer so switching keeps the conversation
+        compiled_graphs[mode] = GRAPH_MODES[mode](get_checkpointer()).get_compiled_graph()
+    return compiled_graphs[mode]
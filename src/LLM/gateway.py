@@ -0,0 +1,438 @@
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+import httpx
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.Tools_Functions.token_counter import count_tokens
+
+
+LLM_MODEL = os.getenv("LLM_MODEL", "openai/gpt-oss-120b")
+# Provider quotas for the whole deployment (the API key's limits); 0 disables that
+# limit and is the default. One agent question makes ~4 calls of up to ~7k tokens
+# each, so a TPM limit much below 30000 queues questions for minutes.
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "0"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "0"))
+# Requests that may go out back to back after a quiet spell; 0 means a full minute's worth
+LLM_RPM_BURST = int(os.getenv("LLM_RPM_BURST", "0"))
+# Each worker process keeps its own buckets, so each gets an equal share of the
+# quotas above. Defaults to WEB_CONCURRENCY, which uvicorn and gunicorn use as
+# their worker count; set it explicitly when workers are configured otherwise.
+LLM_WORKERS = max(1, int(os.getenv("LLM_WORKERS", os.getenv("WEB_CONCURRENCY", "1"))))
+# Retries of a call the provider answered with 429, after waiting out Retry-After
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+# Back-off when a 429 carries no usable Retry-After header
+LLM_RETRY_AFTER = float(os.getenv("LLM_RETRY_AFTER", "5"))
+# Completion tokens reserved per call until the response reports real usage
+LLM_COMPLETION_TOKENS = int(os.getenv("LLM_COMPLETION_TOKENS", "512"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+
+
+class Priority(IntEnum):
+    """Lower values are served first when the rate limit is the bottleneck"""
+    SQL = 0
+    AGENT = 1
+    SUMMARY = 2
+
+
+def worker_share(limit: int, workers: int = LLM_WORKERS) -> int:
+    """This process's part of a deployment-wide limit (0 stays unlimited)"""
+    return max(1, limit // workers) if limit else 0
+
+
+def rate_limit_retry_after(error: BaseException) -> Optional[float]:
+    """Seconds to back off if ``error`` is a provider 429, else None"""
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        # Missing, or an HTTP date
+        return LLM_RETRY_AFTER
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "tokens", "wake")
+
+    def __init__(self, priority: int, seq: int, tokens: int, wake: Callable[[], None]):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.wake = wake
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RateLimiter:
+    """
+    Token buckets for requests/min and tokens/min in front of one priority queue.
+
+    Only the head of the queue (lowest priority value, then arrival order) may
+    take capacity, so a summary never overtakes a waiting SQL generation and
+    callers queue here instead of drawing 429s from the provider. Sync callers
+    block their thread; async callers await without holding the event loop.
+    Token costs are estimates at admission and corrected by ``settle``; a 429
+    from the provider empties the buckets and holds everyone for Retry-After
+    (``penalize``). The defaults are this worker's share of the provider quotas.
+    """
+
+    def __init__(self, rpm: int = worker_share(LLM_RPM_LIMIT), tpm: int = worker_share(LLM_TPM_LIMIT),
+                 burst: int = worker_share(LLM_RPM_BURST)):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.burst = burst or rpm
+        self._requests = float(self.burst)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._rate_limited = 0
+        self._lock = threading.Lock()
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._metrics = {
+            priority.name: {"granted": 0, "total_wait": 0.0, "max_wait": 0.0} for priority in Priority
+        }
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.burst, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _try_grant(self, waiter: _Waiter) -> Optional[float]:
+        """Under the lock: 0.0 once granted, else seconds until capacity (None: not at the head)"""
+        if self._queue[0] is not waiter:
+            return None
+        blocked = self._blocked_until - time.monotonic()
+        if blocked > 0:
+            return blocked
+        self._refill()
+        # A call larger than the whole bucket only has to wait for a full one
+        tokens = min(waiter.tokens, self.tpm) if self.tpm else 0
+        delay = 0.0
+        if self.rpm and self._requests < 1:
+            delay = max(delay, (1 - self._requests) * 60 / self.rpm)
+        if self.tpm and self._tokens < tokens:
+            delay = max(delay, (tokens - self._tokens) * 60 / self.tpm)
+        if delay:
+            return delay
+        if self.rpm:
+            self._requests -= 1
+        if self.tpm:
+            self._tokens -= tokens
+        self._leave(waiter)
+        return 0.0
+
+    def _leave(self, waiter: _Waiter):
+        """Under the lock: drop a waiter and let the new head try"""
+        was_head = self._queue and self._queue[0] is waiter
+        self._queue.remove(waiter)
+        heapq.heapify(self._queue)
+        if was_head and self._queue:
+            self._queue[0].wake()
+
+    def _enqueue(self, priority: int, tokens: int, wake: Callable[[], None]) -> _Waiter:
+        waiter = _Waiter(int(priority), next(self._seq), tokens, wake)
+        with self._lock:
+            heapq.heappush(self._queue, waiter)
+        return waiter
+
+    def _record(self, priority: int, waited: float):
+        with self._lock:
+            metrics = self._metrics[Priority(priority).name]
+            metrics["granted"] += 1
+            metrics["total_wait"] += waited
+            metrics["max_wait"] = max(metrics["max_wait"], waited)
+
+    def acquire(self, priority: int, tokens: int):
+        """Block until the call may go out"""
+        event = threading.Event()
+        waiter = self._enqueue(priority, tokens, event.set)
+        start = time.monotonic()
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_grant(waiter)
+                if delay == 0.0:
+                    break
+                event.wait(delay)
+                event.clear()
+        except BaseException:
+            with self._lock:
+                if waiter in self._queue:
+                    self._leave(waiter)
+            raise
+        self._record(priority, time.monotonic() - start)
+
+    async def aacquire(self, priority: int, tokens: int):
+        """Async variant of acquire"""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = self._enqueue(priority, tokens, lambda: loop.call_soon_threadsafe(event.set))
+        start = time.monotonic()
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_grant(waiter)
+                if delay == 0.0:
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+        except BaseException:
+            with self._lock:
+                if waiter in self._queue:
+                    self._leave(waiter)
+            raise
+        self._record(priority, time.monotonic() - start)
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once the provider reports real usage"""
+        if not self.tpm or not actual:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.tpm, self._tokens + estimated - actual)
+
+    def penalize(self, retry_after: float):
+        """The provider answered 429: empty both buckets and hold every caller for retry_after seconds"""
+        with self._lock:
+            self._refill()
+            self._requests = min(self._requests, 0.0)
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            self._rate_limited += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill()
+            queued = {priority.name: 0 for priority in Priority}
+            for waiter in self._queue:
+                queued[Priority(waiter.priority).name] += 1
+            return {
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "requests_available": round(self._requests, 2) if self.rpm else None,
+                "tokens_available": round(self._tokens) if self.tpm else None,
+                "provider_429s": self._rate_limited,
+                "blocked_for_s": round(max(0.0, self._blocked_until - time.monotonic()), 2),
+                "queued": queued,
+                "waits": {
+                    name: {
+                        "granted": metrics["granted"],
+                        "avg_wait_ms": metrics["total_wait"] / metrics["granted"] * 1000 if metrics["granted"] else 0.0,
+                        "max_wait_ms": metrics["max_wait"] * 1000,
+                    }
+                    for name, metrics in self._metrics.items()
+                },
+            }
+
+
+def estimate_tokens(messages: List[BaseMessage], **kwargs) -> int:
+    """Prompt tokens (messages plus bound tool schemas) and the completion reserve"""
+    tokens = LLM_COMPLETION_TOKENS
+    for message in messages:
+        tokens += count_tokens(str(message.content))
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            tokens += count_tokens(json.dumps(tool_call.get("args", {}), default=str))
+    if kwargs.get("tools"):
+        tokens += count_tokens(json.dumps(kwargs["tools"], default=str))
+    return tokens
+
+
+def _used_tokens(message: BaseMessage) -> int:
+    # Streaming providers report usage on a chunk (usually the last); chunks add up
+    return (getattr(message, "usage_metadata", None) or {}).get("total_tokens", 0)
+
+
+def _child_config(run_manager) -> Dict[str, Any]:
+    """Nest the wrapped model's run under this one in callbacks and traces"""
+    return {"callbacks": run_manager.get_child()} if run_manager else {}
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """
+    Chat model handed out by the gateway: waits for the rate limiter at its
+    priority, then calls the gateway's shared model through its public
+    invoke/stream API. Works in LCEL chains, with bind_tools and with
+    streaming like the model it wraps.
+    """
+
+    gateway: Any
+    priority: int = Priority.AGENT
+
+    @property
+    def _llm_type(self) -> str:
+        return f"rate-limited-{self.gateway.model._llm_type}"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"priority": Priority(self.priority).name, **self.gateway.model._identifying_params}
+
+    def bind_tools(self, tools, **kwargs):
+        model = self.gateway.model
+        try:
+            # The provider's own tool formatting, applied to this wrapper instead
+            return self.bind(**model.bind_tools(tools, **kwargs).kwargs)
+        except NotImplementedError:
+            # Fake chat models have no bind_tools
+            return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _backoff(self, error: BaseException, attempt: int) -> bool:
+        """Feed a provider 429 back into the limiter; True if the call should be retried"""
+        retry_after = rate_limit_retry_after(error)
+        if retry_after is None:
+            return False
+        self.gateway.limiter.penalize(retry_after)
+        return attempt < LLM_MAX_RETRIES
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        estimated = estimate_tokens(messages, **kwargs)
+        for attempt in itertools.count():
+            self.gateway.limiter.acquire(self.priority, estimated)
+            try:
+                message = self.gateway.model.invoke(messages, _child_config(run_manager), stop=stop, **kwargs)
+            except Exception as e:
+                if not self._backoff(e, attempt):
+                    raise
+                continue
+            self.gateway.limiter.settle(estimated, _used_tokens(message))
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        estimated = estimate_tokens(messages, **kwargs)
+        for attempt in itertools.count():
+            await self.gateway.limiter.aacquire(self.priority, estimated)
+            try:
+                message = await self.gateway.model.ainvoke(messages, _child_config(run_manager), stop=stop, **kwargs)
+            except Exception as e:
+                if not self._backoff(e, attempt):
+                    raise
+                continue
+            self.gateway.limiter.settle(estimated, _used_tokens(message))
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        estimated = estimate_tokens(messages, **kwargs)
+        for attempt in itertools.count():
+            self.gateway.limiter.acquire(self.priority, estimated)
+            used, started = 0, False
+            try:
+                for chunk in self.gateway.model.stream(messages, _child_config(run_manager), stop=stop, **kwargs):
+                    started = True
+                    used += _used_tokens(chunk)
+                    yield ChatGenerationChunk(message=chunk)
+                return
+            except Exception as e:
+                # Once chunks went out the call cannot be replayed
+                if started or not self._backoff(e, attempt):
+                    raise
+            finally:
+                self.gateway.limiter.settle(estimated, used)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        estimated = estimate_tokens(messages, **kwargs)
+        for attempt in itertools.count():
+            await self.gateway.limiter.aacquire(self.priority, estimated)
+            used, started = 0, False
+            try:
+                async for chunk in self.gateway.model.astream(messages, _child_config(run_manager), stop=stop, **kwargs):
+                    started = True
+                    used += _used_tokens(chunk)
+                    yield ChatGenerationChunk(message=chunk)
+                return
+            except Exception as e:
+                if started or not self._backoff(e, attempt):
+                    raise
+            finally:
+                self.gateway.limiter.settle(estimated, used)
+
+
+class LLMGateway:
+    """
+    The one place the process talks to the LLM provider.
+
+    Owns a single chat model on pooled HTTP clients and the rate limiter every
+    call passes through. ``chat_model(priority)`` hands out cheap wrappers for
+    chains and agents. ``model_factory`` builds the underlying model lazily,
+    so a local fake chat model can be swapped in before first use.
+    """
+
+    def __init__(self, model_factory: Optional[Callable[["LLMGateway"], BaseChatModel]] = None,
+                 limiter: Optional[RateLimiter] = None):
+        self.model_factory = model_factory or groq_model
+        self.limiter = limiter or RateLimiter()
+        self.http_client: Optional[httpx.Client] = None
+        self.http_async_client: Optional[httpx.AsyncClient] = None
+        self._model: Optional[BaseChatModel] = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> BaseChatModel:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self.model_factory(self)
+        return self._model
+
+    def set_model_factory(self, model_factory: Callable[["LLMGateway"], BaseChatModel]):
+        """Replace the underlying model, e.g. with a fake chat model in benchmarks"""
+        with self._lock:
+            self.model_factory = model_factory
+            self._model = None
+
+    def http_clients(self):
+        """Keep-alive pools shared by every call, created on first use"""
+        if self.http_client is None:
+            limits = httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS)
+            self.http_client = httpx.Client(limits=limits, timeout=LLM_TIMEOUT)
+            self.http_async_client = httpx.AsyncClient(limits=limits, timeout=LLM_TIMEOUT)
+        return self.http_client, self.http_async_client
+
+    def chat_model(self, priority: Priority = Priority.AGENT) -> RateLimitedChatModel:
+        return RateLimitedChatModel(gateway=self, priority=priority)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.limiter.stats()
+
+    async def aclose(self):
+        if self.http_client is not None:
+            self.http_client.close()
+            await self.http_async_client.aclose()
+            self.http_client = self.http_async_client = None
+
+
+def groq_model(gateway: LLMGateway) -> BaseChatModel:
+    from langchain_groq import ChatGroq
+
+    http_client, http_async_client = gateway.http_clients()
+    return ChatGroq(model=LLM_MODEL, http_client=http_client, http_async_client=http_async_client)
+
+
+llm_gateway = LLMGateway()
@@ -1,17 +1,11 @@
-from langchain_groq import ChatGroq
-import os 
-from dotenv import load_dotenv
+from src.LLM.gateway import Priority, llm_gateway
 
 class GroqLLM:
     
     @staticmethod
-    def get_llm():
+    def get_llm(priority: Priority = Priority.AGENT):
+        """Rate-limited handle on the process-wide Groq model"""
         try:
-            load_dotenv("../../.env")
-            groq_api_key = os.getenv("GROQ_API_KEY")
-            print(groq_api_key)
-            os.environ["GROQ_API_KEY"] = groq_api_key
-            llm = ChatGroq(api_key=groq_api_key, model="openai/gpt-oss-120b")
-            return llm
+            return llm_gateway.chat_model(priority)
         except Exception as e:
-            raise ValueError(f"Error occurred with exception : {e}")
\ No newline at end of file
+            raise ValueError(f"Error occurred with exception : {e}")
@@ -1,21 +1,15 @@
-from langchain_groq import ChatGroq 
-from src.Tools.Tools import fetch_db_schema, generate_sql, execute_sql_query, get_summary, create_session_tools
+from src.LLM.gateway import Priority, llm_gateway
+from src.Tools.Tools import get_summary, session_tools
 from dotenv import load_dotenv
 load_dotenv("../../.env")
 
 
 class llm_with_tools: 
-    def __init__(self, session_id: str = "default"): 
-        self.session_id = session_id
-        self.llm = ChatGroq(model="openai/gpt-oss-120b")
+    def __init__(self): 
+        self.llm = llm_gateway.chat_model(Priority.AGENT)
         
-        # If it's a specific session, use session-specific tools
-        if session_id != "default":
-            session_tools = create_session_tools(session_id)
-            self.tool_box = session_tools + [get_summary]
-        else:
-            # Use default tools for backward compatibility
-            self.tool_box = [fetch_db_schema, generate_sql, execute_sql_query, get_summary]
+        # Session tools resolve their session from the run config's thread_id
+        self.tool_box = session_tools + [get_summary]
 
 
     def llm_with_tools(self): 
@@ -26,4 +20,3 @@ class llm_with_tools:
         return self.tool_box
     
 
-    
\ No newline at end of file
@@ -1,18 +1,28 @@
-from langchain_core.tools import Tool, tool
+from langchain_core.tools import Tool, StructuredTool, tool
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import MessagesState
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+import asyncio
 import os
+from functools import lru_cache
 import time 
 
 
 
 from src.Tools_Functions.nlp_gen import nlp_chain 
-from src.Tools_Functions.fetch_db import fetch_db 
-from src.Tools_Functions.db_connector import DBConnector
-from src.Tools_Functions.execute_sql import execute_sql
+from src.Tools_Functions.fetch_db import fetch_db, async_fetch_db
+from src.Tools_Functions.db_connector import DBConnector, AsyncDBConnector
+from src.Tools_Functions.execute_sql import execute_sql, async_execute_sql
+from src.Tools_Functions.engine_registry import engine_registry
+from src.Tools_Functions.sql_cache import SQLCache, looks_like_sql, schema_fingerprint
+from src.Tools_Functions.semantic_cache import SemanticSQLCache, SEMANTIC_CACHE_ENABLED
+from src.Tools_Functions.sql_analysis import is_read_query
+from src.Tools_Functions.schema_retriever import schema_retriever
+from src.Tools_Functions.schema_format import render_schema
+from src.Tools_Functions.schema_store import schema_store
 from src.Tools_Functions.summary import SummaryGenerator
+from src.Graph.checkpointer import get_checkpointer
 
 
 # Load environment variables - try multiple paths
@@ -27,53 +37,66 @@ for env_path in env_paths:
         load_dotenv(env_path)
         break
 
-#LLM
+# Chains are built on first use so importing the tools stays cheap;
+# database connections are set per session via the /connect_db endpoint
+@lru_cache(maxsize=1)
+def get_nlp_generator() -> nlp_chain:
+    return nlp_chain()
 
-try:
-    llm = ChatGroq(model="openai/gpt-oss-120b")
-except Exception as e:
-    print(f"Warning: Failed to initialize ChatGroq: {e}")
-   
-    llm = None
 
-
-
-# Initialize tools - database connection will be set via /connect_db endpoint
-nlp_generator = nlp_chain()
-summary_generator = SummaryGenerator()
+@lru_cache(maxsize=1)
+def get_summary_generator() -> SummaryGenerator:
+    return SummaryGenerator()
 
 session_connectors = {}
+session_async_connectors = {}
 
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), "../"))
-from src.redis_client import redis_client
+from src.redis_client import redis_client, async_redis_client
+from src.redis_keys import session_id_from_key, session_key, user_sessions_key
+
+sql_cache = SQLCache(redis_client)
+semantic_cache = SemanticSQLCache() if SEMANTIC_CACHE_ENABLED else None
 
 
+SESSION_TTL = 86400
 
 
-def update_db_connector(connection_string: str, session_id: str = "default"):
+def update_db_connector(connection_string: str, session_id: str = "default", user_id: int = None):
     """Update the database connector for a specific session"""
     
     
     try:
+        # Drop connectors cached for a previously connected database
+        session_connectors.pop(session_id, None)
+        session_async_connectors.pop(session_id, None)
+
         session_data = {
             "connection_string": connection_string,
             "created_at": str(int(time.time())),
             "status": "connected"
         }  
+        if user_id is not None:
+            session_data["user_id"] = str(user_id)
         print("-----Storing Session Data in Redis-----")
-        for key, value in session_data.items():
-            redis_client.hset(f"session:{session_id}", key, value)  
-
-        redis_client.expire(f"session:{session_id}", 86400)
+        # A new database is not a schema change, so the SQL cache stays intact
+        with redis_client.pipeline() as pipe:
+            pipe.hdel(session_key(session_id), "schema_version", "schema_fingerprint", "db_schema", "schema_markers")
+            pipe.hset(session_key(session_id), mapping=session_data)
+            pipe.expire(session_key(session_id), SESSION_TTL)
+            if user_id is not None:
+                # Lets a user's sessions be found and removed without scanning the keyspace
+                pipe.sadd(user_sessions_key(user_id), session_key(session_id))
+                pipe.expire(user_sessions_key(user_id), SESSION_TTL)
 
 
         try:
             print("-----Storing DB Schema in Redis-----")
-            connector = DBConnector(connection_string)
+            connector = DBConnector(connection_string, session_id)
             fetch_db_instance = fetch_db(connector)
-            db_schema = fetch_db_instance.get_db_schema()
-            redis_client.hset(f"session:{session_id}", "db_schema", db_schema)
+            snapshot, _ = fetch_db_instance.refresh_schema()
+            store_session_schema(session_id, snapshot)
             
             print(f"Database connector updated successfully for session: {session_id}")
             return True
@@ -91,12 +114,18 @@ def update_db_connector(connection_string: str, session_id: str = "default"):
 def is_database_connected(session_id: str = "default"):
     """Check if a session exists in Redis and is valid"""
     try:
-        if not redis_client.is_connected():
-            print(f"Redis not connected when checking session {session_id}")
-            return False
-        
         # Check if session exists and has connection string
-        connection_string = redis_client.hget(f"session:{session_id}", "connection_string")
+        connection_string = redis_client.hget(session_key(session_id), "connection_string")
+        return connection_string is not None
+    except Exception as e:
+        print(f"Error checking session {session_id}: {e}")
+        return False
+
+
+async def ais_database_connected(session_id: str = "default"):
+    """Async variant of is_database_connected"""
+    try:
+        connection_string = await async_redis_client.hget(session_key(session_id), "connection_string")
         return connection_string is not None
     except Exception as e:
         print(f"Error checking session {session_id}: {e}")
@@ -107,23 +136,22 @@ def is_database_connected(session_id: str = "default"):
 
 def get_session_tools(session_id: str = "default"):
     """Retrieve DB tools for a session from Redis with caching"""
-    if not is_database_connected(session_id):
-        return None, None, None
-    
     try:
         # Check if we already have a connector cached
         if session_id in session_connectors:
+            if not is_database_connected(session_id):
+                return None, None, None
             connector = session_connectors[session_id]
             fetch_db_instance = fetch_db(connector)
             execute_sql_instance = execute_sql(connector)
             return connector, fetch_db_instance, execute_sql_instance
         
-        # Create new connector only if not cached
-        connection_string = redis_client.hget(f"session:{session_id}", "connection_string")
+        # Create new connector only if not cached; a missing session has no connection string
+        connection_string = redis_client.hget(session_key(session_id), "connection_string")
         if not connection_string:
             return None, None, None
             
-        connector = DBConnector(connection_string)
+        connector = DBConnector(connection_string, session_id)
         session_connectors[session_id] = connector  # Cache it
         
         fetch_db_instance = fetch_db(connector)
@@ -133,24 +161,133 @@ def get_session_tools(session_id: str = "default"):
     except Exception as e:
         print(f"Error getting session tools for {session_id}: {e}")
         return None, None, None
+
+
+async def get_async_session_tools(session_id: str = "default"):
+    """Retrieve asyncpg-backed DB tools for a session from Redis with caching"""
+    try:
+        if session_id in session_async_connectors:
+            if not await ais_database_connected(session_id):
+                return None, None, None
+            connector = session_async_connectors[session_id]
+            return connector, async_fetch_db(connector), async_execute_sql(connector)
+
+        connection_string = await async_redis_client.hget(session_key(session_id), "connection_string")
+        if not connection_string:
+            return None, None, None
+
+        connector = AsyncDBConnector(connection_string, session_id)
+        session_async_connectors[session_id] = connector
+
+        return connector, async_fetch_db(connector), async_execute_sql(connector)
+    except Exception as e:
+        print(f"Error getting async session tools for {session_id}: {e}")
+        return None, None, None
     
 
 
 def cleanup_session(session_id: str):
     """Clean up session data from Redis and memory"""
     try:
-        # Clean up Redis data
-        redis_client.delete(f"session:{session_id}")
-        
-        # Clean up memory cache
-        if session_id in session_connectors:
-            del session_connectors[session_id]
-        
+        # Clean up Redis data, including the conversation checkpoints of the session's thread
+        user_id = redis_client.hget(session_key(session_id), "user_id")
+        with redis_client.pipeline() as pipe:
+            pipe.delete(session_key(session_id))
+            if user_id is not None:
+                pipe.srem(user_sessions_key(user_id), session_key(session_id))
+        get_checkpointer().delete_thread(session_id)
         return True
     except Exception as e:
         print(f"Error cleaning up session {session_id}: {e}")
         return False
-    
+    finally:
+        # In-process resources go even when Redis is unreachable
+        release_session_resources(session_id)
+
+
+async def acleanup_session(session_id: str):
+    """Async variant of cleanup_session"""
+    try:
+        user_id = await async_redis_client.hget(session_key(session_id), "user_id")
+        async with async_redis_client.pipeline() as pipe:
+            pipe.delete(session_key(session_id))
+            if user_id is not None:
+                pipe.srem(user_sessions_key(user_id), session_key(session_id))
+        await get_checkpointer().adelete_thread(session_id)
+        return True
+    except Exception as e:
+        print(f"Error cleaning up session {session_id}: {e}")
+        return False
+    finally:
+        release_session_resources(session_id)
+
+
+def release_session_resources(session_id: str):
+    """Drop the in-process connectors of a session"""
+    if session_id in session_connectors:
+        del session_connectors[session_id]
+    session_async_connectors.pop(session_id, None)
+    # Shared engines stay open for other sessions; idle ones are disposed by the registry
+    engine_registry.release(session_id)
+
+
+async def arelease_expired_sessions() -> int:
+    """
+    Release in-process resources of sessions whose Redis record is gone.
+
+    A session hash that expires after SESSION_TTL, or is deleted by another
+    worker, never reaches release_session_resources here otherwise.
+    """
+    session_ids = sorted(set(session_connectors) | set(session_async_connectors) | set(engine_registry.session_ids()))
+    if not session_ids:
+        return 0
+    alive = await async_redis_client.exists_many([session_key(session_id) for session_id in session_ids])
+    if alive is None:
+        # Redis unreachable: keep everything; the registry's session TTL still applies
+        return 0
+    expired = [session_id for session_id, found in zip(session_ids, alive) if not found]
+    for session_id in expired:
+        release_session_resources(session_id)
+    return len(expired)
+
+
+def cleanup_user_sessions(user_id, session_ids=()) -> int:
+    """
+    Clean up every Redis session of a user in batches, without scanning the keyspace.
+
+    Sessions recorded in the user's index are removed along with any explicitly
+    passed ids (e.g. sessions connected before the index existed).
+    """
+    session_keys = {str(key) for key in redis_client.smembers(user_sessions_key(user_id))}
+    session_keys.update(session_key(session_id) for session_id in session_ids)
+    deleted = redis_client.delete_many(list(session_keys) + [user_sessions_key(user_id)])
+    for key in session_keys:
+        session_id = session_id_from_key(key)
+        try:
+            get_checkpointer().delete_thread(session_id)
+        except Exception as e:
+            print(f"Error deleting checkpoints of session {session_id}: {e}")
+        finally:
+            release_session_resources(session_id)
+    return deleted
+
+
+async def acleanup_user_sessions(user_id, session_ids=()) -> int:
+    """Async variant of cleanup_user_sessions"""
+    session_keys = {str(key) for key in await async_redis_client.smembers(user_sessions_key(user_id))}
+    session_keys.update(session_key(session_id) for session_id in session_ids)
+    deleted = await async_redis_client.delete_many(list(session_keys) + [user_sessions_key(user_id)])
+    for key in session_keys:
+        session_id = session_id_from_key(key)
+        try:
+            await get_checkpointer().adelete_thread(session_id)
+        except Exception as e:
+            print(f"Error deleting checkpoints of session {session_id}: {e}")
+        finally:
+            release_session_resources(session_id)
+    return deleted
+
+
 
 def get_session_info(session_id: str):
     """Get session information from Redis"""
@@ -158,12 +295,13 @@ def get_session_info(session_id: str):
         if not is_database_connected(session_id):
             return None
         
-        session_data = {}
-        keys = ["connection_string", "created_at", "status", "db_schema"]
-        for key in keys:
-            value = redis_client.hget(f"session:{session_id}", key)
-            if value:
-                session_data[key] = value
+        keys = ["connection_string", "created_at", "status", "schema_fingerprint"]
+        values = redis_client.hmget(session_key(session_id), *keys)
+        session_data = {key: value for key, value in zip(keys, values) if value}
+        if session_data.get("schema_fingerprint"):
+            db_schema = schema_store.get("schema", str(session_data["schema_fingerprint"]))
+            if db_schema:
+                session_data["db_schema"] = db_schema
         
         return session_data if session_data else None
     except Exception as e:
@@ -172,46 +310,233 @@ def get_session_info(session_id: str):
 
 
 
-def create_session_tools(session_id: str):
-    
-    @tool
-    def fetch_db_schema() -> str:
+# The session hash only references the schema; the blobs live in schema_store,
+# compressed and shared by every session connected to an identical database
+SNAPSHOT_FIELDS = ("schema_version", "schema_fingerprint")
+
+
+def store_session_schema(session_id: str, snapshot) -> str:
+    """Cache a session's schema snapshot in Redis, invalidating SQL generated for an older version"""
+    db_schema = snapshot["schema"]
+    fingerprint = schema_fingerprint(db_schema)
+    previous = redis_client.hget(session_key(session_id), "schema_fingerprint")
+    if previous and str(previous) != fingerprint:
+        sql_cache.invalidate(str(previous))
+        if semantic_cache is not None:
+            semantic_cache.invalidate(str(previous))
+    schema_store.put("schema", fingerprint, db_schema)
+    schema_store.put("schema_markers", snapshot["version"], snapshot["markers"])
+    redis_client.hset(session_key(session_id), mapping={
+        "schema_version": snapshot["version"],
+        "schema_fingerprint": fingerprint,
+    })
+    return fingerprint
+
+
+async def astore_session_schema(session_id: str, snapshot) -> str:
+    """Async variant of store_session_schema"""
+    db_schema = snapshot["schema"]
+    fingerprint = schema_fingerprint(db_schema)
+    previous = await async_redis_client.hget(session_key(session_id), "schema_fingerprint")
+    if previous and str(previous) != fingerprint:
+        await asyncio.to_thread(sql_cache.invalidate, str(previous))
+        if semantic_cache is not None:
+            semantic_cache.invalidate(str(previous))
+    await schema_store.aput("schema", fingerprint, db_schema)
+    await schema_store.aput("schema_markers", snapshot["version"], snapshot["markers"])
+    await async_redis_client.hset(session_key(session_id), mapping={
+        "schema_version": snapshot["version"],
+        "schema_fingerprint": fingerprint,
+    })
+    return fingerprint
+
+
+def load_session_snapshot(session_id: str):
+    """Schema snapshot cached for a session (with its fingerprint), or None"""
+    version, fingerprint = redis_client.hmget(session_key(session_id), *SNAPSHOT_FIELDS)
+    if not version or not fingerprint:
+        return None
+    db_schema = schema_store.get("schema", str(fingerprint))
+    markers = schema_store.get("schema_markers", str(version))
+    if not db_schema or not isinstance(markers, dict):
+        return None
+    return {"schema": db_schema, "markers": markers, "version": str(version), "fingerprint": fingerprint}
+
+
+async def aload_session_snapshot(session_id: str):
+    """Async variant of load_session_snapshot"""
+    version, fingerprint = await async_redis_client.hmget(session_key(session_id), *SNAPSHOT_FIELDS)
+    if not version or not fingerprint:
+        return None
+    db_schema = await schema_store.aget("schema", str(fingerprint))
+    markers = await schema_store.aget("schema_markers", str(version))
+    if not db_schema or not isinstance(markers, dict):
+        return None
+    return {"schema": db_schema, "markers": markers, "version": str(version), "fingerprint": fingerprint}
+
+
+def refresh_session_schema(session_id: str):
+    """Re-read only the tables whose catalog markers changed; returns (schema, fingerprint)"""
+    cached = load_session_snapshot(session_id)
+    _, fetch_db_instance, _ = get_session_tools(session_id)
+    snapshot, changed = fetch_db_instance.refresh_schema(cached)
+    if changed:
+        return snapshot["schema"], store_session_schema(session_id, snapshot)
+    return snapshot["schema"], str(cached["fingerprint"])
+
+
+async def arefresh_session_schema(session_id: str):
+    """Async variant of refresh_session_schema"""
+    cached = await aload_session_snapshot(session_id)
+    _, fetch_db_instance, _ = await get_async_session_tools(session_id)
+    snapshot, changed = await fetch_db_instance.refresh_schema(cached)
+    if changed:
+        return snapshot["schema"], await astore_session_schema(session_id, snapshot)
+    return snapshot["schema"], str(cached["fingerprint"])
+
+
+def get_session_schema(session_id: str):
+    """Return (schema, fingerprint) from the schema store, introspecting on a miss"""
+    fingerprint = redis_client.hget(session_key(session_id), "schema_fingerprint")
+    db_schema = schema_store.get("schema", str(fingerprint)) if fingerprint else None
+    if not db_schema:
+        return refresh_session_schema(session_id)
+    return db_schema, str(fingerprint)
+
+
+async def aget_session_schema(session_id: str):
+    """Async variant of get_session_schema"""
+    fingerprint = await async_redis_client.hget(session_key(session_id), "schema_fingerprint")
+    db_schema = await schema_store.aget("schema", str(fingerprint)) if fingerprint else None
+    if not db_schema:
+        return await arefresh_session_schema(session_id)
+    return db_schema, str(fingerprint)
+
+
+def lookup_cached_sql(question: str, fingerprint: str):
+    """Exact-match cache first, then the semantic cache for paraphrases"""
+    cached_sql = sql_cache.get(question, fingerprint)
+    if cached_sql:
+        return cached_sql
+    if semantic_cache is not None:
+        # A cache that cannot embed (e.g. the model failed to load) must not fail generation
+        try:
+            cached_sql = semantic_cache.get(question, fingerprint)
+        except Exception as e:
+            print(f"Semantic cache lookup failed: {e}")
+            return None
+        if cached_sql:
+            # Promote so the next identical phrasing skips the embedding
+            sql_cache.set(question, fingerprint, cached_sql)
+            return cached_sql
+    return None
+
+
+def remember_sql(question: str, fingerprint: str, generated_sql: str):
+    """Store freshly generated SQL in both caches"""
+    sql_cache.set(question, fingerprint, generated_sql)
+    # Only reads are reused for paraphrases; a near match must never replay a write
+    if semantic_cache is not None and looks_like_sql(generated_sql) and is_read_query(generated_sql):
+        try:
+            semantic_cache.set(question, fingerprint, generated_sql)
+        except Exception as e:
+            print(f"Semantic cache store failed: {e}")
+
+
+def generate_cached_sql(question: str, db_schema, fingerprint: str) -> str:
+    """Generate SQL for a question, reusing earlier answers for the same schema"""
+    cached_sql = lookup_cached_sql(question, fingerprint)
+    if cached_sql:
+        return cached_sql
+
+    # Large schemas are cut down to the tables relevant to the question
+    prompt_schema = render_schema(schema_retriever.prune(db_schema, fingerprint, question), fingerprint)
+    sql_chain = get_nlp_generator().get_sql_chain()
+    generated_sql = str(sql_chain.invoke({"question": question, "db_schema": prompt_schema}))
+    remember_sql(question, fingerprint, generated_sql)
+    return generated_sql
+
+
+async def agenerate_cached_sql(question: str, db_schema, fingerprint: str) -> str:
+    """Async variant of generate_cached_sql"""
+    # Embedding the question is CPU work, keep it off the event loop
+    cached_sql = await asyncio.to_thread(lookup_cached_sql, question, fingerprint)
+    if cached_sql:
+        return cached_sql
+
+    pruned_schema = await asyncio.to_thread(schema_retriever.prune, db_schema, fingerprint, question)
+    prompt_schema = render_schema(pruned_schema, fingerprint)
+    sql_chain = get_nlp_generator().get_sql_chain()
+    generated_sql = str(await sql_chain.ainvoke({"question": question, "db_schema": prompt_schema}))
+    await asyncio.to_thread(remember_sql, question, fingerprint, generated_sql)
+    return generated_sql
+
+
+
+def session_from_config(config: RunnableConfig) -> str:
+    """Resolve the session of a graph run: the thread_id is the session id"""
+    return ((config or {}).get("configurable") or {}).get("thread_id") or "default"
+
+
+def create_session_tools():
+    """
+    Build the DB tools once per process. The session is read from the run config
+    at call time, so a single compiled graph serves every session.
+    """
+
+    def fetch_db_schema(config: RunnableConfig) -> str:
         """Fetch database schema for a session"""
+        session_id = session_from_config(config)
         try:
             if not is_database_connected(session_id):
                 return f"Database not connected for session {session_id}."
             
-            _, fetch_db_instance, _ = get_session_tools(session_id)
-            db_schema = fetch_db_instance.get_db_schema()
-            # Update Redis schema cache
-            redis_client.hset(f"session:{session_id}", "db_schema", db_schema)
-            return str(db_schema)
+            # Only re-reads tables whose catalog markers changed since the cached copy
+            db_schema, fingerprint = refresh_session_schema(session_id)
+            return render_schema(db_schema, fingerprint)
         except Exception as e: 
             raise ValueError(f"Error: {e}")
 
-    @tool
-    def generate_sql(question: str) -> str:
+    async def afetch_db_schema(config: RunnableConfig) -> str:
+        """Fetch database schema for a session"""
+        session_id = session_from_config(config)
+        try:
+            if not await ais_database_connected(session_id):
+                return f"Database not connected for session {session_id}."
+
+            db_schema, fingerprint = await arefresh_session_schema(session_id)
+            return render_schema(db_schema, fingerprint)
+        except Exception as e:
+            raise ValueError(f"Error: {e}")
+
+    def generate_sql(question: str, config: RunnableConfig) -> str:
         """Generate SQL query using session-specific schema"""
+        session_id = session_from_config(config)
         try:
             if not is_database_connected(session_id):
                 raise ValueError(f"Database not connected for session {session_id}.")
             
             # Get cached schema from Redis
-            db_schema = redis_client.hget(f"session:{session_id}", "db_schema")
-            if not db_schema:
-                _, fetch_db_instance, _ = get_session_tools(session_id)
-                db_schema = fetch_db_instance.get_db_schema()
-                redis_client.hset(f"session:{session_id}", "db_schema", db_schema)
-
-            sql_chain = nlp_generator.get_sql_chain()
-            generated_sql = sql_chain.invoke({"question": question, "db_schema": db_schema})
-            return str(generated_sql)
+            db_schema, fingerprint = get_session_schema(session_id)
+            return generate_cached_sql(question, db_schema, fingerprint)
+        except Exception as e:
+            raise ValueError(f"Error: {e}")
+
+    async def agenerate_sql(question: str, config: RunnableConfig) -> str:
+        """Generate SQL query using session-specific schema"""
+        session_id = session_from_config(config)
+        try:
+            if not await ais_database_connected(session_id):
+                raise ValueError(f"Database not connected for session {session_id}.")
+
+            db_schema, fingerprint = await aget_session_schema(session_id)
+            return await agenerate_cached_sql(question, db_schema, fingerprint)
         except Exception as e:
             raise ValueError(f"Error: {e}")
 
-    @tool
-    def execute_sql_query(query: str) -> str:
+    def execute_sql_query(query: str, config: RunnableConfig) -> str:
         """Execute SQL query for a session"""
+        session_id = session_from_config(config)
         try:
             if not is_database_connected(session_id):
                 raise ValueError(f"Database not connected for session {session_id}.")
@@ -221,8 +546,31 @@ def create_session_tools(session_id: str):
             return str(result)
         except Exception as e: 
             raise ValueError(f"Error: {e}")
-    
-    return [fetch_db_schema, generate_sql, execute_sql_query]
+
+    async def aexecute_sql_query(query: str, config: RunnableConfig) -> str:
+        """Execute SQL query for a session"""
+        session_id = session_from_config(config)
+        try:
+            if not await ais_database_connected(session_id):
+                raise ValueError(f"Database not connected for session {session_id}.")
+
+            _, _, execute_sql_instance = await get_async_session_tools(session_id)
+            result = await execute_sql_instance.execute_query(query)
+            return str(result)
+        except Exception as e:
+            raise ValueError(f"Error: {e}")
+
+    # Each tool carries both implementations: ToolNode picks the coroutine when the
+    # graph runs under ainvoke, so SQL never blocks the event loop serving /ask.
+    # The RunnableConfig parameter is injected by LangChain and hidden from the LLM.
+    return [
+        StructuredTool.from_function(func=fetch_db_schema, coroutine=afetch_db_schema),
+        StructuredTool.from_function(func=generate_sql, coroutine=agenerate_sql),
+        StructuredTool.from_function(func=execute_sql_query, coroutine=aexecute_sql_query),
+    ]
+
+
+session_tools = create_session_tools()
 
 # Default tools for backward compatibility before session management
 
@@ -236,10 +584,9 @@ def fetch_db_schema() -> str:
             return "Database not connected. Please use the /connect_db/{db_id} endpoint to establish a database connection first."
         
         print("Fetching the database schema...")
-        _, fetch_db_instance, _ = get_session_tools(session_id)
-        db_schema = fetch_db_instance.get_db_schema()
+        db_schema, fingerprint = refresh_session_schema(session_id)
         print("Database schema fetched successfully.")
-        return str(db_schema)
+        return render_schema(db_schema, fingerprint)
     except Exception as e: 
         raise ValueError(f"Error occurred with exception: {e}")
 
@@ -252,13 +599,11 @@ def generate_sql(question: str) -> str:
             raise ValueError("Database not connected. Please use the /connect_db/{db_id} endpoint to establish a database connection first.")
             
         print("Fetching schema for SQL generation...")
-        _, fetch_db_instance, _ = get_session_tools(session_id)
-        db_schema = fetch_db_instance.get_db_schema()
+        db_schema, fingerprint = refresh_session_schema(session_id)
         print("Generating SQL query for Read operation...")
-        sql_chain = nlp_generator.get_sql_chain()
-        generated_sql = sql_chain.invoke({"question": question, "db_schema": db_schema})
+        generated_sql = generate_cached_sql(question, db_schema, fingerprint)
         print(f"Generated SQL: {generated_sql}")
-        return str(generated_sql)
+        return generated_sql
     except Exception as e:
         raise ValueError(f"Error occurred with exception: {e}")
         
@@ -292,7 +637,7 @@ def get_summary(question_and_result: str) -> str:
         question = parts[0].replace("QUESTION:", "").strip()
         result = parts[1].strip()
         
-        summary = summary_generator.generate_summary(question, result)
+        summary = get_summary_generator().generate_summary(question, result)
         return str(summary)
     except Exception as e:
         raise ValueError(f"Error occurred with exception : {e}")
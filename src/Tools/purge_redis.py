@@ -0,0 +1,34 @@
+"""
+Admin purge of the app's Redis state: every key under REDIS_KEY_PREFIX.
+
+This drops all users' sessions, conversation checkpoints, stored schemas and
+caches, so it is never run automatically (shutdown leaves that state to its
+TTLs). Keys outside the prefix, e.g. other apps on a shared Redis, are not
+touched.
+
+    python -m src.Tools.purge_redis --yes
+"""
+import argparse
+
+from src.redis_client import redis_client
+from src.redis_keys import REDIS_KEY_PREFIX, app_key
+
+
+def purge_app_state() -> int:
+    """Delete every key under the app prefix with SCAN and batched UNLINKs"""
+    return redis_client.delete_many(redis_client.scan_iter(match=app_key("*")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete every Redis key under REDIS_KEY_PREFIX")
+    parser.add_argument("--yes", action="store_true", help="confirm the purge")
+    args = parser.parse_args()
+    if not args.yes:
+        parser.error(f"refusing to delete {app_key('*')} without --yes")
+    if not redis_client.is_connected():
+        parser.error("Redis is not reachable (check REDIS_URL)")
+    print(f"Deleted {purge_app_state()} keys under the '{REDIS_KEY_PREFIX}' prefix")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,29 @@
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text  
+from sqlalchemy.engine import make_url
+from src.Tools_Functions.engine_registry import engine_registry
+
+
+def to_async_url(connection_string: str) -> str:
+    """Rewrite a postgres connection string to use the asyncpg driver"""
+    url = make_url(connection_string)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
 
 class DBConnector:
-    def __init__(self, connection_string: str):
+    def __init__(self, connection_string: str, session_id: str = None):
         self.connection_string = connection_string
-        self.engine = None
+        self.session_id = session_id
 
     def connect(self):
         """Create and return a database connection"""
         try:
-            if not self.engine:
-                self.engine = create_engine(self.connection_string)
-            connection = self.engine.connect()
+            # Engines are shared per database through the registry, which also
+            # tracks the session holding this connector. Looked up on every
+            # connect: an engine the registry has evicted must not be reused.
+            engine = engine_registry.get_engine(self.connection_string, self.session_id)
+            connection = engine.connect()
             return connection
         except Exception as e:
             raise ValueError(f"Failed to connect to database: {e}")
@@ -19,3 +31,23 @@ class DBConnector:
     def get_connection_string(self):
         """Return the connection string"""
         return self.connection_string
+
+
+class AsyncDBConnector:
+    def __init__(self, connection_string: str, session_id: str = None):
+        self.connection_string = connection_string
+        self.async_connection_string = to_async_url(connection_string)
+        self.session_id = session_id
+
+    async def connect(self):
+        """Create and return an async database connection"""
+        try:
+            engine = engine_registry.get_async_engine(self.async_connection_string, self.session_id)
+            connection = await engine.connect()
+            return connection
+        except Exception as e:
+            raise ValueError(f"Failed to connect to database: {e}")
+
+    def get_connection_string(self):
+        """Return the connection string"""
+        return self.connection_string
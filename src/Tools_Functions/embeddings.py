@@ -0,0 +1,29 @@
+import os
+import threading
+
+import numpy as np
+
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_embedding_model():
+    """Load the sentence-transformers model once per process, on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from sentence_transformers import SentenceTransformer
+                _model = SentenceTransformer(EMBEDDING_MODEL)
+    return _model
+
+
+def embed(texts) -> np.ndarray:
+    """L2-normalised float32 embeddings, so a dot product is the cosine similarity"""
+    vectors = get_embedding_model().encode(
+        list(texts), convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False
+    )
+    return np.asarray(vectors, dtype=np.float32)
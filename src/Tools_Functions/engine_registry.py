@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+def connection_fingerprint(connection_string: str) -> str:
+    """Stable identifier for a connection string that does not expose the password"""
+    url = make_url(connection_string)
+    # Normalise the driver so psycopg2 and asyncpg connectors share one entry
+    normalised = url.set(drivername=url.get_backend_name()).render_as_string(hide_password=False)
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()[:32]
+
+
+class _EngineEntry:
+    __slots__ = ("connection_string", "engine", "async_engine", "sessions", "last_used")
+
+    def __init__(self, connection_string: str):
+        self.connection_string = connection_string
+        self.engine = None
+        self.async_engine = None
+        self.sessions = set()
+        self.last_used = time.monotonic()
+
+
+class EngineRegistry:
+    """
+    Process-wide registry of SQLAlchemy engines keyed by connection fingerprint.
+
+    Sessions pointing at the same customer database share one size-bounded pool.
+    Each session holds a reference on the entry it uses; entries without
+    references are disposed once idle longer than ``idle_ttl`` seconds or when
+    more than ``max_engines`` entries are open (least recently used first).
+    A reference not renewed within ``session_ttl`` seconds is dropped, so
+    sessions that expire without an explicit release cannot pin an engine.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 5,
+        max_overflow: int = 5,
+        pool_recycle: int = 1800,
+        pool_timeout: int = 30,
+        idle_ttl: int = 600,
+        max_engines: int = 50,
+        session_ttl: int = 86400,
+    ):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_recycle = pool_recycle
+        self.pool_timeout = pool_timeout
+        self.idle_ttl = idle_ttl
+        self.max_engines = max_engines
+        self.session_ttl = session_ttl
+        self._entries: "OrderedDict[str, _EngineEntry]" = OrderedDict()
+        self._session_keys: Dict[str, str] = {}
+        self._session_seen: Dict[str, float] = {}
+        # The event loop only keeps weak references to tasks
+        self._disposals: Set[asyncio.Task] = set()
+        self._lock = threading.RLock()
+
+    def _engine_kwargs(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_recycle": self.pool_recycle,
+            "pool_timeout": self.pool_timeout,
+            "pool_pre_ping": True,
+        }
+
+    def _acquire(self, connection_string: str, session_id: Optional[str]) -> _EngineEntry:
+        key = connection_fingerprint(connection_string)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _EngineEntry(connection_string)
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            entry.last_used = time.monotonic()
+
+            if session_id is not None:
+                previous = self._session_keys.get(session_id)
+                if previous is not None and previous != key:
+                    self._drop_session_ref(session_id, previous)
+                self._session_keys[session_id] = key
+                self._session_seen[session_id] = entry.last_used
+                entry.sessions.add(session_id)
+
+            self._evict_locked(keep=key)
+            return entry
+
+    def get_engine(self, connection_string: str, session_id: Optional[str] = None):
+        """Return the shared synchronous engine for a connection string"""
+        entry = self._acquire(connection_string, session_id)
+        with self._lock:
+            if entry.engine is None:
+                entry.engine = create_engine(connection_string, **self._engine_kwargs())
+            return entry.engine
+
+    def get_async_engine(self, async_connection_string: str, session_id: Optional[str] = None):
+        """Return the shared asyncpg engine for a connection string"""
+        entry = self._acquire(async_connection_string, session_id)
+        with self._lock:
+            if entry.async_engine is None:
+                entry.async_engine = create_async_engine(async_connection_string, **self._engine_kwargs())
+            return entry.async_engine
+
+    def _drop_session_ref(self, session_id: str, key: str):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.sessions.discard(session_id)
+            entry.last_used = time.monotonic()
+
+    def release(self, session_id: str):
+        """Drop the reference a session holds on its engine"""
+        with self._lock:
+            key = self._session_keys.pop(session_id, None)
+            self._session_seen.pop(session_id, None)
+            if key is not None:
+                self._drop_session_ref(session_id, key)
+            self._evict_locked()
+
+    def session_ids(self) -> List[str]:
+        """Sessions currently holding a reference"""
+        with self._lock:
+            return list(self._session_keys)
+
+    def _expire_sessions_locked(self, now: float):
+        for session_id, seen in list(self._session_seen.items()):
+            if now - seen > self.session_ttl:
+                del self._session_seen[session_id]
+                self._drop_session_ref(session_id, self._session_keys.pop(session_id))
+
+    def _evict_locked(self, keep: Optional[str] = None):
+        now = time.monotonic()
+        self._expire_sessions_locked(now)
+        idle = [key for key, entry in self._entries.items() if not entry.sessions and key != keep]
+        # Entries are kept in LRU order, so the oldest idle ones come first
+        overflow = len(self._entries) - self.max_engines
+        for key in idle:
+            entry = self._entries[key]
+            if overflow > 0 or now - entry.last_used > self.idle_ttl:
+                self._dispose_entry(self._entries.pop(key))
+                overflow -= 1
+
+    def evict_idle(self):
+        """Dispose engines that are unreferenced and past their idle TTL (run periodically)"""
+        with self._lock:
+            self._evict_locked()
+
+    def _dispose_entry(self, entry: _EngineEntry):
+        if entry.engine is not None:
+            entry.engine.dispose()
+        if entry.async_engine is not None:
+            try:
+                task = asyncio.get_running_loop().create_task(entry.async_engine.dispose())
+                self._disposals.add(task)
+                task.add_done_callback(self._disposals.discard)
+            except RuntimeError:
+                # No loop to close asyncpg connections on; just drop the pool
+                entry.async_engine.sync_engine.dispose(close=False)
+
+    async def adispose_all(self):
+        """Dispose every engine, awaiting asyncpg pools on the running loop"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._session_keys.clear()
+            self._session_seen.clear()
+        for entry in entries:
+            if entry.engine is not None:
+                entry.engine.dispose()
+            if entry.async_engine is not None:
+                await entry.async_engine.dispose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Open engines with their session counts and pool status"""
+        with self._lock:
+            return {
+                "engines": len(self._entries),
+                "sessions": len(self._session_keys),
+                "pools": [
+                    {
+                        "fingerprint": key,
+                        "sessions": len(entry.sessions),
+                        "pool": entry.engine.pool.status() if entry.engine is not None else None,
+                    }
+                    for key, entry in self._entries.items()
+                ],
+            }
+
+
+engine_registry = EngineRegistry(
+    pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "5")),
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    idle_ttl=int(os.getenv("DB_ENGINE_IDLE_TTL", "600")),
+    max_engines=int(os.getenv("DB_MAX_ENGINES", "50")),
+    session_ttl=int(os.getenv("DB_ENGINE_SESSION_TTL", "86400")),
+)
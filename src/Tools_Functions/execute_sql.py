@@ -1,37 +1,216 @@
-from typing import List, Any, Union, Dict
-from src.Tools_Functions.db_connector import DBConnector
+import json
+import os
+from typing import Any, Optional
+
+from src.Tools_Functions.db_connector import DBConnector, AsyncDBConnector
+from src.Tools_Functions.engine_registry import connection_fingerprint
+from src.Tools_Functions.query_result import QueryResult
+from src.Tools_Functions.result_cache import ResultCache, result_cache
+from src.Tools_Functions.sql_analysis import is_locking_read, is_read_query
 from sqlalchemy import create_engine, text
 
 
+# Per-query budgets: results beyond these are cut to a preview so a careless
+# SELECT * on a huge table never lands fully in worker memory
+MAX_RESULT_ROWS = int(os.getenv("SQL_MAX_ROWS", "500"))
+MAX_RESULT_BYTES = int(os.getenv("SQL_MAX_BYTES", str(256 * 1024)))
+FETCH_BATCH_SIZE = int(os.getenv("SQL_FETCH_BATCH_SIZE", "200"))
+
+
+def _row_size(row) -> int:
+    """Rough in-memory/text size of a row, used for the byte budget"""
+    return sum(len(str(value)) for value in row)
+
+
+def _clip_row(row, max_bytes: int) -> tuple:
+    """Shorten the wide values of a row so it fits the byte budget"""
+    per_value = max(max_bytes // max(len(row), 1), 16)
+    return tuple(
+        value if len(str(value)) <= per_value else str(value)[:per_value] + "..."
+        for value in row
+    )
+
+
+class _BoundedCollector:
+    """Accumulates streamed rows until the row or byte budget is exhausted"""
+
+    def __init__(self, max_rows: int, max_bytes: int):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.rows = []
+        self.size = 0
+        self.truncated = False
+
+    def add(self, partition) -> bool:
+        """Add a batch of rows; returns False once the budget is exhausted"""
+        for row in partition:
+            row_size = _row_size(row)
+            if len(self.rows) >= self.max_rows or self.size + row_size > self.max_bytes:
+                self.truncated = True
+                if not self.rows and self.max_rows > 0:
+                    # Never answer with an empty table: keep the first row, clipped
+                    row = _clip_row(row, self.max_bytes)
+                    self.rows.append(row)
+                    self.size += _row_size(row)
+                return False
+            self.rows.append(tuple(row))
+            self.size += row_size
+        return True
+
+    def to_result(self, columns, approx_total_rows: Optional[int] = None) -> QueryResult:
+        return QueryResult(columns, self.rows, truncated=self.truncated, total_rows=approx_total_rows)
+
+
+def _plan_rows(explain_output) -> Optional[int]:
+    """Pull the planner's row estimate out of EXPLAIN (FORMAT JSON) output"""
+    if isinstance(explain_output, str):
+        explain_output = json.loads(explain_output)
+    return int(explain_output[0]["Plan"]["Plan Rows"])
+
+
+def _write_result(result, max_rows: int, max_bytes: int) -> QueryResult:
+    """Result for non-SELECT queries (INSERT, UPDATE, DELETE, etc.)"""
+    # Transaction will be automatically committed when exiting the context
+    if result.returns_rows:
+        # DELETE ... RETURNING *, data-modifying CTEs and statements sqlparse cannot
+        # type can return whole tables, so they get the same budgets as reads
+        columns = list(result.keys())
+        collector = _BoundedCollector(max_rows, max_bytes)
+        for partition in result.partitions(FETCH_BATCH_SIZE):
+            if not collector.add(partition):
+                break
+        result.close()
+        return collector.to_result(columns)
+    return QueryResult(affected_rows=result.rowcount)
+
+
 class execute_sql: 
-    def __init__(self, db_connector: DBConnector): 
+    def __init__(
+        self,
+        db_connector: DBConnector,
+        max_rows: int = MAX_RESULT_ROWS,
+        max_bytes: int = MAX_RESULT_BYTES,
+        cache: Optional[ResultCache] = result_cache,
+    ): 
         self.db_connector = db_connector
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.cache = cache
+
+    def _estimate_total(self, connection, query: str) -> Optional[int]:
+        try:
+            with connection.begin_nested():
+                return _plan_rows(connection.execute(text(f"EXPLAIN (FORMAT JSON) {query}")).scalar())
+        except Exception:
+            return None
 
-    def execute_query(self, query: str) -> Union[List[Dict[str, Any]], Dict[str, Any]]: 
+    def execute_query(self, query: str) -> QueryResult: 
         """Execute SQL query and return results"""
         try:
-            connection = self.db_connector.connect()
-            try:
-                # Use begin() for auto-commit transactions
-                with connection.begin() as trans:
-                    result = connection.execute(text(query))
-                    
-                    # Check if the query returns rows (SELECT queries)
-                    if result.returns_rows:
-                        rows = result.fetchall()
-                        # Convert rows to list of dictionaries for easier handling
-                        if rows:
-                            columns = result.keys()
-                            return [dict(zip(columns, row)) for row in rows]
-                        else:
-                            return []
-                    else:
-                        # For non-SELECT queries (INSERT, UPDATE, DELETE, etc.)
-                        # Transaction will be automatically committed when exiting the context
-                        return {"affected_rows": result.rowcount, "message": "Query executed successfully"}
-            finally:
-                connection.close()
-                    
+            read = is_read_query(query)
+            # SELECT ... FOR UPDATE/SHARE must reach the database to take its locks
+            cacheable = read and not is_locking_read(query)
+            fingerprint = connection_fingerprint(self.db_connector.connection_string)
+            if cacheable and self.cache is not None:
+                cached = self.cache.get(fingerprint, query)
+                if cached is not None:
+                    return cached
+
+            result = self._run(query, read)
+
+            if self.cache is not None:
+                # Only after commit: a rolled back write leaves the cache valid
+                if cacheable:
+                    self.cache.set(fingerprint, query, result)
+                elif not read:
+                    self.cache.invalidate_for_write(fingerprint, query)
+            return result
         except Exception as e:  
             raise ValueError(f"Error occurred with exception: {e}")
-            
\ No newline at end of file
+
+    def _run(self, query: str, read: bool) -> QueryResult:
+        connection = self.db_connector.connect()
+        try:
+            # Use begin() for auto-commit transactions
+            with connection.begin() as trans:
+                if not read:
+                    return _write_result(connection.execute(text(query)), self.max_rows, self.max_bytes)
+
+                # Server-side cursor: rows arrive in batches of FETCH_BATCH_SIZE
+                result = connection.execute(text(query).execution_options(yield_per=FETCH_BATCH_SIZE))
+                columns = list(result.keys())
+                collector = _BoundedCollector(self.max_rows, self.max_bytes)
+                for partition in result.partitions():
+                    if not collector.add(partition):
+                        break
+                result.close()
+
+                approx_total = self._estimate_total(connection, query) if collector.truncated else None
+                return collector.to_result(columns, approx_total)
+        finally:
+            connection.close()
+
+
+class async_execute_sql:
+    def __init__(
+        self,
+        db_connector: AsyncDBConnector,
+        max_rows: int = MAX_RESULT_ROWS,
+        max_bytes: int = MAX_RESULT_BYTES,
+        cache: Optional[ResultCache] = result_cache,
+    ):
+        self.db_connector = db_connector
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.cache = cache
+
+    async def _estimate_total(self, connection, query: str) -> Optional[int]:
+        try:
+            async with connection.begin_nested():
+                result = await connection.execute(text(f"EXPLAIN (FORMAT JSON) {query}"))
+                return _plan_rows(result.scalar())
+        except Exception:
+            return None
+
+    async def execute_query(self, query: str) -> QueryResult:
+        """Execute SQL query on the asyncpg engine and return results"""
+        try:
+            read = is_read_query(query)
+            # SELECT ... FOR UPDATE/SHARE must reach the database to take its locks
+            cacheable = read and not is_locking_read(query)
+            fingerprint = connection_fingerprint(self.db_connector.connection_string)
+            if cacheable and self.cache is not None:
+                cached = await self.cache.aget(fingerprint, query)
+                if cached is not None:
+                    return cached
+
+            result = await self._run(query, read)
+
+            if self.cache is not None:
+                if cacheable:
+                    await self.cache.aset(fingerprint, query, result)
+                elif not read:
+                    await self.cache.ainvalidate_for_write(fingerprint, query)
+            return result
+        except Exception as e:
+            raise ValueError(f"Error occurred with exception: {e}")
+
+    async def _run(self, query: str, read: bool) -> QueryResult:
+        connection = await self.db_connector.connect()
+        try:
+            async with connection.begin():
+                if not read:
+                    return _write_result(await connection.execute(text(query)), self.max_rows, self.max_bytes)
+
+                result = await connection.stream(text(query))
+                columns = list(result.keys())
+                collector = _BoundedCollector(self.max_rows, self.max_bytes)
+                async for partition in result.partitions(FETCH_BATCH_SIZE):
+                    if not collector.add(partition):
+                        break
+                await result.close()
+
+                approx_total = await self._estimate_total(connection, query) if collector.truncated else None
+                return collector.to_result(columns, approx_total)
+        finally:
+            await connection.close()
@@ -1,41 +1,194 @@
-from typing import Dict, Any
+import hashlib
+import json
+from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy import create_engine, text
-from src.Tools_Functions.db_connector import DBConnector
+from src.Tools_Functions.db_connector import DBConnector, AsyncDBConnector
+
+
+_USER_RELATIONS = """
+    c.relkind IN ('r', 'p', 'v', 'm', 'f')
+    AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+    AND n.nspname NOT LIKE 'pg_toast%'
+    AND n.nspname NOT LIKE 'pg_temp%'
+"""
+
+# One row per table with a change marker built from the xmin of its pg_class,
+# pg_attribute and pg_constraint rows: any DDL touching the table rewrites at
+# least one of them, while VACUUM/ANALYZE update pg_class in place
+MARKERS_QUERY = f"""
+    SELECT c.oid, n.nspname, c.relname,
+           md5(concat_ws('|',
+               c.xmin::text,
+               (SELECT string_agg(a.attnum || ':' || a.xmin::text, ',' ORDER BY a.attnum)
+                  FROM pg_attribute a WHERE a.attrelid = c.oid AND a.attnum > 0),
+               (SELECT string_agg(con.oid || ':' || con.xmin::text, ',' ORDER BY con.oid)
+                  FROM pg_constraint con WHERE con.conrelid = c.oid),
+               (SELECT string_agg(i.indexrelid::text, ',' ORDER BY i.indexrelid)
+                  FROM pg_index i WHERE i.indrelid = c.oid)
+           )) AS marker
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE {_USER_RELATIONS}
+"""
+
+# Columns, primary key, foreign keys and indexes for a set of tables in one round trip
+DETAILS_QUERY = """
+    SELECT c.oid, n.nspname, c.relname,
+           (SELECT json_agg(json_build_object('column', a.attname, 'type', format_type(a.atttypid, a.atttypmod))
+                            ORDER BY a.attnum)
+              FROM pg_attribute a
+             WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped) AS columns,
+           (SELECT json_agg(a.attname ORDER BY k.ord)
+              FROM pg_constraint con
+              CROSS JOIN LATERAL unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+              JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+             WHERE con.conrelid = c.oid AND con.contype = 'p') AS primary_key,
+           (SELECT json_agg(json_build_object(
+                       'columns', (SELECT json_agg(a.attname ORDER BY k.ord)
+                                     FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+                                     JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum),
+                       'references', rn.nspname || '.' || rc.relname,
+                       'referenced_columns', (SELECT json_agg(a.attname ORDER BY k.ord)
+                                                FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+                                                JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum))
+                   ORDER BY con.conname)
+              FROM pg_constraint con
+              JOIN pg_class rc ON rc.oid = con.confrelid
+              JOIN pg_namespace rn ON rn.oid = rc.relnamespace
+             WHERE con.conrelid = c.oid AND con.contype = 'f') AS foreign_keys,
+           (SELECT json_agg(pg_get_indexdef(i.indexrelid) ORDER BY i.indexrelid)
+              FROM pg_index i
+             WHERE i.indrelid = c.oid AND NOT i.indisprimary) AS indexes
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.oid = ANY(CAST(:oids AS oid[]))
+"""
+
+
+def table_columns(details) -> List[Dict[str, str]]:
+    """Column list of a table entry, also accepting the older list-only format"""
+    if isinstance(details, dict):
+        return details.get("columns") or []
+    return details or []
+
+
+def table_foreign_keys(details) -> List[Dict[str, Any]]:
+    """Foreign keys of a table entry (none in the older list-only format)"""
+    if isinstance(details, dict):
+        return details.get("foreign_keys") or []
+    return []
+
+
+def _json(value):
+    # psycopg2 decodes json columns, asyncpg hands back the raw text
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def _markers(rows) -> Dict[str, List[str]]:
+    """{oid: [schema, table, marker]} from MARKERS_QUERY rows"""
+    return {str(r[0]): [r[1], r[2], r[3]] for r in rows}
+
+
+def catalog_fingerprint(markers: Dict[str, List[str]]) -> str:
+    """Hash of every table's change marker; differs whenever any table's DDL changed"""
+    digest = hashlib.sha256()
+    for oid in sorted(markers):
+        digest.update(f"{oid}:{markers[oid][2]};".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def _table_details(row) -> Dict[str, Any]:
+    return {
+        "columns": _json(row[3]) or [],
+        "primary_key": _json(row[4]) or [],
+        "foreign_keys": _json(row[5]) or [],
+        "indexes": _json(row[6]) or [],
+    }
+
+
+def _changed_oids(markers: Dict[str, List[str]], cached: Optional[Dict[str, Any]]) -> List[int]:
+    if not cached:
+        return [int(oid) for oid in markers]
+    previous = cached.get("markers") or {}
+    return [int(oid) for oid, marker in markers.items() if previous.get(oid) != marker]
+
+
+def _merge(markers: Dict[str, List[str]], cached: Optional[Dict[str, Any]], detail_rows) -> Dict[str, Any]:
+    """Build a snapshot reusing cached tables whose marker did not change"""
+    fresh = {str(r[0]): _table_details(r) for r in detail_rows}
+    previous_markers = (cached or {}).get("markers") or {}
+    previous_schema = (cached or {}).get("schema") or {}
+
+    overview = {}
+    for oid, (schema, table, _) in sorted(markers.items(), key=lambda item: (item[1][0], item[1][1])):
+        if oid in fresh:
+            details = fresh[oid]
+        elif oid in previous_markers:
+            details = previous_schema[previous_markers[oid][0]][previous_markers[oid][1]]
+        else:
+            continue
+        overview.setdefault(schema, {})[table] = details
+
+    return {"schema": overview, "markers": markers, "version": catalog_fingerprint(markers)}
 
 
 class fetch_db: 
     def __init__(self, db_connector: DBConnector):
         self.db_connector = db_connector
 
-    def get_db_schema(self) -> Dict[str, Any]:
-        """Get database schema information"""
+    def refresh_schema(self, cached: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Bring a schema snapshot up to date.
+
+        A snapshot is {"schema": {schema: {table: details}}, "markers": ..., "version": ...}.
+        Only tables whose catalog marker changed are re-read; returns the
+        snapshot and whether anything changed.
+        """
         try:
             connection = self.db_connector.connect()
             try:
-                overview = {}
-                result = connection.execute(text("""
-                    SELECT table_schema, table_name, column_name, data_type
-                    FROM information_schema.columns
-                    WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
-                    ORDER BY table_schema, table_name, ordinal_position;
-                """))
-
-                for r in result:
-                    schema = r[0]  # table_schema
-                    table = r[1]   # table_name
-                    col = r[2]     # column_name
-                    dtype = r[3]   # data_type
-
-                    overview.setdefault(schema, {})
-                    overview[schema].setdefault(table, [])
-                    overview[schema][table].append({"column": col, "type": dtype})
-
-                return overview
+                markers = _markers(connection.execute(text(MARKERS_QUERY)))
+                if cached and cached.get("version") == catalog_fingerprint(markers):
+                    return cached, False
+
+                changed = _changed_oids(markers, cached)
+                rows = connection.execute(text(DETAILS_QUERY), {"oids": changed}) if changed else []
+                return _merge(markers, cached, rows), True
             finally:
                 connection.close()
         except Exception as e: 
             raise ValueError(f"Error occurred with exception: {e}")
 
+    def get_db_schema(self) -> Dict[str, Any]:
+        """Get database schema information"""
+        snapshot, _ = self.refresh_schema()
+        return snapshot["schema"]
+
+
+class async_fetch_db:
+    def __init__(self, db_connector: AsyncDBConnector):
+        self.db_connector = db_connector
 
+    async def refresh_schema(self, cached: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], bool]:
+        """Async variant of fetch_db.refresh_schema"""
+        try:
+            connection = await self.db_connector.connect()
+            try:
+                markers = _markers(await connection.execute(text(MARKERS_QUERY)))
+                if cached and cached.get("version") == catalog_fingerprint(markers):
+                    return cached, False
 
+                changed = _changed_oids(markers, cached)
+                rows = (await connection.execute(text(DETAILS_QUERY), {"oids": changed})).fetchall() if changed else []
+                return _merge(markers, cached, rows), True
+            finally:
+                await connection.close()
+        except Exception as e:
+            raise ValueError(f"Error occurred with exception: {e}")
 
+    async def get_db_schema(self) -> Dict[str, Any]:
+        """Get database schema information without blocking the event loop"""
+        snapshot, _ = await self.refresh_schema()
+        return snapshot["schema"]
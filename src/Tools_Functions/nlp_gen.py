@@ -1,10 +1,12 @@
 
 from langchain_core.output_parsers import StrOutputParser
 from src.LLM.groqllm import GroqLLM
+from src.LLM.gateway import Priority
+from src.Tools_Functions.schema_format import SCHEMA_FORMAT_HINT
 
 class nlp_chain: 
     def __init__(self):
-        self.llm = GroqLLM.get_llm()
+        self.llm = GroqLLM.get_llm(Priority.SQL)
         
 
     def get_sql_chain(self ):
@@ -22,11 +24,13 @@ class nlp_chain:
                  "4. If creating new tables, use the 'public' schema. "
                  "5. Only work with the tables and columns that exist in the provided schema. "
                  "6. Fetch the database only when it's needed, not for every question. Fetching should occur whenever a question follows a write operation. "
-                 "Database Schema: {db_schema}"),
+                 + SCHEMA_FORMAT_HINT + " "
+                 "Database Schema:\n{db_schema}"),
                 ("human", "Question: {question}")
             ])
         
-            sql_chain = prompt | self.llm | StrOutputParser() 
+            # Tagged so streaming clients can tell SQL tokens from answer tokens
+            sql_chain = (prompt | self.llm | StrOutputParser()).with_config(tags=["sql_generation"])
 
             return sql_chain
     
@@ -0,0 +1,77 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+MAX_CELL_CHARS = 200
+
+
+def _format_cell(value: Any, max_chars: int) -> str:
+    if value is None:
+        return "NULL"
+    cell = str(value).replace("\\", "\\\\").replace("|", "\\|").replace("\n", "\\n")
+    if len(cell) > max_chars:
+        cell = cell[:max_chars] + "..."
+    return cell
+
+
+class QueryResult:
+    """
+    Compact result of a SQL query.
+
+    Column names are stored once and rows as plain tuples, so the object costs
+    far less than a list of per-row dicts, and ``str()`` renders a pipe-separated
+    table that is much cheaper in LLM tokens than the dict repr.
+    """
+
+    __slots__ = ("columns", "rows", "truncated", "total_rows", "affected_rows")
+
+    def __init__(
+        self,
+        columns: Sequence[str] = (),
+        rows: Optional[List[Tuple[Any, ...]]] = None,
+        truncated: bool = False,
+        total_rows: Optional[int] = None,
+        affected_rows: Optional[int] = None,
+    ):
+        self.columns = tuple(columns)
+        self.rows = rows if rows is not None else []
+        self.truncated = truncated
+        # Exact when the result was not truncated, the planner estimate otherwise
+        self.total_rows = total_rows if total_rows is not None or truncated else len(self.rows)
+        self.affected_rows = affected_rows
+
+    @property
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    @property
+    def is_write(self) -> bool:
+        return self.affected_rows is not None
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Legacy list-of-dicts representation"""
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+    def to_text(self, max_cell_chars: int = MAX_CELL_CHARS) -> str:
+        """Token-efficient table: header once, one pipe-separated line per row"""
+        if self.is_write:
+            return f"affected_rows: {self.affected_rows}\nQuery executed successfully"
+        if not self.columns:
+            return "(0 rows)"
+
+        lines = ["|".join(_format_cell(c, max_cell_chars) for c in self.columns)]
+        lines.extend("|".join(_format_cell(v, max_cell_chars) for v in row) for row in self.rows)
+        if self.truncated:
+            total = f"~{self.total_rows}" if self.total_rows is not None else "unknown"
+            lines.append(f"(showing {self.row_count} of {total} rows, truncated)")
+        else:
+            lines.append(f"({self.row_count} rows)")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.to_text()
+
+    def __repr__(self) -> str:
+        return f"QueryResult(columns={self.columns!r}, rows={self.row_count}, truncated={self.truncated})"
+
+    def __len__(self) -> int:
+        return self.row_count
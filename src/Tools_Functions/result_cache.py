@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.redis_client import redis_client, async_redis_client
+from src.redis_keys import app_key
+from src.Tools_Functions.query_result import QueryResult
+from src.Tools_Functions.sql_analysis import is_deterministic, normalize_sql, referenced_tables
+
+
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "300"))
+
+
+def _encode(result: QueryResult) -> bytes:
+    payload = {
+        "columns": list(result.columns),
+        "rows": result.rows,
+        "truncated": result.truncated,
+        "total_rows": result.total_rows,
+    }
+    return zlib.compress(json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def _decode(blob: bytes) -> QueryResult:
+    payload = json.loads(zlib.decompress(blob))
+    return QueryResult(
+        payload["columns"],
+        [tuple(row) for row in payload["rows"]],
+        truncated=payload["truncated"],
+        total_rows=payload["total_rows"],
+    )
+
+
+class ResultCache:
+    """
+    Redis cache of read-query results keyed on normalized SQL and connection.
+
+    Every cached entry is indexed under the tables it reads, so a write that
+    touches a table drops exactly the results that may now be stale. Writes
+    whose tables cannot be determined drop everything cached for the database.
+    The ``a``-prefixed methods do the same through the asyncio client.
+    """
+
+    def __init__(self, redis_client, async_redis_client=None, ttl: int = RESULT_CACHE_TTL, prefix: str = app_key("resultcache")):
+        self.redis_client = redis_client
+        self.async_redis_client = async_redis_client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats_key = f"{prefix}:stats"
+
+    def _key(self, connection_fp: str, query: str) -> str:
+        digest = hashlib.sha256(normalize_sql(query).encode("utf-8")).hexdigest()[:32]
+        return f"{self.prefix}:{connection_fp}:{digest}"
+
+    def _table_key(self, connection_fp: str, table: str) -> str:
+        return f"{self.prefix}:{connection_fp}:table:{table}"
+
+    def _all_key(self, connection_fp: str) -> str:
+        return f"{self.prefix}:{connection_fp}:all"
+
+    def _read_index_keys(self, connection_fp: str, tables: Iterable[str]) -> List[str]:
+        """Indexes a cached result is listed in: the database's and one per table read"""
+        return [self._all_key(connection_fp)] + [self._table_key(connection_fp, t) for t in tables]
+
+    def _write_index_keys(self, connection_fp: str, query: str) -> List[str]:
+        """Indexes a write invalidates: its tables, or the whole database when they are unknown"""
+        tables = referenced_tables(query)
+        if not tables:
+            return [self._all_key(connection_fp)]
+        return [self._table_key(connection_fp, t) for t in tables]
+
+    def get(self, connection_fp: str, query: str) -> Optional[QueryResult]:
+        """Cached result of a read query, counting the hit or miss"""
+        blob = self.redis_client.get_bytes(self._key(connection_fp, query))
+        if blob:
+            try:
+                result = _decode(blob)
+                self.redis_client.hincrby(self.stats_key, "hits")
+                return result
+            except (zlib.error, ValueError, KeyError):
+                pass
+        self.redis_client.hincrby(self.stats_key, "misses")
+        return None
+
+    def set(self, connection_fp: str, query: str, result: QueryResult) -> bool:
+        """Cache a read result under every table it references"""
+        tables = referenced_tables(query)
+        if not tables or not is_deterministic(query):
+            return False
+
+        key = self._key(connection_fp, query)
+        if not self.redis_client.set_bytes(key, _encode(result), ex=self.ttl):
+            return False
+        try:
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                for index_key in self._read_index_keys(connection_fp, tables):
+                    pipe.sadd(index_key, key)
+                    pipe.expire(index_key, self.ttl)
+        except Exception as e:
+            # Unindexed entries could outlive a write, so do not leave them behind
+            print(f"Result cache index update failed: {e}")
+            self.redis_client.delete(key)
+            return False
+        return True
+
+    def _drop(self, index_keys: Iterable[str]) -> int:
+        index_keys = list(index_keys)
+        keys = set()
+        for index_key in index_keys:
+            keys.update(self.redis_client.smembers(index_key))
+        if not keys and not index_keys:
+            return 0
+        self.redis_client.hincrby(self.stats_key, "invalidations")
+        return self.redis_client.delete(*keys, *index_keys)
+
+    def invalidate_for_write(self, connection_fp: str, query: str) -> int:
+        """Drop cached results for the tables a write statement touches"""
+        return self._drop(self._write_index_keys(connection_fp, query))
+
+    def invalidate_connection(self, connection_fp: str) -> int:
+        """Drop every cached result for a database"""
+        return self._drop([self._all_key(connection_fp)])
+
+    async def aget(self, connection_fp: str, query: str) -> Optional[QueryResult]:
+        """Async variant of get"""
+        blob = await self.async_redis_client.get_bytes(self._key(connection_fp, query))
+        if blob:
+            try:
+                result = _decode(blob)
+                await self.async_redis_client.hincrby(self.stats_key, "hits")
+                return result
+            except (zlib.error, ValueError, KeyError):
+                pass
+        await self.async_redis_client.hincrby(self.stats_key, "misses")
+        return None
+
+    async def aset(self, connection_fp: str, query: str, result: QueryResult) -> bool:
+        """Async variant of set"""
+        tables = referenced_tables(query)
+        if not tables or not is_deterministic(query):
+            return False
+
+        key = self._key(connection_fp, query)
+        if not await self.async_redis_client.set_bytes(key, _encode(result), ex=self.ttl):
+            return False
+        try:
+            async with self.async_redis_client.pipeline(transaction=False) as pipe:
+                for index_key in self._read_index_keys(connection_fp, tables):
+                    pipe.sadd(index_key, key)
+                    pipe.expire(index_key, self.ttl)
+        except Exception as e:
+            print(f"Result cache index update failed: {e}")
+            await self.async_redis_client.delete(key)
+            return False
+        return True
+
+    async def _adrop(self, index_keys: Iterable[str]) -> int:
+        index_keys = list(index_keys)
+        keys = set()
+        for index_key in index_keys:
+            keys.update(await self.async_redis_client.smembers(index_key))
+        if not keys and not index_keys:
+            return 0
+        await self.async_redis_client.hincrby(self.stats_key, "invalidations")
+        return await self.async_redis_client.delete(*keys, *index_keys)
+
+    async def ainvalidate_for_write(self, connection_fp: str, query: str) -> int:
+        """Async variant of invalidate_for_write"""
+        return await self._adrop(self._write_index_keys(connection_fp, query))
+
+    async def ainvalidate_connection(self, connection_fp: str) -> int:
+        """Async variant of invalidate_connection"""
+        return await self._adrop([self._all_key(connection_fp)])
+
+    def stats(self) -> Dict[str, Any]:
+        counters = self.redis_client.hgetall(self.stats_key)
+        hits = int(counters.get("hits") or 0)
+        misses = int(counters.get("misses") or 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "invalidations": int(counters.get("invalidations") or 0),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+result_cache = ResultCache(redis_client, async_redis_client) if RESULT_CACHE_ENABLED else None
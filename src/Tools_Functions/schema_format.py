@@ -0,0 +1,103 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from src.Tools_Functions.fetch_db import table_columns, table_foreign_keys
+
+
+SCHEMA_FORMAT_HINT = (
+    "Schema format: one line per table as schema.table(column type, ...); "
+    "PK marks primary key columns and FK>schema.table.column marks foreign keys."
+)
+
+TYPE_ABBREVIATIONS = [
+    ("character varying", "varchar"),
+    ("character", "char"),
+    ("timestamp with time zone", "timestamptz"),
+    ("timestamp without time zone", "timestamp"),
+    ("time with time zone", "timetz"),
+    ("time without time zone", "time"),
+    ("double precision", "float8"),
+    ("integer", "int"),
+    ("boolean", "bool"),
+    ("USER-DEFINED", "enum"),
+]
+_ARRAY = re.compile(r"^ARRAY$", re.IGNORECASE)
+
+
+def abbreviate_type(data_type: str) -> str:
+    """Short spelling of a Postgres type, keeping modifiers like (255)"""
+    for long_name, short_name in TYPE_ABBREVIATIONS:
+        if data_type.startswith(long_name):
+            return short_name + data_type[len(long_name):]
+    return "array" if _ARRAY.match(data_type) else data_type
+
+
+def render_table(schema: str, table: str, details: Any) -> str:
+    """schema.table(col type PK, col type FK>schema.table.col, ...)"""
+    primary_key = set(details.get("primary_key") or []) if isinstance(details, dict) else set()
+    references = {}
+    composite = []
+    for fk in table_foreign_keys(details):
+        columns = fk.get("columns") or []
+        referenced = fk.get("referenced_columns") or []
+        if len(columns) == 1 and len(referenced) == 1:
+            references[columns[0]] = f"{fk['references']}.{referenced[0]}"
+        else:
+            composite.append(f"FK({','.join(columns)})>{fk['references']}({','.join(referenced)})")
+
+    parts = []
+    for column in table_columns(details):
+        name = column["column"]
+        part = f"{name} {abbreviate_type(column['type'])}"
+        if name in primary_key:
+            part += " PK"
+        if name in references:
+            part += f" FK>{references[name]}"
+        parts.append(part)
+    return f"{schema}.{table}({', '.join(parts + composite)})"
+
+
+class SchemaRenderer:
+    """Renders schemas compactly, caching each table's line per schema fingerprint"""
+
+    def __init__(self, max_schemas: int = 32):
+        self.max_schemas = max_schemas
+        self._lines: "OrderedDict[str, Dict[Tuple[str, str], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, db_schema: Any, fingerprint: str = None) -> str:
+        """Deterministic text for a full or pruned schema dict"""
+        if not isinstance(db_schema, dict):
+            return str(db_schema)
+
+        with self._lock:
+            lines = self._lines.get(fingerprint) if fingerprint else None
+            if lines is None:
+                lines = {}
+                if fingerprint:
+                    self._lines[fingerprint] = lines
+                    if len(self._lines) > self.max_schemas:
+                        self._lines.popitem(last=False)
+            elif fingerprint:
+                self._lines.move_to_end(fingerprint)
+
+        output = []
+        for schema in sorted(db_schema):
+            for table in sorted(db_schema[schema]):
+                key = (schema, table)
+                line = lines.get(key)
+                if line is None:
+                    line = render_table(schema, table, db_schema[schema][table])
+                    lines[key] = line
+                output.append(line)
+        return "\n".join(output)
+
+
+schema_renderer = SchemaRenderer()
+
+
+def render_schema(db_schema: Any, fingerprint: str = None) -> str:
+    """Compact, cached rendering of a schema for prompts and tool output"""
+    return schema_renderer.render(db_schema, fingerprint)
@@ -0,0 +1,152 @@
+import math
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.Tools_Functions.fetch_db import table_columns, table_foreign_keys
+
+
+SCHEMA_PRUNE_MIN_TABLES = int(os.getenv("SCHEMA_PRUNE_MIN_TABLES", "40"))
+SCHEMA_PRUNE_TOP_K = int(os.getenv("SCHEMA_PRUNE_TOP_K", "8"))
+SCHEMA_PRUNE_MAX_TABLES = int(os.getenv("SCHEMA_PRUNE_MAX_TABLES", "24"))
+SCHEMA_PRUNE_LEXICAL_WEIGHT = float(os.getenv("SCHEMA_PRUNE_LEXICAL_WEIGHT", "0.5"))
+SCHEMA_PRUNE_EMBEDDINGS = os.getenv("SCHEMA_PRUNE_EMBEDDINGS", "true").lower() == "true"
+
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_WORD = re.compile(r"[A-Za-z0-9]+")
+
+TableKey = Tuple[str, str]
+
+
+def _tokens(text: str) -> List[str]:
+    """Lower-case word pieces of identifiers and prose, crudely singularised"""
+    tokens = []
+    for word in _WORD.findall(_CAMEL.sub(" ", text.replace("_", " "))):
+        word = word.lower()
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+class SchemaIndex:
+    """Lexical (BM25) and embedding index over the tables of one schema"""
+
+    def __init__(self, db_schema: Dict[str, Any], embed_fn: Optional[Callable] = None):
+        self.keys: List[TableKey] = []
+        self.neighbours: Dict[TableKey, set] = {}
+        documents = []
+        texts = []
+        for schema, tables in db_schema.items():
+            for table, details in tables.items():
+                key = (schema, table)
+                columns = [c["column"] for c in table_columns(details)]
+                self.keys.append(key)
+                # Table name tokens count twice: they are the strongest signal
+                documents.append(Counter(_tokens(table) * 2 + _tokens(" ".join(columns))))
+                texts.append(f"{table.replace('_', ' ')}: {', '.join(c.replace('_', ' ') for c in columns)}")
+                for fk in table_foreign_keys(details):
+                    ref_schema, _, ref_table = fk.get("references", "").rpartition(".")
+                    ref = (ref_schema or schema, ref_table)
+                    self.neighbours.setdefault(key, set()).add(ref)
+                    self.neighbours.setdefault(ref, set()).add(key)
+
+        self.doc_lengths = np.array([sum(d.values()) for d in documents], dtype=np.float32)
+        self.avg_length = float(self.doc_lengths.mean()) if documents else 0.0
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        for i, doc in enumerate(documents):
+            for token, tf in doc.items():
+                self.postings.setdefault(token, []).append((i, tf))
+        n = len(documents)
+        self.idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self.postings.items()}
+        self.embeddings = embed_fn(texts) if embed_fn is not None and texts else None
+        self.embed_fn = embed_fn
+
+    def _lexical(self, question: str) -> np.ndarray:
+        k1, b = 1.2, 0.75
+        scores = np.zeros(len(self.keys), dtype=np.float32)
+        for token in set(_tokens(question)):
+            idf = self.idf.get(token, 0.0)
+            for i, tf in self.postings.get(token, ()):
+                norm = k1 * (1 - b + b * self.doc_lengths[i] / self.avg_length)
+                scores[i] += idf * tf * (k1 + 1) / (tf + norm)
+        top = scores.max() if len(scores) else 0.0
+        return scores / top if top > 0 else scores
+
+    def scores(self, question: str, lexical_weight: float = SCHEMA_PRUNE_LEXICAL_WEIGHT) -> np.ndarray:
+        lexical = self._lexical(question)
+        if self.embeddings is None:
+            return lexical
+        semantic = self.embeddings @ self.embed_fn([question])[0]
+        return lexical_weight * lexical + (1 - lexical_weight) * semantic
+
+    def select(self, question: str, top_k: int = SCHEMA_PRUNE_TOP_K, max_tables: int = SCHEMA_PRUNE_MAX_TABLES) -> List[TableKey]:
+        """Top-k tables for the question plus their foreign-key neighbours"""
+        scores = self.scores(question)
+        ranked = [self.keys[i] for i in np.argsort(-scores)]
+        rank = {key: i for i, key in enumerate(ranked)}
+        selected = ranked[:top_k]
+        chosen = set(selected)
+        neighbours = sorted(
+            {n for key in selected for n in self.neighbours.get(key, ()) if n in rank and n not in chosen},
+            key=rank.get,
+        )
+        return selected + neighbours[: max(0, max_tables - len(selected))]
+
+
+class SchemaRetriever:
+    """Prunes large schemas to the tables relevant to a question, one index per fingerprint"""
+
+    def __init__(
+        self,
+        min_tables: int = SCHEMA_PRUNE_MIN_TABLES,
+        top_k: int = SCHEMA_PRUNE_TOP_K,
+        use_embeddings: bool = SCHEMA_PRUNE_EMBEDDINGS,
+        max_indexes: int = 16,
+    ):
+        self.min_tables = min_tables
+        self.top_k = top_k
+        self.use_embeddings = use_embeddings
+        self.max_indexes = max_indexes
+        self._indexes: "OrderedDict[str, SchemaIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _index(self, db_schema: Dict[str, Any], fingerprint: str) -> SchemaIndex:
+        with self._lock:
+            index = self._indexes.get(fingerprint)
+            if index is not None:
+                self._indexes.move_to_end(fingerprint)
+                return index
+
+        embed_fn = None
+        if self.use_embeddings:
+            from src.Tools_Functions.embeddings import embed as embed_fn
+        index = SchemaIndex(db_schema, embed_fn)
+
+        with self._lock:
+            self._indexes[fingerprint] = index
+            if len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+        return index
+
+    def prune(self, db_schema: Any, fingerprint: str, question: str) -> Any:
+        """Subset of the schema worth showing the LLM for this question"""
+        if not isinstance(db_schema, dict):
+            return db_schema
+        table_count = sum(len(tables) for tables in db_schema.values())
+        if table_count < self.min_tables:
+            return db_schema
+
+        pruned = {}
+        for schema, table in self._index(db_schema, fingerprint).select(question, self.top_k):
+            details = db_schema.get(schema, {}).get(table)
+            if details is not None:
+                pruned.setdefault(schema, {})[table] = details
+        return pruned
+
+
+schema_retriever = SchemaRetriever()
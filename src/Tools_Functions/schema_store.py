@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import ormsgpack
+
+from src.redis_client import redis_client, async_redis_client
+from src.redis_keys import app_key
+
+
+SCHEMA_STORE_TTL = int(os.getenv("SCHEMA_STORE_TTL", "86400"))
+SCHEMA_MEMO_ENTRIES = int(os.getenv("SCHEMA_MEMO_ENTRIES", "16"))
+# A memo hit renews the Redis copy's TTL at most this often
+SCHEMA_TTL_REFRESH = int(os.getenv("SCHEMA_TTL_REFRESH", "300"))
+
+
+def encode(value: Any) -> bytes:
+    """msgpack, then zlib: several times smaller than JSON and much cheaper to decode"""
+    return zlib.compress(ormsgpack.packb(value), 6)
+
+
+def decode(blob: bytes) -> Any:
+    return ormsgpack.unpackb(zlib.decompress(blob))
+
+
+class SchemaStore:
+    """
+    Content-addressed store for schema blobs.
+
+    Values live in Redis as compressed msgpack under ``{app prefix}:{namespace}:{digest}``,
+    where the digest is the schema fingerprint (or the catalog version for
+    markers), so sessions on identical databases share one copy. The
+    uncompressed msgpack is memoized in process per digest and unpacked on
+    every read, so each caller gets its own copy it may modify. A digest never
+    changes meaning, so the memo needs no invalidation, only an LRU bound;
+    hits renew the Redis TTL every ``ttl_refresh`` seconds so a schema in use
+    does not expire there.
+    """
+
+    def __init__(self, redis_client, async_redis_client=None, ttl: int = SCHEMA_STORE_TTL,
+                 memo_entries: int = SCHEMA_MEMO_ENTRIES, ttl_refresh: int = SCHEMA_TTL_REFRESH):
+        self.redis_client = redis_client
+        self.async_redis_client = async_redis_client
+        self.ttl = ttl
+        self.memo_entries = memo_entries
+        self.ttl_refresh = ttl_refresh
+        # key -> [msgpack bytes, monotonic time the Redis TTL was last renewed]
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(namespace: str, digest: str) -> str:
+        return app_key(namespace, digest)
+
+    def _remember(self, key: str, packed: bytes):
+        with self._lock:
+            self._memo[key] = [packed, time.monotonic()]
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.memo_entries:
+                self._memo.popitem(last=False)
+
+    def _memoized(self, key: str) -> Tuple[Optional[bytes], bool]:
+        """(memoized msgpack or None, whether this hit is due to renew the Redis TTL)"""
+        with self._lock:
+            entry = self._memo.get(key)
+            if entry is None:
+                return None, False
+            self._memo.move_to_end(key)
+            now = time.monotonic()
+            renew = now - entry[1] >= self.ttl_refresh
+            if renew:
+                entry[1] = now
+            return entry[0], renew
+
+    def put(self, namespace: str, digest: str, value: Any) -> bool:
+        """Store a value under its digest and refresh the TTL"""
+        key = self._key(namespace, digest)
+        packed = ormsgpack.packb(value)
+        self._remember(key, packed)
+        return bool(self.redis_client.set_bytes(key, zlib.compress(packed, 6), ex=self.ttl))
+
+    def get(self, namespace: str, digest: str) -> Optional[Any]:
+        """Decoded value for a digest, or None if Redis no longer has it"""
+        key = self._key(namespace, digest)
+        packed, renew = self._memoized(key)
+        if packed is None:
+            blob = self.redis_client.get_bytes(key)
+            if not blob:
+                return None
+            packed = zlib.decompress(blob)
+            self._remember(key, packed)
+        elif renew and not self.redis_client.expire(key, self.ttl):
+            # Gone from Redis (or unreachable): store it again from the memo
+            self.redis_client.set_bytes(key, zlib.compress(packed, 6), ex=self.ttl)
+        return ormsgpack.unpackb(packed)
+
+    async def aput(self, namespace: str, digest: str, value: Any) -> bool:
+        """Async variant of put"""
+        key = self._key(namespace, digest)
+        packed = ormsgpack.packb(value)
+        self._remember(key, packed)
+        return bool(await self.async_redis_client.set_bytes(key, zlib.compress(packed, 6), ex=self.ttl))
+
+    async def aget(self, namespace: str, digest: str) -> Optional[Any]:
+        """Async variant of get"""
+        key = self._key(namespace, digest)
+        packed, renew = self._memoized(key)
+        if packed is None:
+            blob = await self.async_redis_client.get_bytes(key)
+            if not blob:
+                return None
+            packed = zlib.decompress(blob)
+            self._remember(key, packed)
+        elif renew and not await self.async_redis_client.expire(key, self.ttl):
+            await self.async_redis_client.set_bytes(key, zlib.compress(packed, 6), ex=self.ttl)
+        return ormsgpack.unpackb(packed)
+
+
+schema_store = SchemaStore(redis_client, async_redis_client)
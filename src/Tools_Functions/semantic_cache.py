@@ -0,0 +1,208 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from src.Tools_Functions.sql_cache import normalize_question
+
+
+# Off until benchmarks/eval_semantic_cache.py has been run against real questions
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "512"))
+SEMANTIC_CACHE_MAX_SCHEMAS = int(os.getenv("SEMANTIC_CACHE_MAX_SCHEMAS", "64"))
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_WORD = re.compile(r"[a-z]+")
+_QUOTED = re.compile(r"\"([^\"]+)\"|'([^']+)'|`([^`]+)`")
+_CAPITALIZED = re.compile(r"(?<![.?!]\s)(?<!^)\b[A-Z][\w-]*")
+_UNITS = {
+    word: value for value, word in enumerate(
+        "zero one two three four five six seven eight nine ten eleven twelve thirteen "
+        "fourteen fifteen sixteen seventeen eighteen nineteen".split()
+    )
+}
+_TENS = {word: value * 10 for value, word in enumerate("twenty thirty forty fifty sixty seventy eighty ninety".split(), 2)}
+_SCALES = {"hundred": 100, "thousand": 1000, "million": 1000000}
+_INITIAL_CAPACITY = 16
+
+
+def _numbers(question: str) -> frozenset:
+    """Numbers a question mentions, in digits or words ("five" and "5" are the same)"""
+    # "top 5" and "top 10" embed almost identically but need different SQL
+    text = question.lower()
+    found = set(_NUMBER.findall(text))
+    value, last = None, None
+    for word in _WORD.findall(text):
+        if word in _UNITS and last == "tens":
+            value, last = value + _UNITS[word], "unit"
+            continue
+        if word in _SCALES and value is not None:
+            value, last = value * _SCALES[word], "scale"
+            continue
+        if value is not None:
+            found.add(str(value))
+            value, last = None, None
+        if word in _UNITS:
+            value, last = _UNITS[word], "unit"
+        elif word in _TENS:
+            value, last = _TENS[word], "tens"
+    if value is not None:
+        found.add(str(value))
+    return frozenset(found)
+
+
+def _literals(question: str) -> frozenset:
+    """Numbers, quoted strings and capitalised names a question mentions"""
+    # "orders by Alice" and "orders by Bob" embed almost identically but need different SQL
+    quoted = {next(filter(None, groups)).lower() for groups in _QUOTED.findall(question)}
+    names = {word.lower() for word in _CAPITALIZED.findall(_QUOTED.sub(" ", question.strip())) if word != "I"}
+    return _numbers(question) | quoted | names
+
+
+class _SchemaIndex:
+    """Embeddings and SQL for one schema fingerprint in a float32 matrix grown up to ``capacity`` rows"""
+
+    __slots__ = ("vectors", "sqls", "literals", "last_used", "size", "capacity")
+
+    def __init__(self, dim: int, capacity: int):
+        self.capacity = capacity
+        initial = min(capacity, _INITIAL_CAPACITY)
+        self.vectors = np.zeros((initial, dim), dtype=np.float32)
+        self.sqls = []
+        self.literals = []
+        self.last_used = np.zeros(initial, dtype=np.float64)
+        self.size = 0
+
+    def _grow(self):
+        rows = min(self.capacity, len(self.vectors) * 2)
+        vectors = np.zeros((rows, self.vectors.shape[1]), dtype=np.float32)
+        vectors[: self.size] = self.vectors[: self.size]
+        last_used = np.zeros(rows, dtype=np.float64)
+        last_used[: self.size] = self.last_used[: self.size]
+        self.vectors, self.last_used = vectors, last_used
+
+    def best_match(self, vector: np.ndarray):
+        if self.size == 0:
+            return -1, 0.0
+        scores = self.vectors[: self.size] @ vector
+        idx = int(np.argmax(scores))
+        return idx, float(scores[idx])
+
+    def add(self, vector: np.ndarray, sql: str, literals: frozenset):
+        if self.size < self.capacity:
+            if self.size == len(self.vectors):
+                self._grow()
+            idx = self.size
+            self.size += 1
+            self.sqls.append(sql)
+            self.literals.append(literals)
+        else:
+            # Full: overwrite the least recently used entry
+            idx = int(np.argmin(self.last_used))
+            self.sqls[idx] = sql
+            self.literals[idx] = literals
+        self.vectors[idx] = vector
+        self.last_used[idx] = time.monotonic()
+
+
+class SemanticSQLCache:
+    """
+    In-process nearest-neighbour cache of question embeddings -> generated SQL.
+
+    Each schema fingerprint gets its own bounded index; a question reuses the
+    stored SQL when its cosine similarity to a cached question is at least
+    ``threshold`` and both mention the same numbers, quoted values and names.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Optional[Callable] = None,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        max_schemas: int = SEMANTIC_CACHE_MAX_SCHEMAS,
+    ):
+        if embed_fn is None:
+            from src.Tools_Functions.embeddings import embed as embed_fn
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_schemas = max_schemas
+        self._indexes: "OrderedDict[str, _SchemaIndex]" = OrderedDict()
+        self._recent_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.lookup_seconds = 0.0
+        self.max_lookup_seconds = 0.0
+
+    def _vector(self, question: str) -> np.ndarray:
+        key = normalize_question(question)
+        with self._lock:
+            vector = self._recent_vectors.get(key)
+        if vector is None:
+            vector = self.embed_fn([key])[0]
+            with self._lock:
+                self._recent_vectors[key] = vector
+                if len(self._recent_vectors) > 256:
+                    self._recent_vectors.popitem(last=False)
+        return vector
+
+    def get(self, question: str, fingerprint: str) -> Optional[str]:
+        """SQL stored for a sufficiently similar question on the same schema"""
+        start = time.perf_counter()
+        vector = self._vector(question)
+        sql = None
+        with self._lock:
+            index = self._indexes.get(fingerprint)
+            if index is not None:
+                self._indexes.move_to_end(fingerprint)
+                idx, score = index.best_match(vector)
+                if idx >= 0 and score >= self.threshold and index.literals[idx] == _literals(question):
+                    index.last_used[idx] = time.monotonic()
+                    sql = index.sqls[idx]
+
+            elapsed = time.perf_counter() - start
+            self.lookup_seconds += elapsed
+            self.max_lookup_seconds = max(self.max_lookup_seconds, elapsed)
+            if sql is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return sql
+
+    def set(self, question: str, fingerprint: str, sql: str):
+        """Remember the SQL generated for a question on a schema"""
+        vector = self._vector(question)
+        with self._lock:
+            index = self._indexes.get(fingerprint)
+            if index is None:
+                index = _SchemaIndex(vector.shape[0], self.max_entries)
+                self._indexes[fingerprint] = index
+                if len(self._indexes) > self.max_schemas:
+                    self._indexes.popitem(last=False)
+            self._indexes.move_to_end(fingerprint)
+            index.add(vector, sql, _literals(question))
+
+    def invalidate(self, fingerprint: str):
+        """Forget every question cached for a schema fingerprint"""
+        with self._lock:
+            self._indexes.pop(fingerprint, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and lookup latency for this process"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "avg_lookup_ms": self.lookup_seconds / lookups * 1000 if lookups else 0.0,
+                "max_lookup_ms": self.max_lookup_seconds * 1000,
+                "schemas": len(self._indexes),
+                "entries": sum(index.size for index in self._indexes.values()),
+            }
@@ -0,0 +1,113 @@
+import re
+from typing import Set
+
+import sqlparse
+from sqlparse.tokens import Comment
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_WRITE_KEYWORDS = frozenset({
+    "INSERT", "UPDATE", "DELETE", "MERGE", "TRUNCATE", "ALTER", "DROP", "CREATE",
+    "GRANT", "REVOKE", "COPY", "VACUUM", "REINDEX", "CLUSTER",
+    # SELECT ... INTO new_table creates a table
+    "INTO",
+})
+# Row-locking clauses of a SELECT, as sequences of keyword tokens
+_LOCK_CLAUSES = (("FOR", "UPDATE"), ("FOR", "NO", "KEY", "UPDATE"), ("FOR", "SHARE"), ("FOR", "KEY", "SHARE"))
+_VOLATILE = re.compile(
+    r"\b(now|random|current_date|current_time|current_timestamp|clock_timestamp|statement_timestamp|"
+    r"localtime|localtimestamp|nextval|setval|currval|gen_random_uuid|uuid_generate_v4|pg_sleep|txid_current)\b",
+    re.IGNORECASE,
+)
+
+_IDENT = r'(?:"[^"]+"|[A-Za-z_][\w$]*)'
+_TABLE_REF = rf"{_IDENT}(?:\s*\.\s*{_IDENT})?"
+_ALIAS = r"(?:\s+(?:AS\s+)?[A-Za-z_][\w$]*)?"
+_SINGLE_TABLE = re.compile(
+    rf"\b(?:JOIN|INTO|UPDATE|TABLE|TRUNCATE|ONLY)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?({_TABLE_REF})",
+    re.IGNORECASE,
+)
+_FROM_LIST = re.compile(rf"\bFROM\s+({_TABLE_REF}{_ALIAS}(?:\s*,\s*{_TABLE_REF}{_ALIAS})*)", re.IGNORECASE)
+_LEADING_REF = re.compile(_TABLE_REF)
+
+
+def _statements(query: str):
+    return [s for s in sqlparse.parse(query) if str(s).strip()]
+
+
+def _without_literals(query: str) -> str:
+    return _STRING_LITERAL.sub("''", sqlparse.format(query, strip_comments=True))
+
+
+def _keywords(statement) -> list:
+    """Upper-case keyword tokens of a statement; names, quoted identifiers and literals are skipped"""
+    return [token.normalized for token in statement.flatten() if token.is_keyword]
+
+
+def _strip_lock_clauses(keywords: list) -> list:
+    remaining, i = [], 0
+    while i < len(keywords):
+        clause = next((c for c in _LOCK_CLAUSES if tuple(keywords[i:i + len(c)]) == c), None)
+        if clause:
+            i += len(clause)
+        else:
+            remaining.append(keywords[i])
+            i += 1
+    return remaining
+
+
+def normalize_sql(query: str) -> str:
+    """Canonical text of a query: no comments, upper-case keywords, single spaces between tokens"""
+    parts = []
+    for statement in sqlparse.parse(query):
+        for token in statement.flatten():
+            if token.is_whitespace or token.ttype in Comment:
+                if parts and parts[-1] != " ":
+                    parts.append(" ")
+            else:
+                # Literals and quoted identifiers are kept byte for byte
+                parts.append(token.normalized if token.is_keyword else token.value)
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def is_read_query(query: str) -> bool:
+    """True for a single SELECT statement (including CTEs and locking reads) that modifies nothing"""
+    statements = _statements(query)
+    if len(statements) != 1 or statements[0].get_type() != "SELECT":
+        return False
+    # Data-modifying CTEs and SELECT ... INTO still report as SELECT; FOR UPDATE/SHARE only locks rows
+    return _WRITE_KEYWORDS.isdisjoint(_strip_lock_clauses(_keywords(statements[0])))
+
+
+def is_locking_read(query: str) -> bool:
+    """True for SELECT ... FOR UPDATE/SHARE, whose results must not come from a cache"""
+    for statement in _statements(query):
+        keywords = _keywords(statement)
+        if len(_strip_lock_clauses(keywords)) != len(keywords):
+            return True
+    return False
+
+
+def is_deterministic(query: str) -> bool:
+    """False when the result depends on the clock, sequences or randomness"""
+    return not _VOLATILE.search(_without_literals(query))
+
+
+def _bare_name(reference: str) -> str:
+    last = reference.split(".")[-1].strip()
+    if last.startswith('"'):
+        return last.strip('"')
+    return last.lower()
+
+
+def referenced_tables(query: str) -> Set[str]:
+    """Bare names of the tables a query reads from or writes to"""
+    text = _without_literals(query)
+    tables = {_bare_name(m.group(1)) for m in _SINGLE_TABLE.finditer(text)}
+    for match in _FROM_LIST.finditer(text):
+        for part in match.group(1).split(","):
+            ref = _LEADING_REF.match(part.strip())
+            if ref:
+                tables.add(_bare_name(ref.group(0)))
+    tables.discard("only")
+    return tables
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+
+import sqlparse
+
+from src.redis_keys import app_key
+
+SQL_CACHE_TTL = int(os.getenv("SQL_CACHE_TTL", "3600"))
+
+
+def normalize_question(question: str) -> str:
+    """Case/whitespace/trailing-punctuation insensitive form of a question"""
+    question = re.sub(r"\s+", " ", question.strip().lower())
+    return question.rstrip("?!. ")
+
+
+def looks_like_sql(text: str) -> bool:
+    """True when the LLM output parses as a recognised SQL statement"""
+    statements = [s for s in sqlparse.parse(text or "") if str(s).strip()]
+    return bool(statements) and statements[0].get_type() != "UNKNOWN"
+
+
+def schema_fingerprint(db_schema: Any) -> str:
+    """Content hash of a schema; identical databases share a fingerprint"""
+    if not isinstance(db_schema, str):
+        db_schema = json.dumps(db_schema, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(db_schema.encode("utf-8")).hexdigest()[:32]
+
+
+class SQLCache:
+    """
+    Redis cache of generated SQL keyed on (normalized question, schema fingerprint).
+
+    Entries for a fingerprint are indexed in a set so they can be dropped as
+    soon as a session sees its schema change; untouched entries expire by TTL.
+    """
+
+    def __init__(self, redis_client, ttl: int = SQL_CACHE_TTL, prefix: str = app_key("sqlcache")):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats_key = f"{prefix}:stats"
+
+    def _key(self, question: str, fingerprint: str) -> str:
+        digest = hashlib.sha256(normalize_question(question).encode("utf-8")).hexdigest()[:32]
+        return f"{self.prefix}:{fingerprint}:{digest}"
+
+    def _index_key(self, fingerprint: str) -> str:
+        return f"{self.prefix}:index:{fingerprint}"
+
+    def get(self, question: str, fingerprint: str) -> Optional[str]:
+        """Cached SQL for the question, counting the hit or miss"""
+        entry = self.redis_client.get(self._key(question, fingerprint))
+        if isinstance(entry, dict) and entry.get("sql"):
+            self.redis_client.hincrby(self.stats_key, "hits")
+            return entry["sql"]
+        self.redis_client.hincrby(self.stats_key, "misses")
+        return None
+
+    def set(self, question: str, fingerprint: str, sql: str) -> bool:
+        """Store generated SQL for the question under the schema fingerprint"""
+        if not looks_like_sql(sql):
+            # Clarification requests and other prose are not worth replaying
+            return False
+        key = self._key(question, fingerprint)
+        index_key = self._index_key(fingerprint)
+        try:
+            with self.redis_client.pipeline() as pipe:
+                pipe.set(key, json.dumps({"sql": sql, "question": question}), ex=self.ttl)
+                pipe.sadd(index_key, key)
+                pipe.expire(index_key, self.ttl)
+            return True
+        except Exception as e:
+            print(f"SQL cache store failed: {e}")
+            return False
+
+    def invalidate(self, fingerprint: str) -> int:
+        """Drop every entry generated against a schema fingerprint"""
+        index_key = self._index_key(fingerprint)
+        keys = list(self.redis_client.smembers(index_key))
+        self.redis_client.hincrby(self.stats_key, "invalidations")
+        return self.redis_client.delete(*keys, index_key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters shared by every worker"""
+        counters = self.redis_client.hgetall(self.stats_key)
+        hits = int(counters.get("hits") or 0)
+        misses = int(counters.get("misses") or 0)
+        invalidations = int(counters.get("invalidations") or 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "invalidations": invalidations,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
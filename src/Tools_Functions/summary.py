@@ -1,14 +1,16 @@
 from typing import List, Any, Union, Dict
 from langchain_core.output_parsers import StrOutputParser
 from src.LLM.groqllm import GroqLLM
+from src.LLM.gateway import Priority
+from src.Tools_Functions.query_result import QueryResult
 
 
 class SummaryGenerator:
     def __init__(self): 
-        self.llm = GroqLLM.get_llm()
+        self.llm = GroqLLM.get_llm(Priority.SUMMARY)
 
 
-    def generate_summary(self, question: str, query_result: Union[List[Dict[str, Any]], Dict[str, Any]]) -> str:
+    def get_summary_chain(self):
 
         try : 
             from langchain.prompts import ChatPromptTemplate
@@ -17,11 +19,33 @@ class SummaryGenerator:
                 ("user", "Given the question: {question} and the SQL query result: {query_result}, provide a brief summary.")
             ])
 
-            summary_chain = prompt | self.llm | StrOutputParser()
+            return (prompt | self.llm | StrOutputParser()).with_config(tags=["summary"])
+        
+        except Exception as e:  
+            raise ValueError(f"Error occurred with exception : {e}")
+
+
+    def generate_summary(self, question: str, query_result: Union[QueryResult, str]) -> str:
+
+        try : 
+            if isinstance(query_result, QueryResult):
+                query_result = query_result.to_text()
+            summary_chain = self.get_summary_chain()
             result = summary_chain.invoke({"question": question, "query_result": query_result})
 
             return result
         
         except Exception as e:  
             raise ValueError(f"Error occurred with exception : {e}")
-    
\ No newline at end of file
+
+
+    async def agenerate_summary(self, question: str, query_result: Union[QueryResult, str]) -> str:
+
+        try : 
+            if isinstance(query_result, QueryResult):
+                query_result = query_result.to_text()
+            summary_chain = self.get_summary_chain()
+            return await summary_chain.ainvoke({"question": question, "query_result": query_result})
+        
+        except Exception as e:  
+            raise ValueError(f"Error occurred with exception : {e}")
@@ -0,0 +1,18 @@
+import os
+from functools import lru_cache
+
+import tiktoken
+
+
+TOKEN_ENCODING = os.getenv("TOKEN_ENCODING", "cl100k_base")
+
+
+@lru_cache(maxsize=4)
+def get_encoding(name: str = TOKEN_ENCODING):
+    """Load a tiktoken encoding once per process"""
+    return tiktoken.get_encoding(name)
+
+
+def count_tokens(content: str, encoding: str = TOKEN_ENCODING) -> int:
+    """Number of tokens the text costs when sent to the LLM"""
+    return len(get_encoding(encoding).encode(content, disallowed_special=()))
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.redis_keys import session_key
+
+
+L1_CACHE_ENABLED = os.getenv("L1_CACHE_ENABLED", "true").lower() == "true"
+L1_CACHE_TTL = float(os.getenv("L1_CACHE_TTL", "30"))
+L1_CACHE_MAX_ENTRIES = int(os.getenv("L1_CACHE_MAX_ENTRIES", "256"))
+# Redis hashes mirrored in process memory
+L1_CACHE_PREFIXES = tuple(os.getenv("L1_CACHE_PREFIXES", session_key("")).split(","))
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Thread-safe TTL + LRU cache held in process memory.
+
+    The TTL bounds how long an entry can lag behind Redis if an invalidation
+    message is lost; explicit invalidation keeps it coherent otherwise.
+    """
+
+    def __init__(self, max_entries: int = L1_CACHE_MAX_ENTRIES, ttl: float = L1_CACHE_TTL,
+                 prefixes: Iterable[str] = L1_CACHE_PREFIXES):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prefixes = tuple(prefixes)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so a read that raced a write is not cached
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def caches(self, key: str) -> bool:
+        """Whether a Redis key is mirrored here"""
+        return key.startswith(self.prefixes)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None):
+        """Store a value; skipped if anything was invalidated since ``generation`` was read"""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: str):
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Every in-process cache kept coherent through the Redis invalidation channel
+_registry: List[LocalCache] = []
+
+
+def register(cache: LocalCache) -> LocalCache:
+    """Have Redis invalidations reach this cache as well"""
+    _registry.append(cache)
+    return cache
+
+
+def registered_caches() -> List[LocalCache]:
+    return list(_registry)
+
+
+def cached_keys(keys: Iterable[str]) -> List[str]:
+    """The keys some registered cache mirrors"""
+    return [key for key in keys if isinstance(key, str) and any(cache.caches(key) for cache in _registry)]
+
+
+def invalidate_everywhere(*keys: str):
+    for cache in _registry:
+        cache.invalidate(*keys)
+
+
+def clear_everywhere():
+    for cache in _registry:
+        cache.clear()
+
+
+local_cache: Optional[LocalCache] = register(LocalCache()) if L1_CACHE_ENABLED else None
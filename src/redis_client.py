@@ -1,16 +1,123 @@
 import redis
+import redis.asyncio
 import json
 import os
-from typing import Any, Optional
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Union
 import logging
 
+from src.local_cache import cached_keys, clear_everywhere, invalidate_everywhere, local_cache, registered_caches
+from src.redis_keys import app_key
+
 logger = logging.getLogger(__name__)
 
+# Writes to L1-cached keys are announced here so other workers drop their copies;
+# under the app prefix so deployments sharing a Redis do not clear each other's caches
+INVALIDATION_CHANNEL = app_key("l1", "invalidate")
+# Lets a worker skip its own announcements
+PROCESS_ID = uuid.uuid4().hex
+
+
+def invalidation_message(keys: List[str]) -> str:
+    return json.dumps({"origin": PROCESS_ID, "keys": keys})
+
+
+# Helpers shared by RedisClient and AsyncRedisClient, so both store and
+# invalidate exactly the same way
+
+def serialize(value: Any) -> str:
+    """Strings are stored as is, anything else as JSON"""
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def deserialize(value: Optional[str]) -> Optional[Any]:
+    """Inverse of serialize; text that is not JSON comes back unchanged"""
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def hash_fields(key: Optional[str], value: Any, mapping: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Serialized fields for HSET from a single key/value and/or a mapping"""
+    fields = {k: serialize(v) for k, v in (mapping or {}).items()}
+    if key is not None:
+        fields[key] = serialize(value)
+    return fields
+
+
+# Commands whose arguments are all keys, and those taking key/value pairs;
+# every other command names its key first
+_ALL_KEY_COMMANDS = frozenset({"DEL", "UNLINK", "TOUCH", "SINTERSTORE", "SUNIONSTORE", "SDIFFSTORE"})
+_PAIR_COMMANDS = frozenset({"MSET", "MSETNX"})
+_TWO_KEY_COMMANDS = frozenset({"RENAME", "RENAMENX", "COPY", "SMOVE", "LMOVE", "RPOPLPUSH"})
+
+
+def command_keys(args) -> List[str]:
+    """Keys named by one command, given as (name, *arguments)"""
+    command, arguments = str(args[0]).upper(), list(args[1:])
+    if command in _ALL_KEY_COMMANDS:
+        return arguments
+    if command in _PAIR_COMMANDS:
+        return arguments[::2]
+    if command in _TWO_KEY_COMMANDS:
+        return arguments[:2]
+    return arguments[:1]
+
+
+def touched_keys(pipe) -> List[str]:
+    """Keys named by the commands queued on a pipeline"""
+    return [key for args, _ in pipe.command_stack for key in command_keys(args)]
+
+
+def invalidate_locally(keys: Iterable[str]) -> List[str]:
+    """Drop written keys from this process's L1 caches; returns those other workers must drop too"""
+    keys = cached_keys(keys)
+    if keys:
+        invalidate_everywhere(*keys)
+    return keys
+
+
+def local_hash(name: str):
+    """(cached hash or None, generation to store a loaded copy under); generation is None if not cacheable"""
+    if local_cache is None or not local_cache.caches(name):
+        return None, None
+    return local_cache.get(name), local_cache.generation
+
+
+def remember_hash(name: str, raw: Dict[str, str], generation: int) -> Dict[str, Any]:
+    """Deserialize a hash read from Redis and keep it in the L1 cache"""
+    cached = {k: deserialize(v) for k, v in raw.items()}
+    local_cache.set(name, cached, generation)
+    return cached
+
+
 class RedisClient:
+    """
+    Thin wrapper over a pooled redis client.
+
+    Commands go straight to the pool: stale connections are re-checked by the
+    pool's health_check_interval and retried on timeout, so there is no PING
+    before each call. Only a client that never connected triggers a reconnect;
+    the first connection is made on first use (or by the app's lifespan), so
+    importing modules that hold the client never reaches Redis.
+
+    Hashes under the L1 prefixes (session records, including their schema) are
+    read whole into the in-process local_cache; writes to them invalidate it
+    here and, through pub/sub, in every other worker. The same channel serves
+    any other cache registered in src.local_cache.
+    """
+
     def __init__(self):
         self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self.redis_client = None
-        self._connect()
+        # Separate client without response decoding for compressed binary values
+        self.raw_client = None
+        self._invalidation_listener = None
     
     def _connect(self):
         """Connect to Redis with error handling"""
@@ -23,19 +130,32 @@ class RedisClient:
                 retry_on_timeout=True,
                 health_check_interval=30
             )
+            self.raw_client = redis.from_url(
+                self.redis_url,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                retry_on_timeout=True,
+                health_check_interval=30
+            )
             # Test connection
             self.redis_client.ping()
             logger.info("Redis connection established successfully")
+            self.start_invalidation_listener()
         except redis.ConnectionError as e:
             logger.error(f"Failed to connect to Redis: {e}")
             self.redis_client = None
+            self.raw_client = None
         except Exception as e:
             logger.error(f"Unexpected Redis error: {e}")
             self.redis_client = None
+            self.raw_client = None
     
     def is_connected(self) -> bool:
-        """Check if Redis is connected"""
+        """Check if Redis is connected, connecting on first use"""
         try:
+            if self.redis_client is None:
+                self.reconnect()
             if self.redis_client:
                 self.redis_client.ping()
                 return True
@@ -47,15 +167,69 @@ class RedisClient:
         """Attempt to reconnect to Redis"""
         self._connect()
     
+    def start_invalidation_listener(self):
+        """Subscribe to L1 invalidations from other workers on a background thread"""
+        if not registered_caches() or self.redis_client is None or self._invalidation_listener is not None:
+            return
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_invalidation})
+        self._invalidation_listener = pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=self._on_listener_error
+        )
+    
+    def stop_invalidation_listener(self):
+        if self._invalidation_listener is not None:
+            self._invalidation_listener.stop()
+            self._invalidation_listener = None
+    
+    def close(self):
+        """Stop the invalidation listener and close both clients' pools"""
+        self.stop_invalidation_listener()
+        for client in (self.redis_client, self.raw_client):
+            if client is not None:
+                client.close()
+        self.redis_client = self.raw_client = None
+    
+    def _on_invalidation(self, message):
+        try:
+            payload = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        if payload.get("origin") != PROCESS_ID:
+            invalidate_everywhere(*payload.get("keys", []))
+    
+    @staticmethod
+    def _on_listener_error(error, pubsub, thread):
+        # Messages may have been missed while disconnected: start from a clean cache
+        logger.error(f"Redis invalidation listener error: {error}")
+        clear_everywhere()
+        time.sleep(1)
+    
+    def invalidate_cached(self, keys: Iterable[str]):
+        """Drop written keys from the local caches and tell the other workers"""
+        keys = invalidate_locally(keys)
+        if not keys:
+            return
+        try:
+            self.redis_client.publish(INVALIDATION_CHANNEL, invalidation_message(keys))
+        except Exception as e:
+            logger.error(f"Redis PUBLISH error for invalidation of {keys}: {e}")
+    
+    def _cached_hash(self, name: str) -> Optional[Dict[str, Any]]:
+        """Whole deserialized hash from the local cache, loading it on a miss; None if not cacheable"""
+        cached, generation = local_hash(name)
+        if cached is None and generation is not None:
+            cached = remember_hash(name, self.redis_client.hgetall(name), generation)
+        return cached
+    
     def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
         """Set a key-value pair with optional expiration"""
         try:
-            if not self.is_connected():
+            if self.redis_client is None:
                 self.reconnect()
             
             if self.redis_client:
-                serialized_value = json.dumps(value) if not isinstance(value, str) else value
-                return self.redis_client.set(key, serialized_value, ex=ex)
+                return self.redis_client.set(key, serialize(value), ex=ex)
         except Exception as e:
             logger.error(f"Redis SET error for key {key}: {e}")
         return False
@@ -63,29 +237,49 @@ class RedisClient:
     def get(self, key: str) -> Optional[Any]:
         """Get a value by key"""
         try:
-            if not self.is_connected():
+            if self.redis_client is None:
                 self.reconnect()
             
             if self.redis_client:
-                value = self.redis_client.get(key)
-                if value:
-                    try:
-                        return json.loads(value)
-                    except json.JSONDecodeError:
-                        return value
+                return deserialize(self.redis_client.get(key))
+        except Exception as e:
+            logger.error(f"Redis GET error for key {key}: {e}")
+        return None
+    
+    def set_bytes(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        """Set a binary value with optional expiration"""
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.raw_client:
+                return self.raw_client.set(key, value, ex=ex)
+        except Exception as e:
+            logger.error(f"Redis SET error for key {key}: {e}")
+        return False
+    
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get a binary value by key"""
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.raw_client:
+                return self.raw_client.get(key)
         except Exception as e:
             logger.error(f"Redis GET error for key {key}: {e}")
         return None
     
-    def hset(self, name: str, key: str, value: Any) -> bool:
-        """Set a hash field"""
+    def hset(self, name: str, key: Optional[str] = None, value: Any = None, mapping: Optional[Dict[str, Any]] = None) -> bool:
+        """Set one hash field, or several in one round trip with mapping"""
         try:
-            if not self.is_connected():
+            if self.redis_client is None:
                 self.reconnect()
             
             if self.redis_client:
-                serialized_value = json.dumps(value) if not isinstance(value, str) else value
-                return self.redis_client.hset(name, key, serialized_value)
+                stored = self.redis_client.hset(name, mapping=hash_fields(key, value, mapping))
+                self.invalidate_cached([name])
+                return stored
         except Exception as e:
             logger.error(f"Redis HSET error for hash {name}, key {key}: {e}")
         return False
@@ -93,28 +287,58 @@ class RedisClient:
     def hget(self, name: str, key: str) -> Optional[Any]:
         """Get a hash field"""
         try:
-            if not self.is_connected():
+            if self.redis_client is None:
                 self.reconnect()
             
             if self.redis_client:
-                value = self.redis_client.hget(name, key)
-                if value:
-                    try:
-                        return json.loads(value)
-                    except json.JSONDecodeError:
-                        return value
+                cached = self._cached_hash(name)
+                if cached is not None:
+                    return cached.get(key)
+                return deserialize(self.redis_client.hget(name, key))
         except Exception as e:
             logger.error(f"Redis HGET error for hash {name}, key {key}: {e}")
         return None
     
+    def hmget(self, name: str, *keys: str) -> List[Optional[Any]]:
+        """Get several hash fields in one round trip, in the order requested"""
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.redis_client:
+                cached = self._cached_hash(name)
+                if cached is not None:
+                    return [cached.get(key) for key in keys]
+                return [deserialize(value) for value in self.redis_client.hmget(name, keys)]
+        except Exception as e:
+            logger.error(f"Redis HMGET error for hash {name}: {e}")
+        return [None] * len(keys)
+    
+    def hgetall(self, name: str) -> Dict[str, Any]:
+        """Get every field of a hash"""
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.redis_client:
+                cached = self._cached_hash(name)
+                if cached is not None:
+                    return dict(cached)
+                return {k: deserialize(v) for k, v in self.redis_client.hgetall(name).items()}
+        except Exception as e:
+            logger.error(f"Redis HGETALL error for hash {name}: {e}")
+        return {}
+    
     def hdel(self, name: str, *keys: str) -> int:
         """Delete hash fields"""
         try:
-            if not self.is_connected():
+            if self.redis_client is None:
                 self.reconnect()
             
             if self.redis_client:
-                return self.redis_client.hdel(name, *keys)
+                deleted = self.redis_client.hdel(name, *keys)
+                self.invalidate_cached([name])
+                return deleted
         except Exception as e:
             logger.error(f"Redis HDEL error for hash {name}: {e}")
         return 0
@@ -122,11 +346,13 @@ class RedisClient:
     def delete(self, *keys: str) -> int:
         """Delete keys"""
         try:
-            if not self.is_connected():
+            if self.redis_client is None:
                 self.reconnect()
             
             if self.redis_client:
-                return self.redis_client.delete(*keys)
+                deleted = self.redis_client.delete(*keys)
+                self.invalidate_cached(keys)
+                return deleted
         except Exception as e:
             logger.error(f"Redis DELETE error: {e}")
         return 0
@@ -134,7 +360,7 @@ class RedisClient:
     def exists(self, key: str) -> bool:
         """Check if key exists"""
         try:
-            if not self.is_connected():
+            if self.redis_client is None:
                 self.reconnect()
             
             if self.redis_client:
@@ -143,10 +369,25 @@ class RedisClient:
             logger.error(f"Redis EXISTS error for key {key}: {e}")
         return False
     
+    def exists_many(self, keys: List[str]) -> Optional[List[bool]]:
+        """EXISTS for each key in one round trip; None if Redis could not be asked"""
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.redis_client:
+                with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.exists(key)
+                    return [bool(found) for found in pipe.execute()]
+        except Exception as e:
+            logger.error(f"Redis EXISTS error for {len(keys)} keys: {e}")
+        return None
+    
     def expire(self, key: str, time: int) -> bool:
         """Set expiration for a key"""
         try:
-            if not self.is_connected():
+            if self.redis_client is None:
                 self.reconnect()
             
             if self.redis_client:
@@ -155,10 +396,111 @@ class RedisClient:
             logger.error(f"Redis EXPIRE error for key {key}: {e}")
         return False
     
+    def hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        """Increment a hash field"""
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.redis_client:
+                return self.redis_client.hincrby(name, key, amount)
+        except Exception as e:
+            logger.error(f"Redis HINCRBY error for hash {name}, key {key}: {e}")
+        return 0
+    
+    def sadd(self, name: str, *values: str) -> int:
+        """Add members to a set"""
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.redis_client:
+                return self.redis_client.sadd(name, *values)
+        except Exception as e:
+            logger.error(f"Redis SADD error for set {name}: {e}")
+        return 0
+    
+    def smembers(self, name: str) -> set:
+        """Get all members of a set"""
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.redis_client:
+                return self.redis_client.smembers(name)
+        except Exception as e:
+            logger.error(f"Redis SMEMBERS error for set {name}: {e}")
+        return set()
+    
+    @contextmanager
+    def pipeline(self, transaction: bool = True):
+        """
+        Queue commands and send them in one round trip on exit.
+
+        With transaction=True they run as MULTI/EXEC. Values are sent as given
+        and replies are raw, so serialize with json.dumps where needed.
+        """
+        if self.redis_client is None:
+            self.reconnect()
+        if self.redis_client is None:
+            raise redis.ConnectionError("Redis is not connected")
+        with self.redis_client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            # Callers that need the replies call execute() themselves
+            if pipe.command_stack:
+                touched = touched_keys(pipe)
+                pipe.execute()
+                self.invalidate_cached(touched)
+    
+    def srem(self, name: str, *values: str) -> int:
+        """Remove members from a set"""
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.redis_client:
+                return self.redis_client.srem(name, *values)
+        except Exception as e:
+            logger.error(f"Redis SREM error for set {name}: {e}")
+        return 0
+    
+    def scan_iter(self, match: str = "*", count: int = 1000) -> Iterator[str]:
+        """Iterate keys matching a pattern with SCAN, a bounded batch per round trip"""
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.redis_client:
+                yield from self.redis_client.scan_iter(match=match, count=count)
+        except Exception as e:
+            logger.error(f"Redis SCAN error for pattern {match}: {e}")
+    
+    def delete_many(self, keys: Iterable[str], batch_size: int = 500) -> int:
+        """UNLINK keys in pipelined batches; memory is reclaimed off the Redis main thread"""
+        deleted = 0
+        batch = []
+        try:
+            if self.redis_client is None:
+                self.reconnect()
+            
+            if self.redis_client:
+                for key in keys:
+                    batch.append(key)
+                    if len(batch) >= batch_size:
+                        deleted += self.redis_client.unlink(*batch)
+                        self.invalidate_cached(batch)
+                        batch = []
+                if batch:
+                    deleted += self.redis_client.unlink(*batch)
+                    self.invalidate_cached(batch)
+        except Exception as e:
+            logger.error(f"Redis UNLINK error: {e}")
+        return deleted
+    
     def keys(self, pattern: str = "*") -> list:
-        """Get keys matching pattern"""
+        """Get keys matching pattern (blocks Redis for O(total keys); prefer scan_iter)"""
         try:
-            if not self.is_connected():
+            if self.redis_client is None:
                 self.reconnect()
             
             if self.redis_client:
@@ -167,5 +509,271 @@ class RedisClient:
             logger.error(f"Redis KEYS error for pattern {pattern}: {e}")
         return []
 
-# Global Redis client instance
-redis_client = RedisClient()
\ No newline at end of file
+
+class AsyncRedisClient:
+    """
+    asyncio counterpart of RedisClient with the same methods, for handlers and
+    graph nodes running on the event loop.
+
+    Both clients draw from shared connection pools; connections are opened on
+    first use, so the instance can be created at import time without a loop.
+    """
+
+    def __init__(self):
+        self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+        pool_options = dict(
+            max_connections=self.max_connections,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+            retry_on_timeout=True,
+            health_check_interval=30
+        )
+        self.pool = redis.asyncio.ConnectionPool.from_url(self.redis_url, decode_responses=True, **pool_options)
+        self.raw_pool = redis.asyncio.ConnectionPool.from_url(self.redis_url, decode_responses=False, **pool_options)
+        self.redis_client = redis.asyncio.Redis(connection_pool=self.pool)
+        # Separate client without response decoding for compressed binary values
+        self.raw_client = redis.asyncio.Redis(connection_pool=self.raw_pool)
+    
+    async def is_connected(self) -> bool:
+        """Check if Redis is connected"""
+        try:
+            return bool(await self.redis_client.ping())
+        except Exception:
+            return False
+    
+    async def invalidate_cached(self, keys: Iterable[str]):
+        """Async variant of RedisClient.invalidate_cached"""
+        keys = invalidate_locally(keys)
+        if not keys:
+            return
+        try:
+            await self.redis_client.publish(INVALIDATION_CHANNEL, invalidation_message(keys))
+        except Exception as e:
+            logger.error(f"Redis PUBLISH error for invalidation of {keys}: {e}")
+    
+    async def _cached_hash(self, name: str) -> Optional[Dict[str, Any]]:
+        """Async variant of RedisClient._cached_hash"""
+        cached, generation = local_hash(name)
+        if cached is None and generation is not None:
+            cached = remember_hash(name, await self.redis_client.hgetall(name), generation)
+        return cached
+    
+    async def close(self):
+        """Close both clients and disconnect their pools"""
+        await self.redis_client.aclose()
+        await self.raw_client.aclose()
+        await self.pool.disconnect()
+        await self.raw_pool.disconnect()
+    
+    async def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        """Set a key-value pair with optional expiration"""
+        try:
+            return await self.redis_client.set(key, serialize(value), ex=ex)
+        except Exception as e:
+            logger.error(f"Redis SET error for key {key}: {e}")
+        return False
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a value by key"""
+        try:
+            return deserialize(await self.redis_client.get(key))
+        except Exception as e:
+            logger.error(f"Redis GET error for key {key}: {e}")
+        return None
+    
+    async def set_bytes(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        """Set a binary value with optional expiration"""
+        try:
+            return await self.raw_client.set(key, value, ex=ex)
+        except Exception as e:
+            logger.error(f"Redis SET error for key {key}: {e}")
+        return False
+    
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get a binary value by key"""
+        try:
+            return await self.raw_client.get(key)
+        except Exception as e:
+            logger.error(f"Redis GET error for key {key}: {e}")
+        return None
+    
+    async def hset(self, name: str, key: Optional[str] = None, value: Any = None, mapping: Optional[Dict[str, Any]] = None) -> bool:
+        """Set one hash field, or several in one round trip with mapping"""
+        try:
+            stored = await self.redis_client.hset(name, mapping=hash_fields(key, value, mapping))
+            await self.invalidate_cached([name])
+            return stored
+        except Exception as e:
+            logger.error(f"Redis HSET error for hash {name}, key {key}: {e}")
+        return False
+    
+    async def hget(self, name: str, key: str) -> Optional[Any]:
+        """Get a hash field"""
+        try:
+            cached = await self._cached_hash(name)
+            if cached is not None:
+                return cached.get(key)
+            return deserialize(await self.redis_client.hget(name, key))
+        except Exception as e:
+            logger.error(f"Redis HGET error for hash {name}, key {key}: {e}")
+        return None
+    
+    async def hmget(self, name: str, *keys: str) -> List[Optional[Any]]:
+        """Get several hash fields in one round trip, in the order requested"""
+        try:
+            cached = await self._cached_hash(name)
+            if cached is not None:
+                return [cached.get(key) for key in keys]
+            return [deserialize(value) for value in await self.redis_client.hmget(name, keys)]
+        except Exception as e:
+            logger.error(f"Redis HMGET error for hash {name}: {e}")
+        return [None] * len(keys)
+    
+    async def hgetall(self, name: str) -> Dict[str, Any]:
+        """Get every field of a hash"""
+        try:
+            cached = await self._cached_hash(name)
+            if cached is not None:
+                return dict(cached)
+            return {k: deserialize(v) for k, v in (await self.redis_client.hgetall(name)).items()}
+        except Exception as e:
+            logger.error(f"Redis HGETALL error for hash {name}: {e}")
+        return {}
+    
+    async def hdel(self, name: str, *keys: str) -> int:
+        """Delete hash fields"""
+        try:
+            deleted = await self.redis_client.hdel(name, *keys)
+            await self.invalidate_cached([name])
+            return deleted
+        except Exception as e:
+            logger.error(f"Redis HDEL error for hash {name}: {e}")
+        return 0
+    
+    async def delete(self, *keys: str) -> int:
+        """Delete keys"""
+        try:
+            deleted = await self.redis_client.delete(*keys)
+            await self.invalidate_cached(keys)
+            return deleted
+        except Exception as e:
+            logger.error(f"Redis DELETE error: {e}")
+        return 0
+    
+    async def exists(self, key: str) -> bool:
+        """Check if key exists"""
+        try:
+            return bool(await self.redis_client.exists(key))
+        except Exception as e:
+            logger.error(f"Redis EXISTS error for key {key}: {e}")
+        return False
+    
+    async def exists_many(self, keys: List[str]) -> Optional[List[bool]]:
+        """Async variant of RedisClient.exists_many"""
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.exists(key)
+                return [bool(found) for found in await pipe.execute()]
+        except Exception as e:
+            logger.error(f"Redis EXISTS error for {len(keys)} keys: {e}")
+        return None
+    
+    async def expire(self, key: str, time: int) -> bool:
+        """Set expiration for a key"""
+        try:
+            return await self.redis_client.expire(key, time)
+        except Exception as e:
+            logger.error(f"Redis EXPIRE error for key {key}: {e}")
+        return False
+    
+    async def hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        """Increment a hash field"""
+        try:
+            return await self.redis_client.hincrby(name, key, amount)
+        except Exception as e:
+            logger.error(f"Redis HINCRBY error for hash {name}, key {key}: {e}")
+        return 0
+    
+    async def sadd(self, name: str, *values: str) -> int:
+        """Add members to a set"""
+        try:
+            return await self.redis_client.sadd(name, *values)
+        except Exception as e:
+            logger.error(f"Redis SADD error for set {name}: {e}")
+        return 0
+    
+    async def smembers(self, name: str) -> set:
+        """Get all members of a set"""
+        try:
+            return await self.redis_client.smembers(name)
+        except Exception as e:
+            logger.error(f"Redis SMEMBERS error for set {name}: {e}")
+        return set()
+    
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True):
+        """Async variant of RedisClient.pipeline"""
+        async with self.redis_client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            if pipe.command_stack:
+                touched = touched_keys(pipe)
+                await pipe.execute()
+                await self.invalidate_cached(touched)
+    
+    async def srem(self, name: str, *values: str) -> int:
+        """Remove members from a set"""
+        try:
+            return await self.redis_client.srem(name, *values)
+        except Exception as e:
+            logger.error(f"Redis SREM error for set {name}: {e}")
+        return 0
+    
+    async def scan_iter(self, match: str = "*", count: int = 1000) -> AsyncIterator[str]:
+        """Async variant of RedisClient.scan_iter"""
+        try:
+            async for key in self.redis_client.scan_iter(match=match, count=count):
+                yield key
+        except Exception as e:
+            logger.error(f"Redis SCAN error for pattern {match}: {e}")
+    
+    async def delete_many(self, keys: Union[Iterable[str], AsyncIterable[str]], batch_size: int = 500) -> int:
+        """Async variant of RedisClient.delete_many; also accepts the keys of scan_iter"""
+        deleted = 0
+        batch = []
+        
+        async def flush():
+            nonlocal deleted, batch
+            deleted += await self.redis_client.unlink(*batch)
+            await self.invalidate_cached(batch)
+            batch = []
+        
+        try:
+            if hasattr(keys, "__aiter__"):
+                async for key in keys:
+                    batch.append(key)
+                    if len(batch) >= batch_size:
+                        await flush()
+            else:
+                for key in keys:
+                    batch.append(key)
+                    if len(batch) >= batch_size:
+                        await flush()
+            if batch:
+                await flush()
+        except Exception as e:
+            logger.error(f"Redis UNLINK error: {e}")
+        return deleted
+    
+    async def keys(self, pattern: str = "*") -> list:
+        """Get keys matching pattern"""
+        try:
+            return await self.redis_client.keys(pattern)
+        except Exception as e:
+            logger.error(f"Redis KEYS error for pattern {pattern}: {e}")
+        return []
+
+# Global Redis client instances
+redis_client = RedisClient()
+async_redis_client = AsyncRedisClient()
\ No newline at end of file
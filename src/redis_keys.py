@@ -0,0 +1,25 @@
+import os
+
+
+# Every key this app writes lives under one prefix, so the app's state can be
+# told apart from (and purged without touching) other users of a shared Redis
+REDIS_KEY_PREFIX = os.getenv("REDIS_KEY_PREFIX", "lang2sql")
+
+
+def app_key(*parts: str) -> str:
+    """Key under the app prefix, e.g. app_key("session", id) -> "lang2sql:session:<id>\""""
+    return ":".join((REDIS_KEY_PREFIX, *map(str, parts)))
+
+
+def session_key(session_id) -> str:
+    """Hash holding a session's connection and schema references"""
+    return app_key("session", session_id)
+
+
+def user_sessions_key(user_id) -> str:
+    """Set of the session keys a user currently has in Redis"""
+    return app_key("user_sessions", user_id)
+
+
+def session_id_from_key(key: str) -> str:
+    return str(key)[len(session_key("")):]
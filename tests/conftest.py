@@ -0,0 +1,11 @@
+import pytest
+
+from src.redis_client import redis_client
+
+
+@pytest.fixture
+def live_redis():
+    """The shared RedisClient, skipping the test when no Redis server is reachable"""
+    if not redis_client.is_connected():
+        pytest.skip("Redis is not available")
+    return redis_client
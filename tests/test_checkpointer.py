@@ -0,0 +1,73 @@
+import uuid
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from src.Graph.checkpointer import RedisCheckpointSaver
+
+
+def _checkpoint(parent, **values):
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {**parent["channel_values"], **values} if parent else dict(values)
+    checkpoint["channel_versions"] = dict(parent["channel_versions"]) if parent else {}
+    return checkpoint
+
+
+def test_channel_values_are_stored_once_per_version(live_redis):
+    saver = RedisCheckpointSaver(live_redis, max_checkpoints=3, prefix=f"test-checkpoint-{uuid.uuid4().hex}")
+    config = {"configurable": {"thread_id": "thread", "checkpoint_ns": ""}}
+    try:
+        previous = None
+        for step in range(5):
+            values = {"messages": [f"message {i}" for i in range(step + 1)]}
+            if step == 0:
+                values["schema"] = "large and unchanged"
+            checkpoint = _checkpoint(previous, **values)
+            new_versions = {
+                channel: saver.get_next_version(checkpoint["channel_versions"].get(channel), None)
+                for channel in values
+            }
+            checkpoint["channel_versions"].update(new_versions)
+            config = saver.put(config, checkpoint, {"step": step}, new_versions)
+            previous = checkpoint
+
+        latest = saver.get_tuple({"configurable": {"thread_id": "thread", "checkpoint_ns": ""}})
+        assert latest.checkpoint["channel_values"] == previous["channel_values"]
+        assert len(list(saver.list({"configurable": {"thread_id": "thread"}}))) == 3
+
+        # 3 kept checkpoints: 3 "messages" versions and the single "schema" version
+        fields = {f.decode() for f in saver.client.hkeys(saver._blobs_key("thread", ""))}
+        assert len(fields) == 4
+        assert sum(field.startswith("schema:") for field in fields) == 1
+    finally:
+        saver.delete_thread("thread")
+    assert not list(saver.client.scan_iter(match=f"{saver.prefix}:*"))
+
+
+def test_prune_keeps_blobs_written_concurrently(live_redis):
+    saver = RedisCheckpointSaver(live_redis, prefix=f"test-checkpoint-{uuid.uuid4().hex}")
+    config = {"configurable": {"thread_id": "thread", "checkpoint_ns": ""}}
+    blobs_key = saver._blobs_key("thread", "")
+    try:
+        first = _checkpoint(None, messages=["first"])
+        first["channel_versions"]["messages"] = saver.get_next_version(None, None)
+        config = saver.put(config, first, {}, dict(first["channel_versions"]))
+        saver.client.hset(blobs_key, "messages:orphan", saver._dump(["orphan"]))
+
+        second = _checkpoint(first, messages=["first", "second"])
+        second["channel_versions"]["messages"] = saver.get_next_version(first["channel_versions"]["messages"], None)
+        load = saver._load
+
+        def load_then_put(blob):
+            # Another worker stores its next checkpoint mid-prune
+            saver._load = load
+            saver.put(config, second, {}, {"messages": second["channel_versions"]["messages"]})
+            return load(blob)
+
+        saver._load = load_then_put
+        saver._prune_blobs("thread", "")
+
+        latest = saver.get_tuple({"configurable": {"thread_id": "thread", "checkpoint_ns": ""}})
+        assert latest.checkpoint["channel_values"]["messages"] == ["first", "second"]
+        assert "messages:orphan" not in {f.decode() for f in saver.client.hkeys(blobs_key)}
+    finally:
+        saver.delete_thread("thread")
@@ -0,0 +1,28 @@
+import pytest
+
+from benchmarks.bench_import_time import DEFERRED_PACKAGES, TARGETS, import_profile, run_import
+
+# Counts the sync Redis clients connected (each connect creates them) while importing the target
+PROBE = """
+import redis
+created = []
+from_url = redis.from_url
+redis.from_url = lambda *args, **kwargs: created.append(1) or from_url(*args, **kwargs)
+import {module}
+from src.redis_client import redis_client
+print(len(created), redis_client._invalidation_listener is None)
+"""
+
+
+@pytest.mark.parametrize("module", sorted(TARGETS))
+def test_heavy_libraries_are_imported_on_first_use(module):
+    _, modules = import_profile(module, TARGETS[module])
+    deferred = sorted({name for name in modules if name.split(".")[0] in DEFERRED_PACKAGES})
+    assert not deferred, f"importing {module} pulls in {deferred}"
+
+
+@pytest.mark.parametrize("module", sorted(TARGETS))
+def test_import_does_not_reach_redis(module):
+    completed = run_import(module, TARGETS[module], PROBE.format(module=module))
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    assert completed.stdout.split() == ["0", "True"]
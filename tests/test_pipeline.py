@@ -0,0 +1,22 @@
+from src.Agent.pipeline import refers_to_history
+
+
+SCHEMA = {
+    "public": {
+        "orders": {"columns": [{"column": "id", "type": "integer"}, {"column": "total", "type": "numeric"}]},
+        "customers": {"columns": [{"column": "id", "type": "integer"}, {"column": "country", "type": "text"}]},
+    }
+}
+
+
+def test_ordinary_questions_stay_on_the_pipeline():
+    assert not refers_to_history("How many orders are there and what is their total?", SCHEMA)
+    assert not refers_to_history("Which customers also placed orders last year?", SCHEMA)
+    assert not refers_to_history("Show orders that have the same total as order 7", SCHEMA)
+
+
+def test_follow_ups_go_to_the_agent():
+    assert refers_to_history("and for last year?", SCHEMA)
+    assert refers_to_history("What about them by country?", SCHEMA)
+    assert refers_to_history("Those ones, sorted by date", SCHEMA)
+    assert refers_to_history("show the same again", SCHEMA)
@@ -0,0 +1,120 @@
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+from src.redis_client import AsyncRedisClient, touched_keys
+from src.Tools_Functions.query_result import QueryResult
+from src.Tools_Functions.result_cache import ResultCache
+
+
+def test_async_client_does_not_block_the_event_loop(live_redis):
+    empty_list = f"test:empty:{uuid.uuid4().hex}"
+
+    async def scenario():
+        client = AsyncRedisClient()
+        stalls = []
+
+        async def heartbeat(stop: asyncio.Event):
+            last = time.perf_counter()
+            while not stop.is_set():
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                stalls.append(now - last)
+                last = now
+
+        stop = asyncio.Event()
+        beat = asyncio.create_task(heartbeat(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(client.redis_client.blpop(empty_list, timeout=1) for _ in range(10)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await beat
+        await client.close()
+        return elapsed, max(stalls)
+
+    elapsed, worst_stall = asyncio.run(scenario())
+    # Ten one-second waits overlap instead of queueing, and the loop keeps ticking
+    assert elapsed < 5
+    assert worst_stall < 0.5
+
+
+def test_sync_and_async_clients_read_each_others_writes(live_redis):
+    key = f"test:hash:{uuid.uuid4().hex}"
+
+    async def scenario():
+        client = AsyncRedisClient()
+        try:
+            await client.hset(key, mapping={"count": 3, "tags": ["a", "b"], "name": "orders"})
+            from_async = await client.hmget(key, "count", "tags", "name", "missing")
+            live_redis.hset(key, "count", 4)
+            return from_async, await client.hgetall(key)
+        finally:
+            await client.delete(key)
+            await client.close()
+
+    from_async, after_sync_write = asyncio.run(scenario())
+    assert from_async == [3, ["a", "b"], "orders", None]
+    assert after_sync_write == {"count": 4, "tags": ["a", "b"], "name": "orders"}
+
+
+def test_sync_and_async_write_invalidation_drop_the_same_results(live_redis):
+    connection_fp = f"test-{uuid.uuid4().hex}"
+    result = QueryResult(["id"], [(1,)])
+
+    async def scenario():
+        client = AsyncRedisClient()
+        cache = ResultCache(live_redis, client, prefix=f"test-resultcache-{uuid.uuid4().hex}")
+        try:
+            cache.set(connection_fp, "SELECT id FROM orders", result)
+            cache.set(connection_fp, "SELECT id FROM customers", result)
+            dropped_async = await cache.ainvalidate_for_write(connection_fp, "DELETE FROM orders")
+            orders = await cache.aget(connection_fp, "SELECT id FROM orders")
+            customers = cache.get(connection_fp, "SELECT id FROM customers")
+            dropped_sync = cache.invalidate_for_write(connection_fp, "DELETE FROM customers")
+            nothing_left = await cache.ainvalidate_for_write(connection_fp, "DELETE FROM orders")
+            return dropped_async, orders, customers, dropped_sync, nothing_left
+        finally:
+            await cache.ainvalidate_connection(connection_fp)
+            live_redis.delete(cache.stats_key)
+            await client.close()
+
+    dropped_async, orders, customers, dropped_sync, nothing_left = asyncio.run(scenario())
+    # The cached result plus the table's index key, on either client
+    assert dropped_async == dropped_sync == 2
+    assert orders is None
+    assert customers is not None
+    assert nothing_left == 0
+
+
+def test_pipelines_invalidate_every_key_of_multi_key_commands():
+    pipe = SimpleNamespace(command_stack=[
+        (("DEL", "a", "b"), {}),
+        (("UNLINK", "c", "d"), {}),
+        (("MSET", "e", "1", "f", "2"), {}),
+        (("HSET", "g", "field", "value"), {}),
+        (("RENAME", "h", "i"), {}),
+    ])
+    assert touched_keys(pipe) == ["a", "b", "c", "d", "e", "f", "g", "h", "i"]
+
+
+def test_async_client_scans_and_deletes_in_batches(live_redis):
+    prefix = f"test:scan:{uuid.uuid4().hex}"
+
+    async def scenario():
+        client = AsyncRedisClient()
+        try:
+            for i in range(7):
+                await client.set(f"{prefix}:{i}", i)
+            await client.sadd(f"{prefix}:set", "a", "b")
+            removed = await client.srem(f"{prefix}:set", "a")
+            deleted = await client.delete_many(client.scan_iter(match=f"{prefix}:*", count=2), batch_size=3)
+            left = [key async for key in client.scan_iter(match=f"{prefix}:*")]
+            return removed, deleted, left
+        finally:
+            await client.close()
+
+    removed, deleted, left = asyncio.run(scenario())
+    assert removed == 1
+    assert deleted == 8
+    assert left == []
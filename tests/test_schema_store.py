@@ -0,0 +1,46 @@
+from src.Tools_Functions.schema_store import SchemaStore
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.expires = []
+
+    def set_bytes(self, key, value, ex=None):
+        self.values[key] = value
+        return True
+
+    def get_bytes(self, key):
+        return self.values.get(key)
+
+    def expire(self, key, time):
+        self.expires.append(key)
+        return key in self.values
+
+
+SCHEMA = {"public": {"orders": {"columns": [{"column": "id", "type": "integer"}]}}}
+
+
+def test_each_read_gets_its_own_copy():
+    store = SchemaStore(FakeRedis())
+    store.put("schema", "fp", SCHEMA)
+    first = store.get("schema", "fp")
+    first["public"]["orders"]["columns"].append({"column": "mutated", "type": "text"})
+    assert store.get("schema", "fp") == SCHEMA
+
+
+def test_memo_hits_renew_the_redis_ttl_at_most_once_per_interval():
+    redis = FakeRedis()
+    store = SchemaStore(redis, ttl_refresh=0)
+    store.put("schema", "fp", SCHEMA)
+    store.get("schema", "fp")
+    assert redis.expires == [store._key("schema", "fp")]
+
+    # Expired in Redis while memoized: the hit stores it again
+    redis.values.clear()
+    assert store.get("schema", "fp") == SCHEMA
+    assert store._key("schema", "fp") in redis.values
+
+    store.ttl_refresh = 3600
+    store.get("schema", "fp")
+    assert len(redis.expires) == 2
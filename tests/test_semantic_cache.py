@@ -0,0 +1,22 @@
+import numpy as np
+
+from src.Tools_Functions.semantic_cache import SemanticSQLCache, _literals
+
+
+def same_vector(texts):
+    """Every question embeds identically, so only the literal guard can tell them apart"""
+    return np.ones((len(texts), 4), dtype=np.float32) / 2
+
+
+def test_literals_cover_numbers_quotes_and_names():
+    assert _literals("top five customers") == _literals("top 5 customers")
+    assert _literals("orders by Alice") != _literals("orders by Bob")
+    assert _literals("customers in 'Berlin'") != _literals("customers in 'Munich'")
+    assert _literals("Show the orders") == _literals("show the orders")
+
+
+def test_paraphrase_with_another_name_misses():
+    cache = SemanticSQLCache(embed_fn=same_vector, threshold=0.9)
+    cache.set("orders placed by Alice", "fp", "SELECT * FROM orders WHERE customer = 'Alice'")
+    assert cache.get("orders placed by Bob", "fp") is None
+    assert cache.get("orders Alice placed", "fp") == "SELECT * FROM orders WHERE customer = 'Alice'"
@@ -0,0 +1,40 @@
+from src.Tools_Functions.result_cache import ResultCache
+from src.Tools_Functions.sql_analysis import is_locking_read, is_read_query, normalize_sql
+
+
+def test_normalize_sql_collapses_whitespace_and_comments_between_tokens():
+    assert normalize_sql("select *\n  from   orders -- recent\n where id = 1;") == "SELECT * FROM orders WHERE id = 1"
+
+
+def test_normalize_sql_keeps_literals_and_quoted_identifiers():
+    assert normalize_sql("SELECT \"Order  Id\" FROM t WHERE name = 'a  b'") == \
+        "SELECT \"Order  Id\" FROM t WHERE name = 'a  b'"
+
+
+def test_queries_differing_inside_a_literal_get_different_cache_keys():
+    cache = ResultCache(redis_client=None)
+    single = cache._key("db", "SELECT * FROM t WHERE name = 'a b'")
+    double = cache._key("db", "SELECT * FROM t WHERE name = 'a  b'")
+    reformatted = cache._key("db", "select *\nfrom t\nwhere name = 'a b'")
+    assert single != double
+    assert single == reformatted
+
+
+def test_is_read_query():
+    assert is_read_query("SELECT id FROM t")
+    assert is_read_query('SELECT "update" FROM t')
+    assert is_read_query("SELECT updated_at FROM t WHERE note = 'delete me'")
+    assert is_read_query("SELECT id FROM t FOR UPDATE")
+    assert is_read_query("SELECT id FROM t FOR NO KEY UPDATE SKIP LOCKED")
+    assert not is_read_query("UPDATE t SET a = 1")
+    assert not is_read_query("WITH gone AS (DELETE FROM t RETURNING *) SELECT * FROM gone")
+    assert not is_read_query("SELECT * INTO new_t FROM t")
+    assert not is_read_query("WITH recent AS (SELECT * FROM t) SELECT * INTO TEMP new_t FROM recent")
+    assert not is_read_query("SELECT 1; DROP TABLE t")
+
+
+def test_locking_reads_are_not_cacheable():
+    assert is_locking_read("SELECT id FROM t FOR UPDATE")
+    assert is_locking_read("select id from t for share")
+    assert not is_locking_read('SELECT "for", "update" FROM t')
+    assert not is_locking_read("SELECT id FROM t")